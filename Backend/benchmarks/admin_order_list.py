@@ -0,0 +1,125 @@
+# Đo danh sách đơn hàng admin trên bảng order lớn (mặc định 5M đơn): DISTINCT ON cũ, OFFSET và keyset:
+#   BENCHMARK_DATABASE_URL=... python -m benchmarks.admin_order_list [--orders 5000000] [--users 50000] [--repeat 20]
+#   thêm --skip-seed để đo lại trên dữ liệu đã sinh
+import argparse
+import asyncio
+from sqlmodel import select, desc, func, distinct
+from sqlalchemy.orm import noload
+from src.crud.order.services import OrderService
+from src.crud.order.utils import encode_order_cursor
+from src.database.models import Order, User
+from src.schemas.order import OrderFilterModel
+from benchmarks.common import time_async_calls, summarize, print_summary
+from benchmarks.database import benchmark_engine, benchmark_session_maker, execute_sql, seed_users
+
+ORDER_STATUSES = ["Pending", "Processing", "Shipping", "Delivered", "Cancelled"]
+SEED_BATCH = 1_000_000
+DEEP_OFFSET = 1_000_000
+
+order_service = OrderService()
+
+
+async def seed_orders(engine, orders: int, users: int) -> None:
+    await execute_sql(engine, 'TRUNCATE "order", "user" CASCADE')
+    await seed_users(engine, users)
+
+    for start in range(1, orders + 1, SEED_BATCH):
+        end = min(orders, start + SEED_BATCH - 1)
+        await execute_sql(engine, """
+            WITH u AS (SELECT array_agg(id) AS ids, count(*) AS total FROM "user")
+            INSERT INTO "order" (id, code, sub_total, total_price, discount, status, payment_method, transaction_no,
+                                 created_at, user_id, "Address")
+            SELECT gen_random_uuid(), (1600000000000 + i)::text,
+                   100000 + (i * 7919) % 5000000, 100000 + (i * 7919) % 5000000, 0,
+                   (CAST(:statuses AS varchar[]))[1 + i % 5], 'vnpay', '',
+                   now() - make_interval(secs => i * 6),
+                   u.ids[1 + (i % u.total)::int],
+                   '{"city": "Hồ Chí Minh"}'::jsonb
+            FROM u, generate_series(CAST(:start AS bigint), CAST(:end AS bigint)) AS i
+        """, statuses=ORDER_STATUSES, start=start, end=end)
+        print(f"seeded {end} orders")
+
+    await execute_sql(engine, 'ANALYZE "order"', 'ANALYZE "user"')
+
+
+async def deep_cursor(session, sort_name: str, sort_expr, offset: int) -> str:
+    statement = (
+        select(sort_expr, Order.id)
+        .join(Order.user)
+        .where(Order.deleted_at.is_(None), User.deleted_at.is_(None))
+        .order_by(desc(sort_expr), desc(Order.id))
+        .offset(offset)
+        .limit(1)
+    )
+    sort_key, order_id = (await session.exec(statement)).one()
+    return encode_order_cursor(sort_name, sort_key, order_id)
+
+
+async def run(orders: int, users: int, repeat: int, skip_seed: bool) -> None:
+    engine = benchmark_engine()
+    session_maker = benchmark_session_maker(engine)
+
+    try:
+        if not skip_seed:
+            await seed_orders(engine, orders, users)
+
+        async with session_maker() as session:
+            newest = OrderFilterModel(sort_by_created_at="newest")
+            expensive = OrderFilterModel(sort_by_total_price="expensive")
+            pending = OrderFilterModel(status="Pending")
+
+            deep_offset = min(DEEP_OFFSET, orders // 2)
+            newest_cursor = await deep_cursor(session, "created_at", Order.created_at, deep_offset)
+            expensive_cursor = await deep_cursor(session, "total_price", Order.total_price, deep_offset)
+
+            # Cách cũ: DISTINCT ON (order.id) buộc sort theo id trước, đếm bằng count(DISTINCT)
+            async def before_distinct_on():
+                conditions = [Order.deleted_at.is_(None), User.deleted_at.is_(None)]
+                count_stmt = select(func.count(distinct(Order.id))).select_from(Order).join(Order.user).where(*conditions)
+                await session.exec(count_stmt)
+                statement = (
+                    select(Order).distinct(Order.id).options(noload(Order.order_detail), noload(Order.user))
+                    .join(Order.user).where(*conditions)
+                    .order_by(Order.id, desc(Order.created_at)).offset(0).limit(10)
+                )
+                await session.exec(statement)
+
+            cases = [
+                ("before: DISTINCT ON page 1 + count", before_distinct_on),
+                ("offset newest page 1 + total",
+                 lambda: order_service.get_all_order_admin(session, newest, 0, 10)),
+                ("offset newest page 1, no total",
+                 lambda: order_service.get_all_order_admin(session, newest, 0, 10, include_total=False)),
+                (f"offset newest skip {deep_offset}",
+                 lambda: order_service.get_all_order_admin(session, newest, deep_offset, 10, include_total=False)),
+                ("keyset newest page 1",
+                 lambda: order_service.get_all_order_admin(session, newest, cursor="")),
+                (f"keyset newest after row {deep_offset}",
+                 lambda: order_service.get_all_order_admin(session, newest, cursor=newest_cursor)),
+                ("keyset status=Pending page 1",
+                 lambda: order_service.get_all_order_admin(session, pending, cursor="")),
+                ("keyset most expensive page 1",
+                 lambda: order_service.get_all_order_admin(session, expensive, cursor="")),
+                (f"keyset most expensive after row {deep_offset}",
+                 lambda: order_service.get_all_order_admin(session, expensive, cursor=expensive_cursor)),
+            ]
+
+            rows = []
+            for name, call in cases:
+                await call()
+                rows.append((name, summarize(await time_async_calls(call, repeat))))
+
+        print_summary(f"Admin order list, 10 rows per page, {orders} orders / {users} users", rows)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the admin order list on a large order table")
+    parser.add_argument("--orders", type=int, default=5_000_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.orders, args.users, args.repeat, args.skip_seed))
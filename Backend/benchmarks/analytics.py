@@ -0,0 +1,149 @@
+# Đo p95 của các API thống kê đọc từ order_daily_stats / product_daily_sales / product_monthly_sales,
+# so với GROUP BY trực tiếp trên order:
+#   BENCHMARK_DATABASE_URL=... python -m benchmarks.analytics [--orders 1000000] [--days 730] [--repeat 30]
+# Mục tiêu: mọi API thống kê có p95 <= 50ms, với khoảng tới 3 năm
+import argparse
+import asyncio
+from datetime import date, timedelta
+from sqlalchemy import cast, Date, BigInteger
+from sqlmodel import select, func, desc
+from src.crud.analytics.services import AnalyticsService
+from src.crud.order_daily_stats.repositories import OrderDailyStatsRepository
+from src.database.models import Order, Order_Detail
+from src.schemas.analytics import AnalyticsFilterModel, AnalyticsBucket
+from benchmarks.common import time_async_calls, summarize, print_summary
+from benchmarks.database import benchmark_engine, benchmark_session_maker, execute_sql, seed_users
+
+P95_TARGET_MS = 50
+ORDER_STATUSES = ["Pending", "Processing", "Shipping", "Delivered", "Delivered", "Delivered", "Cancelled"]
+
+analytics_service = AnalyticsService()
+order_daily_stats_repository = OrderDailyStatsRepository()
+
+
+async def seed(engine, session_maker, orders: int, days: int, products: int) -> None:
+    await execute_sql(engine, 'TRUNCATE "order", "user", product, categories CASCADE')
+    await seed_users(engine, 20000)
+    await execute_sql(
+        engine,
+        """
+        INSERT INTO categories (id, name, image, type_size)
+        SELECT gen_random_uuid(), 'Danh mục ' || i, '', 'clothes' FROM generate_series(1, 20) AS i
+        """,
+        """
+        INSERT INTO product (id, name, images, status, created_at)
+        SELECT gen_random_uuid(), 'Sản phẩm ' || i, '[]'::jsonb, 'active', now() FROM generate_series(1, :products) AS i
+        """,
+        """
+        INSERT INTO product_variant (id, price, quantity, sku, product_id)
+        SELECT gen_random_uuid(), 100000, 1000, 'SKU-' || p.id, p.id FROM product p
+        """,
+        """
+        WITH c AS (SELECT array_agg(id ORDER BY id) AS ids FROM categories)
+        INSERT INTO categories_product (id, categories_id, product_id)
+        SELECT gen_random_uuid(), c.ids[1 + (row_number() OVER (ORDER BY p.id)) % 20], p.id FROM product p, c
+        """,
+        products=products
+    )
+
+    await execute_sql(engine, """
+        WITH u AS (SELECT array_agg(id) AS ids, count(*) AS total FROM "user")
+        INSERT INTO "order" (id, code, sub_total, total_price, discount, status, payment_method, transaction_no,
+                             created_at, user_id, "Address")
+        SELECT gen_random_uuid(), (1600000000000 + i)::text,
+               200000 + (i * 7919) % 2000000, 180000 + (i * 7919) % 2000000, 20000,
+               (CAST(:statuses AS varchar[]))[1 + i % 7], 'vnpay', '',
+               now() - make_interval(secs => (i * 86400.0 * :days / :orders)),
+               u.ids[1 + (i % u.total)::int],
+               '{"city": "Hồ Chí Minh"}'::jsonb
+        FROM u, generate_series(1, CAST(:orders AS bigint)) AS i
+    """, statuses=ORDER_STATUSES, orders=orders, days=days)
+
+    # 2 dòng chi tiết cho mỗi đơn, sản phẩm chọn theo hash để phân bố lệch giống thực tế
+    await execute_sql(engine, """
+        WITH pv AS (
+            SELECT array_agg(p.id ORDER BY p.id) AS product_ids, array_agg(v.id ORDER BY p.id) AS variant_ids,
+                   count(*) AS total
+            FROM product p JOIN product_variant v ON v.product_id = p.id
+        )
+        INSERT INTO order_detail (id, quantity, price, product_id, product_variant_id, order_id, created_at)
+        SELECT gen_random_uuid(), 1 + n, 100000 + pick.k * 1000, pv.product_ids[pick.k], pv.variant_ids[pick.k],
+               o.id, o.created_at
+        FROM "order" o
+        CROSS JOIN generate_series(1, 2) AS n
+        CROSS JOIN pv
+        CROSS JOIN LATERAL (
+            SELECT 1 + ((hashtext(o.id::text || n::text)::bigint & 2147483647) % (pv.total / n))::int AS k
+        ) pick
+    """)
+
+    async with session_maker() as session:
+        await order_daily_stats_repository.backfill(session)
+        await session.commit()
+
+    await execute_sql(engine, 'ANALYZE "order"', "ANALYZE order_detail", "ANALYZE order_daily_stats",
+                      "ANALYZE product_daily_sales", "ANALYZE product_monthly_sales")
+
+
+async def run(orders: int, days: int, products: int, repeat: int, skip_seed: bool) -> None:
+    engine = benchmark_engine()
+    session_maker = benchmark_session_maker(engine)
+
+    try:
+        if not skip_seed:
+            await seed(engine, session_maker, orders, days, products)
+
+        today = date.today()
+        rows, misses = [], []
+        async with session_maker() as session:
+            for range_days in (30, 365, 3 * 365):
+                filter_data = AnalyticsFilterModel(from_date=today - timedelta(days=range_days), to_date=today)
+
+                # Cách cũ: GROUP BY trực tiếp trên order / order_detail mỗi lần gọi
+                async def before_top_products():
+                    day = cast(Order.created_at, Date)
+                    statement = (
+                        select(Order_Detail.product_id,
+                               func.sum(Order_Detail.quantity),
+                               func.sum(cast(Order_Detail.price, BigInteger) * Order_Detail.quantity).label("revenue"))
+                        .join(Order, Order.id == Order_Detail.order_id)
+                        .where(Order.deleted_at.is_(None), Order.status == "Delivered",
+                               day >= filter_data.from_date, day <= filter_data.to_date)
+                        .group_by(Order_Detail.product_id)
+                        .order_by(desc("revenue"))
+                        .limit(10)
+                    )
+                    await session.exec(statement)
+
+                cases = [
+                    ("before: ad hoc top products", before_top_products, False),
+                    ("summary", lambda: analytics_service.get_summary(filter_data, session), True),
+                    ("series by day", lambda: analytics_service.get_series(filter_data, AnalyticsBucket.day, session), True),
+                    ("series by week", lambda: analytics_service.get_series(filter_data, AnalyticsBucket.week, session), True),
+                    ("series by month", lambda: analytics_service.get_series(filter_data, AnalyticsBucket.month, session), True),
+                    ("top products", lambda: analytics_service.get_top_products(filter_data, session), True),
+                    ("top categories", lambda: analytics_service.get_top_categories(filter_data, session), True),
+                ]
+                for name, call, has_target in cases:
+                    await call()
+                    stats = summarize(await time_async_calls(call, repeat))
+                    rows.append((f"{range_days}d {name}", stats))
+                    if has_target and stats["p95"] > P95_TARGET_MS:
+                        misses.append(f"{range_days}d {name}")
+
+        print_summary(f"Analytics API, {orders} orders over {days} days, {products} products", rows)
+        print(f"\np95 target {P95_TARGET_MS}ms: " + ("met" if not misses else f"missed by {', '.join(misses)}"))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the rollup-backed analytics API")
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.orders, args.days, args.products, args.repeat, args.skip_seed))
@@ -0,0 +1,76 @@
+# Đo chi phí giải mã JWT trên mỗi request đã đăng nhập, trước và sau khi chọn secret theo kid:
+#   python -m benchmarks.auth_decode [--requests 20000]
+# Không cần DB / Redis, chỉ đo phần giải mã token (bỏ qua tra blocklist)
+import argparse
+import logging
+import jwt
+from jwt import InvalidTokenError
+from starlette.requests import Request
+from src.config import Config
+from src.crud.authentication.utils import ROLE_SECRET_MAP, create_access_token
+from src.dependencies import get_request_token_data, verify_token_and_get_role
+from benchmarks.common import time_calls, summarize, print_summary
+
+
+# Bản decode_token trước khi có kid: thử lần lượt từng secret
+def legacy_decode_token(token: str):
+    for role, secret_key in ROLE_SECRET_MAP.items():
+        try:
+            token_data = jwt.decode(jwt=token, key=secret_key, algorithms=[Config.JWT_ALGORITHM])
+            if token_data.get("role") == role:
+                return token_data
+        except InvalidTokenError:
+            continue
+    return None
+
+
+def make_request(token: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+        "state": {},
+    })
+
+
+def legacy_token(role: str) -> str:
+    payload = jwt.decode(create_access_token({"id": "benchmark"}, role), options={"verify_signature": False})
+    return jwt.encode(payload=payload, key=ROLE_SECRET_MAP[role], algorithm=Config.JWT_ALGORITHM)
+
+
+def run(requests: int) -> None:
+    logging.disable(logging.WARNING)
+    rows = []
+
+    for role in ROLE_SECRET_MAP:
+        old_token = legacy_token(role)
+        new_token = create_access_token({"id": "benchmark"}, role)
+
+        # Trước: AccessTokenBearer và verify_token_and_get_role mỗi bên tự thử từng secret.
+        # Cả 2 trường hợp đều dựng Request để chi phí đó không lệch kết quả
+        def before():
+            make_request(old_token)
+            legacy_decode_token(old_token)
+            legacy_decode_token(old_token)
+
+        # Sau: 1 lần giải mã theo kid, dependency thứ 2 đọc lại từ request.state
+        def after():
+            request = make_request(new_token)
+            get_request_token_data(request, new_token)
+            verify_token_and_get_role(request)
+
+        time_calls(before, 1000)
+        time_calls(after, 1000)
+        rows.append((f"{role}: before (trial decode x2)", summarize([ms * 1000 for ms in time_calls(before, requests)])))
+        rows.append((f"{role}: after (kid, decode once)", summarize([ms * 1000 for ms in time_calls(after, requests)])))
+
+    print_summary(f"Auth overhead per request ({requests} requests per case)", rows, unit="us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark JWT decoding cost per authenticated request")
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    run(args.requests)
@@ -0,0 +1,49 @@
+# Tiện ích dùng chung cho các script đo hiệu năng trong benchmarks/
+import math
+import statistics
+import time
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(samples_ms: list[float]) -> dict:
+    return {
+        "n": len(samples_ms),
+        "mean": statistics.fmean(samples_ms),
+        "p50": percentile(samples_ms, 50),
+        "p95": percentile(samples_ms, 95),
+        "p99": percentile(samples_ms, 99),
+        "max": max(samples_ms),
+    }
+
+
+def time_calls(func, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return samples
+
+
+async def time_async_calls(func, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return samples
+
+
+def print_summary(title: str, rows: list[tuple[str, dict]], unit: str = "ms") -> None:
+    print(f"\n{title}")
+    print(f"{'case':<44}{'n':>8}{'mean':>12}{'p50':>12}{'p95':>12}{'p99':>12}{'max':>12}")
+    for name, stats in rows:
+        print(
+            f"{name:<44}{stats['n']:>8}"
+            + "".join(f"{stats[key]:>10.4f}{unit}" for key in ("mean", "p50", "p95", "p99", "max"))
+        )
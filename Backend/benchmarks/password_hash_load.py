@@ -0,0 +1,73 @@
+# Đo độ trễ của request không liên quan trong lúc có đợt đăng nhập dồn dập (login storm):
+#   python -m benchmarks.password_hash_load [--logins 20] [--probe-interval-ms 10]
+# "Request không liên quan" là 1 handler async nhẹ được gọi đều đặn trên cùng event loop,
+# độ trễ = thời điểm hoàn thành - thời điểm lẽ ra được chạy. Không cần DB / Redis
+import argparse
+import asyncio
+import time
+from src.crud.authentication.utils import passwd_context, verify_password, get_password_hash_stats
+from benchmarks.common import summarize, print_summary
+
+
+async def unrelated_handler() -> dict:
+    await asyncio.sleep(0)
+    return {"status": "ok"}
+
+
+async def probe(stop: asyncio.Event, interval: float, samples: list[float]) -> None:
+    next_at = time.perf_counter()
+    while not stop.is_set():
+        await unrelated_handler()
+        samples.append((time.perf_counter() - next_at) * 1000)
+        next_at += interval
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+
+
+async def blocking_login(password: str, hashed: str) -> bool:
+    # Trước: passlib chạy thẳng trong handler async
+    return passwd_context.verify(password, hashed)
+
+
+async def pooled_login(password: str, hashed: str) -> bool:
+    return await verify_password(password, hashed)
+
+
+async def storm(login, logins: int, interval: float, hashed: str) -> tuple[list[float], float]:
+    samples: list[float] = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(stop, interval, samples))
+    await asyncio.sleep(interval * 5)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(login("benchmark-password", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started_at
+
+    # Cho probe chạy bù các lượt bị trễ, mỗi lượt đều được tính (tránh coordinated omission)
+    await asyncio.sleep(interval * 5)
+    stop.set()
+    await probe_task
+    return samples, elapsed
+
+
+async def run(logins: int, interval_ms: float) -> None:
+    hashed = passwd_context.hash("benchmark-password")
+    interval = interval_ms / 1000
+
+    rows = []
+    for name, login in (("before: bcrypt on the event loop", blocking_login),
+                        ("after: bounded password hash pool", pooled_login)):
+        samples, elapsed = await storm(login, logins, interval, hashed)
+        rows.append((name, summarize(samples)))
+        print(f"{name}: {logins} logins finished in {elapsed:.2f}s")
+
+    print_summary(f"Unrelated handler latency during a storm of {logins} logins", rows)
+    print(f"\npassword hash pool: {get_password_hash_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency of unrelated handlers while bcrypt logins are running")
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--probe-interval-ms", type=float, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.logins, args.probe_interval_ms))
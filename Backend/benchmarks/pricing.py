@@ -0,0 +1,44 @@
+# Đo module tính giá trên các lô 10k dòng (1 trang / giỏ hàng / lần refresh_price_aggregates lớn):
+#   python -m benchmarks.pricing [--items 10000] [--repeat 200]
+import argparse
+import random
+from src.crud.product.pricing import calculate_discounted_price, calculate_discounted_prices
+from benchmarks.common import time_calls, summarize, print_summary
+
+
+def make_batch(items: int, distinct_offers: int) -> tuple[list[int], list[tuple]]:
+    rng = random.Random(42)
+    offers = [(None, None)]
+    offers += [("percent", rng.randint(5, 70)) for _ in range(distinct_offers // 2)]
+    offers += [("fixed", rng.randint(1, 200) * 1000) for _ in range(distinct_offers - distinct_offers // 2)]
+
+    prices = [rng.randint(50, 5000) * 1000 for _ in range(items)]
+    batch_offers = [rng.choice(offers) for _ in range(items)]
+    return prices, batch_offers
+
+
+def run(items: int, repeat: int) -> None:
+    rows = []
+    for distinct_offers in (1, 50, items):
+        prices, offers = make_batch(items, distinct_offers)
+
+        def per_item():
+            return [calculate_discounted_price(price, *offer) for price, offer in zip(prices, offers)]
+
+        def batch():
+            return calculate_discounted_prices(prices, offers)
+
+        assert per_item() == batch()
+        rows.append((f"{distinct_offers} offers: per-item calls", summarize(time_calls(per_item, repeat))))
+        rows.append((f"{distinct_offers} offers: batch", summarize(time_calls(batch, repeat))))
+
+    print_summary(f"Discounted prices for {items} items ({repeat} runs per case)", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark batch discount pricing")
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    run(args.items, args.repeat)
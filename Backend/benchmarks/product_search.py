@@ -0,0 +1,96 @@
+# So sánh tìm kiếm sản phẩm bằng ILIKE '%từ khoá%' trên product (cách cũ) với tsvector + pg_trgm trên product_card,
+# ở các quy mô 10k / 100k / 1M sản phẩm:
+#   BENCHMARK_DATABASE_URL=... python -m benchmarks.product_search [--sizes 10000 100000 1000000] [--repeat 30]
+import argparse
+import asyncio
+from sqlalchemy import true
+from sqlmodel import select, desc
+from src.crud.product.services import ProductService
+from src.crud.product_card.repositories import ProductCardRepository
+from src.database.models import Product
+from src.schemas.product import ProductFilterModel, SortBy
+from benchmarks.common import time_async_calls, summarize, print_summary
+from benchmarks.database import benchmark_engine, benchmark_session_maker, execute_sql
+
+SEARCH_TERMS = ["áo thun", "ao thun", "quần jean nữ", "kaki", "giay the thao nam"]
+
+product_service = ProductService()
+product_card_repository = ProductCardRepository()
+
+
+async def seed_products(engine, session_maker, products: int) -> None:
+    await execute_sql(engine, "TRUNCATE product CASCADE")
+    await execute_sql(engine, """
+        INSERT INTO product (id, name, images, description, status, created_at, min_price, max_price, discounted_min_price)
+        SELECT gen_random_uuid(),
+               (ARRAY['Áo', 'Quần', 'Váy', 'Giày', 'Túi', 'Mũ'])[1 + i % 6] || ' '
+                   || (ARRAY['thun', 'sơ mi', 'jean', 'kaki', 'len', 'lụa', 'da', 'thể thao'])[1 + i / 6 % 8] || ' '
+                   || (ARRAY['nam', 'nữ', 'trẻ em', 'unisex'])[1 + i / 48 % 4] || ' '
+                   || substr(md5(i::text), 1, 6),
+               '[]'::jsonb,
+               'Chất liệu ' || (ARRAY['cotton', 'polyester', 'denim', 'lụa tơ tằm'])[1 + i % 4]
+                   || ', phù hợp đi làm và đi chơi, mã ' || md5(i::text),
+               'active',
+               now() - make_interval(mins => i),
+               100000 + i % 50 * 10000, 200000 + i % 50 * 10000, 100000 + i % 50 * 10000
+        FROM generate_series(1, :products) AS i
+    """, products=products)
+
+    # Dựng product_card bằng đúng câu upsert của ứng dụng
+    async with session_maker() as session:
+        await product_card_repository._refresh_where(true(), session)
+        await session.commit()
+
+    await execute_sql(engine, "ANALYZE product", "ANALYZE product_card")
+
+
+async def run(sizes: list[int], repeat: int) -> None:
+    engine = benchmark_engine()
+    session_maker = benchmark_session_maker(engine)
+
+    try:
+        for products in sizes:
+            await seed_products(engine, session_maker, products)
+            rows = []
+
+            async with session_maker() as session:
+                for term in SEARCH_TERMS:
+                    async def before():
+                        statement = (
+                            select(Product.id, Product.name)
+                            .where(Product.deleted_at.is_(None), Product.name.ilike(f"%{term}%"))
+                            .order_by(desc(Product.created_at))
+                            .limit(16)
+                        )
+                        await session.exec(statement)
+
+                    # Cùng bộ lọc tsvector/trgm, xếp theo độ liên quan (mặc định khi có từ khoá) hoặc mới nhất như cách cũ
+                    async def after(sort_by: SortBy = None):
+                        filters, order_by_clause = await product_service.filter_product(
+                            ProductFilterModel(search=term, sort_by=sort_by), session
+                        )
+                        await product_card_repository.get_all_product_card(filters, session, 0, 16, order_by_clause,
+                                                                           with_total=False)
+
+                    async def after_newest():
+                        await after(SortBy.newest)
+
+                    await before()
+                    await after()
+                    await after_newest()
+                    rows.append((f"'{term}' before: ILIKE", summarize(await time_async_calls(before, repeat))))
+                    rows.append((f"'{term}' after: relevance", summarize(await time_async_calls(after, repeat))))
+                    rows.append((f"'{term}' after: newest", summarize(await time_async_calls(after_newest, repeat))))
+
+            print_summary(f"Product search, first page of 16, {products} products", rows)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark product search at several catalogue sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.sizes, args.repeat))
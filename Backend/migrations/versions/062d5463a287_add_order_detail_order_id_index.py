@@ -0,0 +1,32 @@
+"""add order detail order id index
+
+Revision ID: 062d5463a287
+Revises: 6f83f2d6996f
+Create Date: 2026-10-18 19:09:26.965894
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '062d5463a287'
+down_revision: Union[str, None] = '6f83f2d6996f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rollup thống kê cộng số item theo order_id cho từng đơn, thiếu index sẽ quét cả bảng order_detail mỗi đơn
+    with op.get_context().autocommit_block():
+        op.create_index('ix_order_detail_order_id', 'order_detail', ['order_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_order_detail_order_id', table_name='order_detail', postgresql_concurrently=True)
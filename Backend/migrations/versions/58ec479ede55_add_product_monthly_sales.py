@@ -0,0 +1,47 @@
+"""add product monthly sales
+
+Revision ID: 58ec479ede55
+Revises: 062d5463a287
+Create Date: 2026-10-18 19:13:49.610454
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = '58ec479ede55'
+down_revision: Union[str, None] = '062d5463a287'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('product_monthly_sales',
+    sa.Column('month', sa.DATE(), nullable=False),
+    sa.Column('status', sa.VARCHAR(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('slot', sa.SMALLINT(), server_default='0', nullable=False),
+    sa.Column('quantity', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('revenue', sa.BIGINT(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['product.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('month', 'status', 'product_id', 'slot')
+    )
+    op.create_index('ix_product_monthly_sales_product_id_month', 'product_monthly_sales', ['product_id', 'month'], unique=False)
+
+    op.execute("""
+        INSERT INTO product_monthly_sales (month, status, product_id, quantity, revenue)
+        SELECT date_trunc('month', day)::date, status, product_id, sum(quantity), sum(revenue)
+        FROM product_daily_sales
+        GROUP BY date_trunc('month', day)::date, status, product_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_monthly_sales_product_id_month', table_name='product_monthly_sales')
+    op.drop_table('product_monthly_sales')
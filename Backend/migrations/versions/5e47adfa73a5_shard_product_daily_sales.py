@@ -0,0 +1,48 @@
+"""shard product daily sales
+
+Revision ID: 5e47adfa73a5
+Revises: f1c7d3a9b284
+Create Date: 2026-10-19 10:12:37.481920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e47adfa73a5'
+down_revision: Union[str, None] = 'f1c7d3a9b284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Dòng hiện có thuộc slot 0, các checkout mới rải ngẫu nhiên vào STATS_SLOTS slot
+    op.add_column('product_daily_sales', sa.Column('slot', sa.SMALLINT(), server_default='0', nullable=False))
+    op.drop_constraint('product_daily_sales_pkey', 'product_daily_sales', type_='primary')
+    op.create_primary_key('product_daily_sales_pkey', 'product_daily_sales', ['day', 'status', 'product_id', 'slot'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Gộp các slot về 1 dòng trước khi bỏ cột
+    op.execute("""
+        CREATE TEMPORARY TABLE product_daily_sales_merged ON COMMIT DROP AS
+        SELECT day, status, product_id, sum(quantity) AS quantity, sum(revenue) AS revenue,
+               max(updated_at) AS updated_at
+        FROM product_daily_sales
+        GROUP BY day, status, product_id
+    """)
+    op.execute("DELETE FROM product_daily_sales")
+    op.drop_constraint('product_daily_sales_pkey', 'product_daily_sales', type_='primary')
+    op.drop_column('product_daily_sales', 'slot')
+    op.execute("""
+        INSERT INTO product_daily_sales (day, status, product_id, quantity, revenue, updated_at)
+        SELECT day, status, product_id, quantity, revenue, updated_at
+        FROM product_daily_sales_merged
+    """)
+    op.create_primary_key('product_daily_sales_pkey', 'product_daily_sales', ['day', 'status', 'product_id'])
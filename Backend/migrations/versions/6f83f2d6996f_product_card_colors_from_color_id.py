@@ -0,0 +1,42 @@
+"""product card colors from color id
+
+Revision ID: 6f83f2d6996f
+Revises: 5e47adfa73a5
+Create Date: 2026-10-19 11:03:52.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f83f2d6996f'
+down_revision: Union[str, None] = '5e47adfa73a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Facet màu trước đây chỉ lấy color_name, bỏ sót variant chọn màu có sẵn qua color_id
+    op.execute("""
+        UPDATE product_card pc
+        SET colors = COALESCE((SELECT array_agg(DISTINCT COALESCE(pv.color_name, c.name))
+                               FROM product_variant pv
+                               LEFT JOIN color c ON c.id = pv.color_id
+                               WHERE pv.product_id = pc.product_id AND pv.deleted_at IS NULL
+                                 AND COALESCE(pv.color_name, c.name) IS NOT NULL), '{}'::varchar[])
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        UPDATE product_card pc
+        SET colors = COALESCE((SELECT array_agg(DISTINCT pv.color_name) FROM product_variant pv
+                               WHERE pv.product_id = pc.product_id AND pv.deleted_at IS NULL
+                                 AND pv.color_name IS NOT NULL), '{}'::varchar[])
+    """)
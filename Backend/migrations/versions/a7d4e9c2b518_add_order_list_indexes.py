@@ -0,0 +1,38 @@
+"""add order list indexes
+
+Revision ID: a7d4e9c2b518
+Revises: f3b8d1c6e072
+Create Date: 2026-10-18 17:03:27.418905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d4e9c2b518'
+down_revision: Union[str, None] = 'f3b8d1c6e072'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Bảng order lớn: tạo index CONCURRENTLY để không khoá ghi trong lúc build
+    with op.get_context().autocommit_block():
+        op.create_index('ix_order_status_created_at_id', 'order', ['status', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_order_created_at_id', 'order', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_order_total_price_id', 'order', ['total_price', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_order_user_id_created_at', 'order', ['user_id', 'created_at'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_order_user_id_created_at', table_name='order', postgresql_concurrently=True)
+        op.drop_index('ix_order_total_price_id', table_name='order', postgresql_concurrently=True)
+        op.drop_index('ix_order_created_at_id', table_name='order', postgresql_concurrently=True)
+        op.drop_index('ix_order_status_created_at_id', table_name='order', postgresql_concurrently=True)
@@ -0,0 +1,52 @@
+"""add order daily stats
+
+Revision ID: b2e8f5a13c67
+Revises: a7d4e9c2b518
+Create Date: 2026-10-18 17:48:52.106372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e8f5a13c67'
+down_revision: Union[str, None] = 'a7d4e9c2b518'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('order_daily_stats',
+    sa.Column('day', sa.DATE(), nullable=False),
+    sa.Column('status', sa.VARCHAR(), nullable=False),
+    sa.Column('orders', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('sub_total', sa.BIGINT(), server_default='0', nullable=False),
+    sa.Column('total_price', sa.BIGINT(), server_default='0', nullable=False),
+    sa.Column('discount', sa.BIGINT(), server_default='0', nullable=False),
+    sa.Column('items', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'status')
+    )
+
+    # Dữ liệu lịch sử, sau đó bảng được cập nhật dồn từ create_order / update_status
+    op.execute("""
+        INSERT INTO order_daily_stats (day, status, orders, sub_total, total_price, discount, items)
+        SELECT o.day, o.status, count(*), sum(o.sub_total), sum(o.total_price), sum(o.discount), sum(o.items)
+        FROM (
+            SELECT created_at::date AS day, status, sub_total, total_price, COALESCE(discount, 0) AS discount,
+                   (SELECT COALESCE(sum(od.quantity), 0) FROM order_detail od WHERE od.order_id = "order".id) AS items
+            FROM "order"
+            WHERE deleted_at IS NULL
+        ) o
+        GROUP BY o.day, o.status
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('order_daily_stats')
@@ -0,0 +1,31 @@
+"""add keyset indexes to product
+
+Revision ID: b7e31c9a4d02
+Revises: 3e8dd8443b38
+Create Date: 2026-10-18 09:12:41.503217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e31c9a4d02'
+down_revision: Union[str, None] = '3e8dd8443b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_product_created_at_id', 'product', ['created_at', 'id'], unique=False)
+    op.create_index('ix_product_name_id', 'product', ['name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_name_id', table_name='product')
+    op.drop_index('ix_product_created_at_id', table_name='product')
@@ -0,0 +1,87 @@
+"""add price aggregates to product
+
+Revision ID: c4a9f1e27b55
+Revises: b7e31c9a4d02
+Create Date: 2026-10-18 10:03:17.284611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a9f1e27b55'
+down_revision: Union[str, None] = 'b7e31c9a4d02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _discounted_price(price, offer_type, offer_discount):
+    # Giống src.crud.product.utils.calculate_discounted_price tại thời điểm viết migration
+    if not offer_type or offer_discount is None:
+        return price
+
+    if offer_type == "percent":
+        raw_discounted_price = price * (1 - offer_discount / 100)
+    elif offer_type == "fixed":
+        raw_discounted_price = max(0, price - offer_discount)
+    else:
+        return price
+
+    return int(round(raw_discounted_price / 1000) * 1000)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('product', sa.Column('min_price', sa.INTEGER(), server_default='0', nullable=False))
+    op.add_column('product', sa.Column('max_price', sa.INTEGER(), server_default='0', nullable=False))
+    op.add_column('product', sa.Column('discounted_min_price', sa.INTEGER(), server_default='0', nullable=False))
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("""
+        SELECT p.id,
+               COALESCE(MIN(pv.price), 0) AS min_price,
+               COALESCE(MAX(pv.price), 0) AS max_price,
+               so.type AS offer_type,
+               so.discount AS offer_discount
+        FROM product p
+        LEFT JOIN product_variant pv ON pv.product_id = p.id AND pv.deleted_at IS NULL
+        LEFT JOIN special_offer so ON so.id = p.special_offer_id AND so.deleted_at IS NULL
+        GROUP BY p.id, so.type, so.discount
+    """)).fetchall()
+
+    params = [
+        {
+            "id": row.id,
+            "min_price": row.min_price,
+            "max_price": row.max_price,
+            "discounted_min_price": _discounted_price(row.min_price, row.offer_type, row.offer_discount),
+        }
+        for row in rows
+    ]
+    if params:
+        bind.execute(
+            sa.text("""
+                UPDATE product
+                SET min_price = :min_price, max_price = :max_price, discounted_min_price = :discounted_min_price
+                WHERE id = :id
+            """),
+            params
+        )
+
+    op.create_index('ix_product_min_price_id', 'product', ['min_price', 'id'], unique=False)
+    op.create_index('ix_product_max_price', 'product', ['max_price'], unique=False)
+    op.create_index('ix_product_discounted_min_price_id', 'product', ['discounted_min_price', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_discounted_min_price_id', table_name='product')
+    op.drop_index('ix_product_max_price', table_name='product')
+    op.drop_index('ix_product_min_price_id', table_name='product')
+    op.drop_column('product', 'discounted_min_price')
+    op.drop_column('product', 'max_price')
+    op.drop_column('product', 'min_price')
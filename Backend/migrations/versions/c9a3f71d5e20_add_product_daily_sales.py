@@ -0,0 +1,49 @@
+"""add product daily sales
+
+Revision ID: c9a3f71d5e20
+Revises: b2e8f5a13c67
+Create Date: 2026-10-18 18:35:14.622087
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9a3f71d5e20'
+down_revision: Union[str, None] = 'b2e8f5a13c67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('product_daily_sales',
+    sa.Column('day', sa.DATE(), nullable=False),
+    sa.Column('status', sa.VARCHAR(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('quantity', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('revenue', sa.BIGINT(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['product.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('day', 'status', 'product_id')
+    )
+    op.create_index('ix_product_daily_sales_product_id_day', 'product_daily_sales', ['product_id', 'day'], unique=False)
+
+    op.execute("""
+        INSERT INTO product_daily_sales (day, status, product_id, quantity, revenue)
+        SELECT o.created_at::date, o.status, od.product_id, sum(od.quantity), sum(od.price::bigint * od.quantity)
+        FROM order_detail od
+        JOIN "order" o ON o.id = od.order_id
+        WHERE o.deleted_at IS NULL
+        GROUP BY o.created_at::date, o.status, od.product_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_daily_sales_product_id_day', table_name='product_daily_sales')
+    op.drop_table('product_daily_sales')
@@ -0,0 +1,69 @@
+"""add product rating counters
+
+Revision ID: d4f1b8e26a93
+Revises: c9a3f71d5e20
+Create Date: 2026-10-18 21:04:52.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f1b8e26a93'
+down_revision: Union[str, None] = 'c9a3f71d5e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RATING_COLUMNS = ['rating_count', 'rating_sum', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in RATING_COLUMNS:
+        op.add_column('product', sa.Column(column, sa.INTEGER(), server_default='0', nullable=False))
+
+    # Dựng lại bộ đếm từ các đánh giá còn hiệu lực, đồng thời sửa avg_rating cũ chưa trừ đánh giá đã xoá
+    op.execute("""
+        UPDATE product p
+        SET rating_count = s.rating_count,
+            rating_sum = s.rating_sum,
+            rating_1 = s.rating_1,
+            rating_2 = s.rating_2,
+            rating_3 = s.rating_3,
+            rating_4 = s.rating_4,
+            rating_5 = s.rating_5
+        FROM (
+            SELECT product_id,
+                   count(*) AS rating_count,
+                   sum(rate) AS rating_sum,
+                   count(*) FILTER (WHERE rate = 1) AS rating_1,
+                   count(*) FILTER (WHERE rate = 2) AS rating_2,
+                   count(*) FILTER (WHERE rate = 3) AS rating_3,
+                   count(*) FILTER (WHERE rate = 4) AS rating_4,
+                   count(*) FILTER (WHERE rate = 5) AS rating_5
+            FROM evaluate
+            WHERE deleted_at IS NULL AND rate BETWEEN 1 AND 5
+            GROUP BY product_id
+        ) s
+        WHERE s.product_id = p.id
+    """)
+    op.execute("""
+        UPDATE product
+        SET avg_rating = CASE WHEN rating_count > 0 THEN rating_sum::float / rating_count ELSE 0 END
+    """)
+    op.execute("""
+        UPDATE product_card
+        SET avg_rating = p.avg_rating
+        FROM product p
+        WHERE p.id = product_card.product_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in reversed(RATING_COLUMNS):
+        op.drop_column('product', column)
@@ -0,0 +1,39 @@
+"""add total sold index to product
+
+Revision ID: d81f6b3a0c9e
+Revises: c4a9f1e27b55
+Create Date: 2026-10-18 10:41:55.610382
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f6b3a0c9e'
+down_revision: Union[str, None] = 'c4a9f1e27b55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tính lại total_sold từ các đơn đã giao / hoàn thành
+    op.execute("""
+        UPDATE product p
+        SET total_sold = COALESCE((
+            SELECT SUM(od.quantity)
+            FROM order_detail od
+            JOIN "order" o ON o.id = od.order_id
+            WHERE od.product_id = p.id AND LOWER(o.status) IN ('completed', 'delivered')
+        ), 0)
+    """)
+    op.create_index('ix_product_total_sold_id', 'product', ['total_sold', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_total_sold_id', table_name='product')
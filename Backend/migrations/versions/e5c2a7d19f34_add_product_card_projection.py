@@ -0,0 +1,96 @@
+"""add product card projection
+
+Revision ID: e5c2a7d19f34
+Revises: d81f6b3a0c9e
+Create Date: 2026-10-18 14:26:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c2a7d19f34'
+down_revision: Union[str, None] = 'd81f6b3a0c9e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('product_card',
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.VARCHAR(), nullable=False),
+    sa.Column('images', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('status', sa.VARCHAR(), nullable=False),
+    sa.Column('min_price', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('max_price', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('discounted_min_price', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('total_sold', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('avg_rating', sa.FLOAT(), server_default='0', nullable=False),
+    sa.Column('variant_count', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('offer_name', sa.VARCHAR(), nullable=True),
+    sa.Column('offer_discount', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('categories', postgresql.JSONB(astext_type=sa.Text()), server_default='[]', nullable=False),
+    sa.Column('category_ids', postgresql.ARRAY(sa.UUID()), server_default='{}', nullable=False),
+    sa.Column('colors', postgresql.ARRAY(sa.VARCHAR()), server_default='{}', nullable=False),
+    sa.Column('sizes', postgresql.ARRAY(sa.VARCHAR()), server_default='{}', nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(), nullable=False),
+    sa.Column('deleted_at', postgresql.TIMESTAMP(), nullable=True),
+    sa.Column('refreshed_at', postgresql.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['product.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+
+    op.execute("""
+        INSERT INTO product_card (
+            product_id, name, images, status, min_price, max_price, discounted_min_price, total_sold, avg_rating,
+            variant_count, offer_name, offer_discount, categories, category_ids, colors, sizes, created_at, deleted_at
+        )
+        SELECT p.id, p.name, p.images, p.status, p.min_price, p.max_price, p.discounted_min_price, p.total_sold,
+               p.avg_rating,
+               (SELECT count(pv.id) FROM product_variant pv
+                WHERE pv.product_id = p.id AND pv.deleted_at IS NULL),
+               so.name,
+               COALESCE(so.discount, 0),
+               COALESCE((SELECT jsonb_agg(jsonb_build_object('id', c.id, 'name', c.name, 'parent_id', c.parent_id))
+                         FROM categories_product cp JOIN categories c ON c.id = cp.categories_id
+                         WHERE cp.product_id = p.id AND c.deleted_at IS NULL), '[]'::jsonb),
+               COALESCE((SELECT array_agg(c.id)
+                         FROM categories_product cp JOIN categories c ON c.id = cp.categories_id
+                         WHERE cp.product_id = p.id AND c.deleted_at IS NULL), '{}'::uuid[]),
+               COALESCE((SELECT array_agg(DISTINCT pv.color_name) FROM product_variant pv
+                         WHERE pv.product_id = p.id AND pv.deleted_at IS NULL AND pv.color_name IS NOT NULL), '{}'::varchar[]),
+               COALESCE((SELECT array_agg(DISTINCT pv.size) FROM product_variant pv
+                         WHERE pv.product_id = p.id AND pv.deleted_at IS NULL AND pv.size IS NOT NULL), '{}'::varchar[]),
+               p.created_at,
+               p.deleted_at
+        FROM product p
+        LEFT JOIN special_offer so ON so.id = p.special_offer_id AND so.deleted_at IS NULL
+    """)
+
+    op.create_index('ix_product_card_created_at_id', 'product_card', ['created_at', 'product_id'], unique=False)
+    op.create_index('ix_product_card_name_id', 'product_card', ['name', 'product_id'], unique=False)
+    op.create_index('ix_product_card_min_price_id', 'product_card', ['min_price', 'product_id'], unique=False)
+    op.create_index('ix_product_card_total_sold_id', 'product_card', ['total_sold', 'product_id'], unique=False)
+    op.create_index('ix_product_card_offer_discount_id', 'product_card', ['offer_discount', 'product_id'], unique=False)
+    op.create_index('ix_product_card_category_ids', 'product_card', ['category_ids'], unique=False, postgresql_using='gin')
+    op.create_index('ix_product_card_colors', 'product_card', ['colors'], unique=False, postgresql_using='gin')
+    op.create_index('ix_product_card_sizes', 'product_card', ['sizes'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_card_sizes', table_name='product_card', postgresql_using='gin')
+    op.drop_index('ix_product_card_colors', table_name='product_card', postgresql_using='gin')
+    op.drop_index('ix_product_card_category_ids', table_name='product_card', postgresql_using='gin')
+    op.drop_index('ix_product_card_offer_discount_id', table_name='product_card')
+    op.drop_index('ix_product_card_total_sold_id', table_name='product_card')
+    op.drop_index('ix_product_card_min_price_id', table_name='product_card')
+    op.drop_index('ix_product_card_name_id', table_name='product_card')
+    op.drop_index('ix_product_card_created_at_id', table_name='product_card')
+    op.drop_table('product_card')
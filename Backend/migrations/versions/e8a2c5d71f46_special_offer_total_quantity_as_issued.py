@@ -0,0 +1,39 @@
+"""special offer total_quantity as issued
+
+Revision ID: e8a2c5d71f46
+Revises: d4f1b8e26a93
+Create Date: 2026-10-18 22:10:37.552914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a2c5d71f46'
+down_revision: Union[str, None] = 'd4f1b8e26a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Trước đây mỗi lượt dùng vừa cộng used_quantity vừa trừ total_quantity.
+    # Nay total_quantity là tổng số lượt phát hành, còn lại = total_quantity - used_quantity
+    op.execute("""
+        UPDATE special_offer
+        SET total_quantity = total_quantity + COALESCE(used_quantity, 0)
+        WHERE COALESCE(used_quantity, 0) > 0
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        UPDATE special_offer
+        SET total_quantity = total_quantity - COALESCE(used_quantity, 0)
+        WHERE COALESCE(used_quantity, 0) > 0
+    """)
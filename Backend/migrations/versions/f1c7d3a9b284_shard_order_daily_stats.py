@@ -0,0 +1,48 @@
+"""shard order daily stats
+
+Revision ID: f1c7d3a9b284
+Revises: e8a2c5d71f46
+Create Date: 2026-10-18 22:41:15.207633
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7d3a9b284'
+down_revision: Union[str, None] = 'e8a2c5d71f46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Dòng hiện có thuộc slot 0, các checkout mới rải ngẫu nhiên vào STATS_SLOTS slot
+    op.add_column('order_daily_stats', sa.Column('slot', sa.SMALLINT(), server_default='0', nullable=False))
+    op.drop_constraint('order_daily_stats_pkey', 'order_daily_stats', type_='primary')
+    op.create_primary_key('order_daily_stats_pkey', 'order_daily_stats', ['day', 'status', 'slot'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Gộp các slot về 1 dòng trước khi bỏ cột
+    op.execute("""
+        CREATE TEMPORARY TABLE order_daily_stats_merged ON COMMIT DROP AS
+        SELECT day, status, sum(orders) AS orders, sum(sub_total) AS sub_total, sum(total_price) AS total_price,
+               sum(discount) AS discount, sum(items) AS items, max(updated_at) AS updated_at
+        FROM order_daily_stats
+        GROUP BY day, status
+    """)
+    op.execute("DELETE FROM order_daily_stats")
+    op.drop_constraint('order_daily_stats_pkey', 'order_daily_stats', type_='primary')
+    op.drop_column('order_daily_stats', 'slot')
+    op.execute("""
+        INSERT INTO order_daily_stats (day, status, orders, sub_total, total_price, discount, items, updated_at)
+        SELECT day, status, orders, sub_total, total_price, discount, items, updated_at
+        FROM order_daily_stats_merged
+    """)
+    op.create_primary_key('order_daily_stats_pkey', 'order_daily_stats', ['day', 'status'])
@@ -0,0 +1,55 @@
+"""add product search indexes
+
+Revision ID: f3b8d1c6e072
+Revises: e5c2a7d19f34
+Create Date: 2026-10-18 15:12:09.734520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1c6e072'
+down_revision: Union[str, None] = 'e5c2a7d19f34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+
+    # unaccent() chỉ là STABLE nên không dùng được trong index, bọc lại với từ điển cố định
+    op.execute("""
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """)
+
+    op.add_column('product_card', sa.Column('search_vector', postgresql.TSVECTOR(), server_default='', nullable=False))
+
+    op.execute("""
+        UPDATE product_card pc
+        SET search_vector = setweight(to_tsvector('simple', f_unaccent(p.name)), 'A')
+                            || setweight(to_tsvector('simple', f_unaccent(COALESCE(p.description, ''))), 'B')
+        FROM product p
+        WHERE p.id = pc.product_id
+    """)
+
+    op.create_index('ix_product_card_search_vector', 'product_card', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_product_card_name_trgm', 'product_card', [sa.text('f_unaccent(lower(name)) gin_trgm_ops')], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_card_name_trgm', table_name='product_card', postgresql_using='gin')
+    op.drop_index('ix_product_card_search_vector', table_name='product_card', postgresql_using='gin')
+    op.drop_column('product_card', 'search_vector')
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
+    # Giữ lại extension pg_trgm / unaccent vì có thể đã được dùng ở nơi khác
@@ -9,6 +9,8 @@ from src.crud.product.routes import product_admin_router, product_customer_route
 from src.crud.special_offer.routes import special_offer_admin_router, special_offer_customer_router, special_offer_common_router
 from src.crud.order.routes import order_admin_router, order_customer_router, order_common_router
 from src.crud.evaluate.routes import evaluate_admin_router, evaluate_customer_router, evaluate_common_router
+from src.crud.monitoring.routes import monitoring_admin_router
+from src.crud.analytics.routes import analytics_admin_router
 
 version = "v1"
 api_router = APIRouter(prefix=f"/api/{version}")
@@ -24,6 +26,8 @@ admin_router.include_router(order_admin_router)
 admin_router.include_router(evaluate_admin_router)
 admin_router.include_router(color_admin_router)
 admin_router.include_router(size_admin_router)
+admin_router.include_router(monitoring_admin_router)
+admin_router.include_router(analytics_admin_router)
 
 customer_router = APIRouter(prefix="/customer", tags=["user-customer"])
 customer_router.include_router(user_customer_router)
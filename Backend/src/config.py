@@ -1,3 +1,4 @@
+from typing import Optional
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -21,6 +22,20 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
+    JTI_BLOOM_CAPACITY: int = 100000
+    JTI_BLOOM_ERROR_RATE: float = 0.01
+    JTI_BLOOM_SYNC_INTERVAL: int = 60
+    PASSWORD_HASH_WORKERS: int = 4
+    QUERY_PROFILER_ENABLED: bool = False
+    QUERY_PROFILER_SAMPLE_RATE: float = 0.1
+    # Chỉ bật ở môi trường dev/test
+    QUERY_BUDGET_ENABLED: bool = False
+    QUERY_BUDGET_STRICT: bool = False
+    QUERY_BUDGET_DEFAULT: Optional[int] = 20
+    QUERY_BUDGET_N_PLUS_ONE_THRESHOLD: int = 5
+    SUGGEST_REBUILD_INTERVAL: int = 300
+    REFERENCE_CACHE_TTL: int = 300
+    HTTP_CACHE_ENABLED: bool = True
     DOMAIN: str
     DOMAIN_CLIENT: str
 
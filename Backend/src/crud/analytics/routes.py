@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+from typing import Optional, List
+from fastapi import APIRouter, status, Depends, Query
+from fastapi.responses import JSONResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.crud.analytics.services import AnalyticsService
+from src.database.main import get_session
+from src.dependencies import AccessTokenBearer
+from src.dependencies import admin_role_middleware
+from src.http_cache import http_cache
+from src.schemas.analytics import AnalyticsBucket, AnalyticsFilterModel
+
+analytics_admin_router = APIRouter(prefix="/analytics")
+
+analytics_service = AnalyticsService()
+access_token_bearer = AccessTokenBearer()
+
+
+def analytics_filter(from_date: Optional[date] = None, to_date: Optional[date] = None,
+                     status_filter: Optional[List[str]] = Query(default=None)) -> AnalyticsFilterModel:
+    # Mặc định 30 ngày gần nhất
+    to_date = to_date or date.today()
+    from_date = from_date or (to_date - timedelta(days=29))
+
+    return AnalyticsFilterModel(from_date=from_date, to_date=to_date, statuses=status_filter)
+
+
+@analytics_admin_router.get("/summary", status_code=status.HTTP_200_OK,
+                            dependencies=[Depends(admin_role_middleware), Depends(http_cache(max_age=60, private=True))])
+async def get_summary(filter_data: AnalyticsFilterModel = Depends(analytics_filter),
+                      token_details: dict = Depends(access_token_bearer),
+                      session: AsyncSession = Depends(get_session)):
+    summary = await analytics_service.get_summary(filter_data, session)
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Thống kê tổng quan",
+            "content": summary
+        }
+    )
+
+
+@analytics_admin_router.get("/series", status_code=status.HTTP_200_OK,
+                            dependencies=[Depends(admin_role_middleware), Depends(http_cache(max_age=60, private=True))])
+async def get_series(bucket: AnalyticsBucket = AnalyticsBucket.day,
+                     filter_data: AnalyticsFilterModel = Depends(analytics_filter),
+                     token_details: dict = Depends(access_token_bearer),
+                     session: AsyncSession = Depends(get_session)):
+    series = await analytics_service.get_series(filter_data, bucket, session)
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Doanh thu theo thời gian",
+            "content": series
+        }
+    )
+
+
+@analytics_admin_router.get("/top-products", status_code=status.HTTP_200_OK,
+                            dependencies=[Depends(admin_role_middleware), Depends(http_cache(max_age=60, private=True))])
+async def get_top_products(limit: int = 10,
+                           filter_data: AnalyticsFilterModel = Depends(analytics_filter),
+                           token_details: dict = Depends(access_token_bearer),
+                           session: AsyncSession = Depends(get_session)):
+    products = await analytics_service.get_top_products(filter_data, session, limit)
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Sản phẩm có doanh thu cao nhất",
+            "content": products
+        }
+    )
+
+
+@analytics_admin_router.get("/top-categories", status_code=status.HTTP_200_OK,
+                            dependencies=[Depends(admin_role_middleware), Depends(http_cache(max_age=60, private=True))])
+async def get_top_categories(limit: int = 10,
+                             filter_data: AnalyticsFilterModel = Depends(analytics_filter),
+                             token_details: dict = Depends(access_token_bearer),
+                             session: AsyncSession = Depends(get_session)):
+    categories = await analytics_service.get_top_categories(filter_data, session, limit)
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Danh mục có doanh thu cao nhất",
+            "content": categories
+        }
+    )
@@ -0,0 +1,127 @@
+from datetime import date, timedelta
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.crud.order_daily_stats.repositories import OrderDailyStatsRepository
+from src.errors.analytics import AnalyticsException
+from src.schemas.analytics import AnalyticsBucket, AnalyticsFilterModel
+
+order_daily_stats_repository = OrderDailyStatsRepository()
+
+# Mặc định chỉ tính đơn đã giao, giống các số liệu /order/statistics
+DEFAULT_STATUSES = ["Delivered"]
+MAX_RANGE_DAYS = 3 * 366
+MAX_TOP_LIMIT = 100
+
+
+def bucket_starts(from_day: date, to_day: date, bucket: AnalyticsBucket) -> list[date]:
+    # Ngày bắt đầu của mọi bucket trong khoảng, khớp với date_trunc của Postgres (tuần bắt đầu từ thứ 2)
+    if bucket == AnalyticsBucket.month:
+        current = from_day.replace(day=1)
+    elif bucket == AnalyticsBucket.week:
+        current = from_day - timedelta(days=from_day.weekday())
+    else:
+        current = from_day
+
+    starts = []
+    while current <= to_day:
+        starts.append(current)
+        if bucket == AnalyticsBucket.month:
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+        elif bucket == AnalyticsBucket.week:
+            current += timedelta(days=7)
+        else:
+            current += timedelta(days=1)
+
+    return starts
+
+
+def average_order_value(total_price: int, orders: int) -> int:
+    return round(total_price / orders) if orders else 0
+
+
+class AnalyticsService:
+    def validate_filter(self, filter_data: AnalyticsFilterModel):
+        if filter_data.from_date > filter_data.to_date:
+            AnalyticsException.invalid_date_range()
+
+        if (filter_data.to_date - filter_data.from_date).days > MAX_RANGE_DAYS:
+            AnalyticsException.invalid_date_range()
+
+        return filter_data.statuses or DEFAULT_STATUSES
+
+    async def get_summary(self, filter_data: AnalyticsFilterModel, session: AsyncSession):
+        statuses = self.validate_filter(filter_data)
+        totals = await order_daily_stats_repository.get_totals(filter_data.from_date, filter_data.to_date, session,
+                                                               statuses=statuses)
+
+        return {
+            "from_date": str(filter_data.from_date),
+            "to_date": str(filter_data.to_date),
+            "statuses": statuses,
+            "orders": totals.orders,
+            "items": totals.items,
+            "sub_total": totals.sub_total,
+            "discount": totals.discount,
+            "revenue": totals.total_price,
+            "average_order_value": average_order_value(totals.total_price, totals.orders)
+        }
+
+    async def get_series(self, filter_data: AnalyticsFilterModel, bucket: AnalyticsBucket, session: AsyncSession):
+        statuses = self.validate_filter(filter_data)
+        rows = await order_daily_stats_repository.get_series(filter_data.from_date, filter_data.to_date, bucket.value,
+                                                             session, statuses=statuses)
+        rows_by_bucket = {row.bucket: row for row in rows}
+
+        # Bucket không có đơn vẫn trả về 0 để biểu đồ liền mạch
+        series = []
+        for start in bucket_starts(filter_data.from_date, filter_data.to_date, bucket):
+            row = rows_by_bucket.get(start)
+            orders = row.orders if row else 0
+            revenue = row.total_price if row else 0
+            series.append({
+                "bucket": str(start),
+                "orders": orders,
+                "items": row.items if row else 0,
+                "sub_total": row.sub_total if row else 0,
+                "discount": row.discount if row else 0,
+                "revenue": revenue,
+                "average_order_value": average_order_value(revenue, orders)
+            })
+
+        return {
+            "bucket": bucket.value,
+            "statuses": statuses,
+            "data": series
+        }
+
+    async def get_top_products(self, filter_data: AnalyticsFilterModel, session: AsyncSession, limit: int = 10):
+        statuses = self.validate_filter(filter_data)
+        rows = await order_daily_stats_repository.get_top_products(filter_data.from_date, filter_data.to_date, session,
+                                                                   statuses=statuses,
+                                                                   limit=min(limit, MAX_TOP_LIMIT))
+
+        return [
+            {
+                "id": str(row.product_id),
+                "name": row.name,
+                "quantity": row.quantity,
+                "revenue": row.revenue
+            }
+            for row in rows
+        ]
+
+    async def get_top_categories(self, filter_data: AnalyticsFilterModel, session: AsyncSession, limit: int = 10):
+        statuses = self.validate_filter(filter_data)
+        rows = await order_daily_stats_repository.get_top_categories(filter_data.from_date, filter_data.to_date, session,
+                                                                     statuses=statuses,
+                                                                     limit=min(limit, MAX_TOP_LIMIT))
+
+        return [
+            {
+                "id": str(row.id),
+                "name": row.name,
+                "parent_id": str(row.parent_id) if row.parent_id else None,
+                "quantity": row.quantity,
+                "revenue": row.revenue
+            }
+            for row in rows
+        ]
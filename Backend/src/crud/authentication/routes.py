@@ -10,6 +10,8 @@ from src.database.main import get_session
 from datetime import datetime
 from src.crud.authentication.services import AuthenticationService
 from src.dependencies import admin_role_middleware, customer_role_middleware
+from src.database.redis import get_jti_blocklist_stats
+from src.crud.authentication.utils import get_password_hash_stats
 
 auth_admin_router = APIRouter(prefix="/auth")
 auth_customer_router = APIRouter(prefix="/auth")
@@ -52,6 +54,28 @@ async def revoke_token(request: Request, token_details: dict = Depends(AccessTok
     )
 
 
+@auth_admin_router.get("/blocklist-stats", dependencies=[Depends(admin_role_middleware)])
+async def get_blocklist_stats(token_details: dict = Depends(AccessTokenBearer())):
+    return JSONResponse(
+        content={
+            "message": "Thống kê bộ lọc token bị thu hồi",
+            "content": get_jti_blocklist_stats()
+        },
+        status_code=status.HTTP_200_OK
+    )
+
+
+@auth_admin_router.get("/password-hash-stats", dependencies=[Depends(admin_role_middleware)])
+async def get_password_hash_pool_stats(token_details: dict = Depends(AccessTokenBearer())):
+    return JSONResponse(
+        content={
+            "message": "Thống kê pool băm mật khẩu",
+            "content": get_password_hash_stats()
+        },
+        status_code=status.HTTP_200_OK
+    )
+
+
 @auth_customer_router.get("/logout", dependencies=[Depends(customer_role_middleware)])
 async def revoke_token(request: Request, token_details: dict = Depends(AccessTokenBearer())):
     await auth_service.revoke_token_service(token_details, request)
@@ -35,7 +35,7 @@ class AuthenticationService:
         if not user:
             AuthException.invalid_account()
 
-        password_valid = verify_password(password, user.password)
+        password_valid = await verify_password(password, user.password)
 
         if not password_valid:
             AuthException.invalid_account()
@@ -184,7 +184,7 @@ class AuthenticationService:
         if not user:
             AuthException.invalid_account()
 
-        password_valid = verify_password(password, user.password)
+        password_valid = await verify_password(password, user.password)
 
         if password_valid:
             if user.is_verified:
@@ -300,7 +300,7 @@ class AuthenticationService:
         if not user:
             AuthException.user_not_found()
 
-        password_hash = generate_password_hash(data.new_password)
+        password_hash = await generate_password_hash(data.new_password)
         await user_repository.update_user(user, {'password': password_hash}, session)
         await session.commit()
 
@@ -1,5 +1,8 @@
 from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime
+import asyncio
+import time
 import jwt
 from src.config import Config
 import uuid
@@ -41,16 +44,70 @@ TOKEN_CONFIG = {
 
 ACCESS_TOKEN_EXPIRY = 60
 
+# bcrypt tốn ~200-300ms CPU, chạy trong pool riêng có giới hạn để không chặn event loop
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=Config.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
+password_hash_stats = {
+    "submitted": 0,
+    "completed": 0,
+    "queued": 0,
+    "running": 0,
+    "max_queued": 0,
+    "total_wait_ms": 0.0,
+    "total_run_ms": 0.0,
+}
+
+
+async def run_in_password_hash_pool(func, *args):
+    loop = asyncio.get_running_loop()
+    submitted_at = time.perf_counter()
+
+    password_hash_stats["submitted"] += 1
+    password_hash_stats["queued"] += 1
+    password_hash_stats["max_queued"] = max(password_hash_stats["max_queued"], password_hash_stats["queued"])
+
+    def mark_started(started_at: float):
+        password_hash_stats["queued"] -= 1
+        password_hash_stats["running"] += 1
+        password_hash_stats["total_wait_ms"] += (started_at - submitted_at) * 1000
+
+    def task():
+        started_at = time.perf_counter()
+        # Bộ đếm chỉ được sửa trên thread của event loop
+        loop.call_soon_threadsafe(mark_started, started_at)
+        return func(*args), started_at
+
+    result, started_at = await loop.run_in_executor(password_hash_executor, task)
+
+    password_hash_stats["running"] -= 1
+    password_hash_stats["completed"] += 1
+    password_hash_stats["total_run_ms"] += (time.perf_counter() - started_at) * 1000
+
+    return result
+
+
+def get_password_hash_stats() -> dict:
+    completed = password_hash_stats["completed"]
+    return {
+        **password_hash_stats,
+        "workers": Config.PASSWORD_HASH_WORKERS,
+        "avg_wait_ms": round(password_hash_stats["total_wait_ms"] / completed, 2) if completed else 0.0,
+        "avg_run_ms": round(password_hash_stats["total_run_ms"] / completed, 2) if completed else 0.0,
+    }
+
 
 # Hàm băm mật khẩu
-def generate_password_hash(password: str) -> str:
-    hash = passwd_context.hash(password)
+async def generate_password_hash(password: str) -> str:
+    hash = await run_in_password_hash_pool(passwd_context.hash, password)
     return hash
 
 
 # Hàm kiểm tra xem mật khẩu nhập vào có khớp với mã băm hay không.
-def verify_password(password: str, hash: str) -> bool:
-    return passwd_context.verify(password, hash)
+async def verify_password(password: str, hash: str) -> bool:
+    return await run_in_password_hash_pool(passwd_context.verify, password, hash)
 
 
 # Token chính cho đăng nhập
@@ -68,16 +125,47 @@ def create_access_token(user_data: dict, role: str, expiry: timedelta = None, re
 
     secret_key = ROLE_SECRET_MAP[role]
 
+    # kid cho biết secret nào đã ký token, để khi giải mã không phải thử từng secret
     token = jwt.encode(
         payload=payload,
         key=secret_key,
-        algorithm=Config.JWT_ALGORITHM
+        algorithm=Config.JWT_ALGORITHM,
+        headers={"kid": role}
     )
 
     return token
 
 
 def decode_token(token: str):
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+    except InvalidTokenError:
+        logging.warning("Header của mã thông báo không hợp lệ")
+        return None
+
+    if kid is not None:
+        # kid lấy từ header chưa xác thực: không phải chuỗi (list, dict...) thì coi là token không hợp lệ
+        if not isinstance(kid, str):
+            logging.warning("kid của mã thông báo không phải chuỗi")
+            return None
+
+        secret_key = ROLE_SECRET_MAP.get(kid)
+        if secret_key is None:
+            logging.warning(f"Không tồn tại secret cho kid={kid}")
+            return None
+
+        try:
+            token_data = jwt.decode(
+                jwt=token,
+                key=secret_key,
+                algorithms=[Config.JWT_ALGORITHM]
+            )
+        except InvalidTokenError:
+            return None
+
+        return token_data if token_data.get("role") == kid else None
+
+    # Token cũ chưa có kid: thử lần lượt các secret
     for role, secret_key in ROLE_SECRET_MAP.items():
         try:
             token_data = jwt.decode(
@@ -1,6 +1,6 @@
 from typing import Optional, List
 from sqlalchemy import ColumnElement
-from src.database.models import Categories
+from src.database.models import Categories, Categories_Product, Product
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select, func, and_
 from sqlalchemy.orm import noload
@@ -74,6 +74,37 @@ class CategoriesRepository:
 
         return data_need_update
 
+    async def get_category_tree_rows(self, session: AsyncSession):
+        statement = (
+            select(Categories.id, Categories.name, Categories.image, Categories.parent_id, Categories.type_size)
+            .where(Categories.deleted_at.is_(None))
+            .order_by(Categories.created_at, Categories.id)
+        )
+        result = await session.exec(statement)
+
+        return result.all()
+
+    async def get_suggest_categories(self, session: AsyncSession):
+        # Độ phổ biến của danh mục = tổng popularity_score các sản phẩm đang bán trong danh mục
+        statement = (
+            select(
+                Categories.id,
+                Categories.name,
+                func.coalesce(func.sum(Product.popularity_score), 0).label("popularity_score")
+            )
+            .outerjoin(Categories_Product, Categories_Product.categories_id == Categories.id)
+            .outerjoin(Product, and_(
+                Product.id == Categories_Product.product_id,
+                Product.deleted_at.is_(None),
+                Product.status == "active"
+            ))
+            .where(Categories.deleted_at.is_(None))
+            .group_by(Categories.id, Categories.name)
+        )
+        result = await session.exec(statement)
+
+        return result.all()
+
     async def delete_categories(self, condition: Optional[ColumnElement[bool]], session: AsyncSession):
         categories_to_delete = await self.get_category(condition, session)
 
@@ -90,3 +121,5 @@ class CategoriesRepository:
 
         for sub_cat in sub_categories:
             sub_cat.deleted_at = datetime.now()
+
+        return [sub_cat.id for sub_cat in sub_categories]
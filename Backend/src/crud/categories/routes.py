@@ -1,4 +1,4 @@
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Request
 from src.crud.categories.services import CategoriesService
 from src.dependencies import AccessTokenBearer
 from src.schemas.categories import CategoriesCreateModel, CategoriesUpdateModel, CategoriesFilterModel
@@ -6,6 +6,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from src.database.main import get_session
 from fastapi.responses import JSONResponse
 from src.dependencies import admin_role_middleware
+from src.http_cache import http_cache
 from typing import Optional
 import time
 
@@ -18,10 +19,10 @@ access_token_bearer = AccessTokenBearer()
 
 
 @categories_admin_router.post("/", status_code=status.HTTP_201_CREATED, dependencies=[Depends(admin_role_middleware)])
-async def create_categories(categories_data: CategoriesCreateModel,
+async def create_categories(categories_data: CategoriesCreateModel, request: Request,
                             token_details: dict = Depends(access_token_bearer),
                             session: AsyncSession = Depends(get_session)):
-    new_categories_dict = await categories_service.create_categories_service(categories_data, session)
+    new_categories_dict = await categories_service.create_categories_service(categories_data, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_201_CREATED,
@@ -33,7 +34,8 @@ async def create_categories(categories_data: CategoriesCreateModel,
 
 
 @categories_admin_router.get('/all', dependencies=[Depends(admin_role_middleware)])
-async def get_all_categories_admin(search: Optional[str] = None,
+async def get_all_categories_admin(request: Request,
+                                   search: Optional[str] = None,
                                    parent_id: Optional[str] = None,
                                    type_size: Optional[str] = None,
                                    session: AsyncSession = Depends(get_session),
@@ -45,7 +47,7 @@ async def get_all_categories_admin(search: Optional[str] = None,
         type_size=type_size
     )
 
-    categories = await categories_service.get_all_categories_service(filter_data, session, skip, limit)
+    categories = await categories_service.get_all_categories_service(filter_data, session, skip, limit, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -56,14 +58,15 @@ async def get_all_categories_admin(search: Optional[str] = None,
     )
 
 
-@categories_customer_router.get('/all')
-async def get_all_categories_customer(search: Optional[str] = None, session: AsyncSession = Depends(get_session),
+@categories_customer_router.get('/all', dependencies=[Depends(http_cache(max_age=300, stale_while_revalidate=60))])
+async def get_all_categories_customer(request: Request, search: Optional[str] = None,
+                                      session: AsyncSession = Depends(get_session),
                                       skip: int = 0, limit: int = 10):
     filter_data = CategoriesFilterModel(
         search=search
     )
 
-    categories = await categories_service.get_all_categories_service(filter_data, session, skip, limit)
+    categories = await categories_service.get_all_categories_service(filter_data, session, skip, limit, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -92,9 +95,10 @@ async def get_detail_category(id: str,
 @categories_admin_router.put('/{id}', dependencies=[Depends(admin_role_middleware)])
 async def update_categories(id: str,
                             categories_update: CategoriesUpdateModel,
+                            request: Request,
                             token_details: dict = Depends(access_token_bearer),
                             session: AsyncSession = Depends(get_session)):
-    categories_update_dict = await categories_service.update_categories_service(id, categories_update, session)
+    categories_update_dict = await categories_service.update_categories_service(id, categories_update, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -106,9 +110,9 @@ async def update_categories(id: str,
 
 
 @categories_admin_router.delete('/{id}', dependencies=[Depends(admin_role_middleware)])
-async def delete_categories(id: str, token_details: dict = Depends(access_token_bearer),
+async def delete_categories(id: str, request: Request, token_details: dict = Depends(access_token_bearer),
                             session: AsyncSession = Depends(get_session)):
-    categories_delete = await categories_service.delete_categories_service(id, session)
+    categories_delete = await categories_service.delete_categories_service(id, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
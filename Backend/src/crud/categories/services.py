@@ -6,21 +6,28 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import and_, select, func, or_
 from sqlalchemy.orm import aliased
 from src.crud.categories.repositories import CategoriesRepository
+from src.crud.product_card.repositories import ProductCardRepository
+from src.crud.categories.tree import category_tree_cache
+from src.database.redis import invalidate_product_detail_cache
+from fastapi import Request
 from src.errors.categories import CategoriesException
 import time
 
 categories_repository = CategoriesRepository()
+product_card_repository = ProductCardRepository()
 size_service = SizeService()
 
 class CategoriesService:
-    async def create_categories_service(self, categories_data: CategoriesCreateModel, session: AsyncSession):
-        sizes = await size_service.get_all_size(session)
+    async def create_categories_service(self, categories_data: CategoriesCreateModel, session: AsyncSession,
+                                        request: Request = None):
+        sizes = await size_service.get_all_size(session, request)
         valid_types = {s["type"] for s in sizes}
 
         if categories_data.type_size not in valid_types:
             SizeException.size_not_exists()
 
         new_categories = await categories_repository.create_categories(categories_data, session)
+        await category_tree_cache.invalidate(request)
 
         new_categories_dict = {
             "id": str(new_categories.id),
@@ -33,8 +40,8 @@ class CategoriesService:
         return new_categories_dict
 
     async def get_all_categories_service(self, filter_data: CategoriesFilterModel, session: AsyncSession, skip: int = 0,
-                                         limit: int = 5):
-        sizes = await size_service.get_all_size(session)
+                                         limit: int = 5, request: Request = None):
+        sizes = await size_service.get_all_size(session, request)
         size_map = {s["type"]: {"id": str(s["id"]), "name": s["name"], "type": s["type"]} for s in sizes}
 
         if filter_data.type_size and filter_data.type_size not in size_map:
@@ -44,74 +51,52 @@ class CategoriesService:
                 "sizes": list(size_map.values())
             }
 
-        if filter_data.search:
-            filters = [Categories.deleted_at.is_(None), Categories.name.ilike(f"%{filter_data.search}%")]
-            if filter_data.type_size:
-                filters.append(Categories.type_size == filter_data.type_size)
+        tree = await category_tree_cache.get(session, request)
 
-            matched_categories, _ = await categories_repository.get_all_categories(filters, session, 0, 1000)
+        if filter_data.search:
+            search = filter_data.search.lower()
+            matched_categories = [
+                cat for cat in tree.rows
+                if search in cat["name"].lower()
+                and (not filter_data.type_size or cat["type_size"] == filter_data.type_size)
+            ]
 
-            matched_parents = [cat for cat in matched_categories if cat.parent_id is None]
-            matched_children = [cat for cat in matched_categories if cat.parent_id is not None]
+            matched_parents = [cat for cat in matched_categories if cat["parent_id"] is None]
+            matched_children = [cat for cat in matched_categories if cat["parent_id"] is not None]
 
-            additional_parent_ids = {cat.parent_id for cat in matched_children if cat.parent_id} - {p.id for p in matched_parents}
-            additional_parents = []
-            if additional_parent_ids:
-                parent_filters = [Categories.deleted_at.is_(None), Categories.id.in_(additional_parent_ids)]
-                additional_parents, _ = await categories_repository.get_all_categories(parent_filters, session, 0, 1000)
+            matched_parent_ids = {cat["id"] for cat in matched_parents}
+            additional_parent_ids = {cat["parent_id"] for cat in matched_children} - matched_parent_ids
+            additional_parents = [tree.nodes[cat_id] for cat_id in tree.roots if cat_id in additional_parent_ids]
 
             all_relevant_parents = matched_parents + additional_parents
+            paginated_parents = all_relevant_parents[skip:skip + limit]
 
-            start_idx = skip
-            end_idx = skip + limit
-            paginated_parents = all_relevant_parents[start_idx:end_idx]
+            paginated_parent_ids = {cat["id"] for cat in paginated_parents}
+            final_children = [child for child in matched_children if child["parent_id"] in paginated_parent_ids]
 
-            paginated_parent_ids = {p.id for p in paginated_parents}
-            final_children = [child for child in matched_children if child.parent_id in paginated_parent_ids]
-
-            final_categories = list(paginated_parents) + final_children
+            final_categories = paginated_parents + final_children
 
             return {
-                "data": [
-                    {
-                        "id": str(cat.id),
-                        "name": cat.name,
-                        "image": cat.image,
-                        "parent_id": str(cat.parent_id) if cat.parent_id else None,
-                        "type_size": cat.type_size,
-                    }
-                    for cat in final_categories
-                ],
+                "data": final_categories,
                 "total": len(final_categories),
                 "sizes": list(size_map.values())
             }
         else:
-            filters = [Categories.deleted_at.is_(None), Categories.parent_id.is_(None)]
-            if filter_data.type_size:
-                filters.append(Categories.type_size.in_(filter_data.type_size))
-            parent_categories, parent_total = await categories_repository.get_all_categories(filters, session, skip, limit)
-
-            parent_ids = [cat.id for cat in parent_categories]
-            if parent_ids:
-                child_filters = [Categories.deleted_at.is_(None), Categories.parent_id.in_(parent_ids)]
-                child_categories, _ = await categories_repository.get_all_categories(child_filters, session, 0, 1000)
-            else:
-                child_categories = []
-
-            all_categories = list(parent_categories) + list(child_categories)
+            parent_categories = [
+                tree.nodes[cat_id] for cat_id in tree.roots
+                if not filter_data.type_size or tree.nodes[cat_id]["type_size"] == filter_data.type_size
+            ]
+            paginated_parents = parent_categories[skip:skip + limit]
+
+            child_categories = [
+                tree.nodes[child_id]
+                for parent in paginated_parents
+                for child_id in tree.children[parent["id"]]
+            ]
 
             return {
-                "data": [
-                    {
-                        "id": str(cat.id),
-                        "name": cat.name,
-                        "image": cat.image,
-                        "parent_id": str(cat.parent_id) if cat.parent_id else None,
-                        "type_size": cat.type_size,
-                    }
-                    for cat in all_categories
-                ],
-                "total": parent_total,
+                "data": paginated_parents + child_categories,
+                "total": len(parent_categories),
                 "sizes": list(size_map.values())
             }
 
@@ -132,7 +117,8 @@ class CategoriesService:
 
 
 
-    async def update_categories_service(self, id: str, categories_update: CategoriesUpdateModel, session: AsyncSession):
+    async def update_categories_service(self, id: str, categories_update: CategoriesUpdateModel, session: AsyncSession,
+                                        request: Request = None):
         condition = and_(Categories.id == id)
         category = await categories_repository.get_category(condition, session)
 
@@ -151,8 +137,13 @@ class CategoriesService:
                 CategoriesException.parent_not_found()
 
         await categories_repository.update_categories(category, update_data, session)
+        product_ids = await product_card_repository.refresh_product_cards_by_categories([category.id], session)
         await session.commit()
         await session.refresh(category)
+        await category_tree_cache.invalidate(request)
+
+        if request is not None:
+            await invalidate_product_detail_cache(product_ids, request)
 
         response_dict = {
             "id": str(category.id),
@@ -164,12 +155,17 @@ class CategoriesService:
 
         return response_dict
 
-    async def delete_categories_service(self, id: str, session: AsyncSession):
+    async def delete_categories_service(self, id: str, session: AsyncSession, request: Request = None):
         condition = and_(Categories.id == id, Categories.deleted_at.is_(None))
         await categories_repository.delete_categories(condition, session)
 
         sub_categories_condition = [Categories.parent_id == id, Categories.deleted_at.is_(None)]
-        await categories_repository.delete_sub_categories(sub_categories_condition, session)
+        sub_category_ids = await categories_repository.delete_sub_categories(sub_categories_condition, session)
 
+        product_ids = await product_card_repository.refresh_product_cards_by_categories([id, *sub_category_ids], session)
         await session.commit()
+        await category_tree_cache.invalidate(request)
+
+        if request is not None:
+            await invalidate_product_detail_cache(product_ids, request)
         return {}
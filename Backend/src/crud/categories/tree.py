@@ -0,0 +1,99 @@
+import time
+from fastapi import Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.config import Config
+from src.crud.categories.repositories import CategoriesRepository
+from src.database.redis import get_category_tree_version, get_category_tree_cache, set_category_tree_cache, \
+    bump_category_tree_version
+
+# Khoảng thời gian tin bản trong bộ nhớ mà không hỏi lại version trên Redis
+CATEGORY_TREE_CHECK_INTERVAL = 5
+
+categories_repository = CategoriesRepository()
+
+
+class CategoryTree:
+    def __init__(self, rows: list[dict], version: int = 0):
+        self.version = version
+        self.rows = rows
+        self.nodes: dict[str, dict] = {row["id"]: row for row in rows}
+        self.roots: list[str] = []
+        self.children: dict[str, list[str]] = {row["id"]: [] for row in rows}
+
+        for row in rows:
+            parent_id = row["parent_id"]
+            if parent_id is None:
+                self.roots.append(row["id"])
+            elif parent_id in self.children:
+                self.children[parent_id].append(row["id"])
+
+        self.ancestors: dict[str, list[str]] = {}
+        for row in rows:
+            chain, parent_id = [], row["parent_id"]
+            while parent_id is not None and parent_id in self.nodes and parent_id not in chain:
+                chain.append(parent_id)
+                parent_id = self.nodes[parent_id]["parent_id"]
+            self.ancestors[row["id"]] = chain
+
+        # Bản thân + mọi hậu duệ, tính sẵn để tra cứu O(1) khi lọc sản phẩm
+        self.descendants: dict[str, list[str]] = {row["id"]: [row["id"]] for row in rows}
+        for category_id, ancestor_ids in self.ancestors.items():
+            for ancestor_id in ancestor_ids:
+                self.descendants[ancestor_id].append(category_id)
+
+    def get(self, category_id: str) -> dict | None:
+        return self.nodes.get(str(category_id))
+
+    def get_descendant_ids(self, category_id: str) -> list[str]:
+        return self.descendants.get(str(category_id), [])
+
+
+class CategoryTreeCache:
+    def __init__(self):
+        self.tree: CategoryTree | None = None
+        self.loaded_at = 0.0
+        self.checked_at = 0.0
+
+    async def get(self, session: AsyncSession, request: Request = None) -> CategoryTree:
+        now = time.monotonic()
+        # Dù Redis không đổi version (hoặc không đọc được), bản trong bộ nhớ vẫn hết hạn sau REFERENCE_CACHE_TTL
+        fresh = self.tree is not None and now - self.loaded_at < Config.REFERENCE_CACHE_TTL
+        if fresh and now - self.checked_at < CATEGORY_TREE_CHECK_INTERVAL:
+            return self.tree
+
+        version = await get_category_tree_version(request) if request is not None else None
+        if fresh and (version is None or version == self.tree.version):
+            self.checked_at = now
+            return self.tree
+
+        # Bản trong bộ nhớ hết hạn thì đọc lại từ DB: bản trên Redis có thể cũng đã cũ nếu lần tăng version bị mất
+        expired = self.tree is not None and not fresh
+        cached = await get_category_tree_cache(request) if request is not None and not expired else None
+        if cached is not None and cached["version"] == version:
+            self.tree = CategoryTree(cached["rows"], version)
+        else:
+            rows = await categories_repository.get_category_tree_rows(session)
+            rows = [
+                {
+                    "id": str(row.id),
+                    "name": row.name,
+                    "image": row.image,
+                    "parent_id": str(row.parent_id) if row.parent_id else None,
+                    "type_size": row.type_size,
+                }
+                for row in rows
+            ]
+            self.tree = CategoryTree(rows, version or 0)
+            if request is not None and version is not None:
+                await set_category_tree_cache({"version": version, "rows": rows}, request)
+
+        self.loaded_at = self.checked_at = now
+        return self.tree
+
+    async def invalidate(self, request: Request = None) -> None:
+        self.tree = None
+        if request is not None:
+            await bump_category_tree_version(request)
+
+
+category_tree_cache = CategoryTreeCache()
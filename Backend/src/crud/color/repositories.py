@@ -38,6 +38,17 @@ class ColorRepository:
         return colors, total
 
 
+    async def get_reference_colors(self, session: AsyncSession):
+        statement = (
+            select(Color.id, Color.name, Color.code)
+            .where(Color.deleted_at.is_(None))
+            .order_by(Color.created_at, Color.id)
+        )
+        result = await session.exec(statement)
+
+        return result.all()
+
+
     async def get_color(self, conditions: Optional[ColumnElement[bool]], session: AsyncSession, joins: list = None):
         base_condition = Color.deleted_at.is_(None)
         if conditions is not None:
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Request
 from typing import Optional
 from src.crud.color.services import ColorService
 from src.dependencies import AccessTokenBearer
@@ -16,10 +16,10 @@ color_service = ColorService()
 access_token_bearer = AccessTokenBearer()
 
 @color_admin_router.post("/", status_code=status.HTTP_201_CREATED, dependencies=[Depends(admin_role_middleware)])
-async def create_color(color_data: ColorCreateModel,
+async def create_color(color_data: ColorCreateModel, request: Request,
                        token_details: dict = Depends(access_token_bearer),
                        session: AsyncSession = Depends(get_session)):
-    new_color_dict = await color_service.create_color_service(color_data, session)
+    new_color_dict = await color_service.create_color_service(color_data, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_201_CREATED,
@@ -30,12 +30,12 @@ async def create_color(color_data: ColorCreateModel,
     )
 
 @color_admin_router.get("/", status_code=status.HTTP_200_OK, dependencies=[Depends(admin_role_middleware)])
-async def get_all_color(search: Optional[str] = None,
+async def get_all_color(request: Request, search: Optional[str] = None,
                         skip: int = 0, limit: int = 10,
                         token_details: dict = Depends(access_token_bearer),
                         session: AsyncSession = Depends(get_session)):
     filter_data = ColorFilterModel(search=search)
-    colors_dict = await color_service.get_all_color(session, filter_data, skip, limit)
+    colors_dict = await color_service.get_all_color(session, filter_data, skip, limit, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -48,9 +48,10 @@ async def get_all_color(search: Optional[str] = None,
 @color_admin_router.put('/{id}', dependencies=[Depends(admin_role_middleware)])
 async def update_color(id: str,
                        color_update: ColorUpdateModel,
+                       request: Request,
                        token_details: dict = Depends(access_token_bearer),
                        session: AsyncSession = Depends(get_session)):
-    color_update_dict = await color_service.update_color_service(id, color_update, session)
+    color_update_dict = await color_service.update_color_service(id, color_update, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -61,10 +62,10 @@ async def update_color(id: str,
     )
 
 @color_admin_router.delete('/{id}', dependencies=[Depends(admin_role_middleware)])
-async def delete_color(id: str,
+async def delete_color(id: str, request: Request,
                        token_details: dict = Depends(access_token_bearer),
                        session: AsyncSession = Depends(get_session)):
-    color_deleted = await color_service.delete_color(id, session)
+    color_deleted = await color_service.delete_color(id, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -1,14 +1,36 @@
 from src.crud.color.repositories import ColorRepository
+from src.crud.product_card.repositories import ProductCardRepository
 from src.database.models import Color
+from src.database.reference import ReferenceDataCache
+from src.database.redis import invalidate_product_detail_cache
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import and_, or_
 from src.errors.color import ColorException
 from src.schemas.color import ColorCreateModel, ColorFilterModel, ColorUpdateModel
+from fastapi import Request
 
 color_repository = ColorRepository()
+product_card_repository = ProductCardRepository()
+
+
+async def load_colors(session: AsyncSession):
+    colors = await color_repository.get_reference_colors(session)
+
+    return [
+        {
+            "id": str(color.id),
+            "name": color.name,
+            "code": color.code,
+        }
+        for color in colors
+    ]
+
+
+color_cache = ReferenceDataCache("color", load_colors)
+
 
 class ColorService:
-    async def create_color_service(self, color_data: ColorCreateModel, session: AsyncSession):
+    async def create_color_service(self, color_data: ColorCreateModel, session: AsyncSession, request: Request = None):
         new_color = await color_repository.create_color(color_data, session)
 
         new_color_dict = {
@@ -18,38 +40,40 @@ class ColorService:
         }
 
         await session.commit()
+        await color_cache.invalidate(request)
 
         return new_color_dict
 
 
-    async def get_all_color(self, session: AsyncSession, filter_data: ColorFilterModel, skip: int = 0, limit: int = 10):
-        conditions = [Color.deleted_at.is_(None)]
-        if filter_data.search:
-            search_term = f"%{filter_data.search}%"
-            conditions.append(or_(
-                Color.name.ilike(search_term),
-                Color.code.ilike(search_term),
-            ))
+    async def get_all_color(self, session: AsyncSession, filter_data: ColorFilterModel, skip: int = 0, limit: int = 10,
+                            request: Request = None):
+        colors = await color_cache.get(session, request)
 
+        if filter_data.search:
+            search_term = filter_data.search.lower()
+            colors = [
+                color for color in colors
+                if search_term in color["name"].lower() or search_term in color["code"].lower()
+            ]
 
+        return {
+            "data": [dict(color) for color in colors[skip:skip + limit]],
+            "total": len(colors),
+        }
 
-        colors, total = await color_repository.get_all_color(conditions, session, skip, limit)
 
-        response = []
-        for color in colors:
-            response.append({
-                "id": str(color.id),
-                "name": color.name,
-                "code": color.code,
-            })
+    async def validate_color_ids(self, color_ids: list, session: AsyncSession, request: Request = None):
+        if not color_ids:
+            return
 
-        return {
-            "data": response,
-            "total": total,
-        }
+        color_map = await color_cache.get_map(session, request)
+        missing_color_ids = {str(color_id) for color_id in color_ids} - color_map.keys()
+        if missing_color_ids:
+            ColorException.color_not_exists()
 
 
-    async def update_color_service(self, id: str, color_update: ColorUpdateModel, session: AsyncSession):
+    async def update_color_service(self, id: str, color_update: ColorUpdateModel, session: AsyncSession,
+                                   request: Request = None):
         condition = and_(Color.id == id)
         color = await color_repository.get_color(condition, session)
 
@@ -59,8 +83,14 @@ class ColorService:
         update_data = color_update.model_dump(exclude_none=True)
 
         await color_repository.update_color(color, update_data, session)
+        # Facet màu trên thẻ sản phẩm lấy tên từ bảng color
+        product_ids = await product_card_repository.refresh_product_cards_by_colors([color.id], session)
         await session.commit()
         await session.refresh(color)
+        await color_cache.invalidate(request)
+
+        if request is not None:
+            await invalidate_product_detail_cache(product_ids, request)
 
         response_dict = {
             "id": str(color.id),
@@ -71,6 +101,9 @@ class ColorService:
         return response_dict
 
 
-    async def delete_color(self, color_id: str, session: AsyncSession):
+    async def delete_color(self, color_id: str, session: AsyncSession, request: Request = None):
         condition = and_(Color.id == color_id)
-        return await color_repository.delete_color(condition, session)
\ No newline at end of file
+        deleted_id = await color_repository.delete_color(condition, session)
+        await color_cache.invalidate(request)
+
+        return deleted_id
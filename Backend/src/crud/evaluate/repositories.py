@@ -80,20 +80,12 @@ class EvaluateRepository:
         evaluate.additional_image = data.additional_image
         evaluate.additional_created_at = datetime.now()
 
-    async def get_average_rate(self, condition: Optional[ColumnElement[bool]], session: AsyncSession):
-        statement = select(func.avg(Evaluate.rate)).where(condition)
-        result = await session.exec(statement)
-        average = result.one_or_none()
-
-        return average
-
     async def delete_evaluate(self, condition: Optional[ColumnElement[bool]], session: AsyncSession):
-        evaluate_delete = await self.get_evaluate(condition, session)
+        evaluate_delete = await self.get_evaluate(and_(condition, Evaluate.deleted_at.is_(None)), session)
 
         if evaluate_delete is None:
             EvaluateException.review_not_found_to_delete()
 
         evaluate_delete.deleted_at = datetime.now()
-        await session.commit()
 
-        return str(evaluate_delete.id)
+        return evaluate_delete
@@ -7,6 +7,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from src.database.main import get_session
 from fastapi.responses import JSONResponse
 from src.dependencies import admin_role_middleware, customer_role_middleware
+from src.database.query_budget import query_budget
 
 evaluate_admin_router = APIRouter(prefix="/evaluate")
 evaluate_customer_router = APIRouter(prefix="/evaluate")
@@ -49,7 +50,8 @@ async def get_my_evaluates(token_details: dict = Depends(access_token_bearer),
     )
 
 
-@evaluate_admin_router.get("/", status_code=status.HTTP_200_OK, dependencies=[Depends(admin_role_middleware)])
+@evaluate_admin_router.get("/", status_code=status.HTTP_200_OK,
+                           dependencies=[Depends(admin_role_middleware), Depends(query_budget(6))])
 async def get_all_evaluate_admin(search: Optional[str] = None,
                                  rate: Optional[int] = None,
                                  sort_by_created_at: Optional[str] = None,
@@ -126,6 +128,20 @@ async def get_average_rate(product_id: str,
     )
 
 
+@evaluate_customer_router.get("/rating-summary/{product_id}", status_code=status.HTTP_200_OK)
+async def get_rating_summary(product_id: str,
+                             session: AsyncSession = Depends(get_session)):
+    rating_summary = await evaluate_service.get_rating_summary(product_id, session)
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Tổng hợp đánh giá của sản phẩm",
+            "content": rating_summary
+        }
+    )
+
+
 @evaluate_customer_router.patch("/{id}/supplement", dependencies=[Depends(customer_role_middleware)])
 async def supplement_evaluate(id: str, data: SupplementEvaluateModel,
                               token_details: dict = Depends(access_token_bearer),
@@ -2,6 +2,7 @@ from datetime import datetime
 from src.crud.order_detail.repositories import OrderDetailRepository
 from src.crud.evaluate.repositories import EvaluateRepository
 from src.crud.product.repositories import ProductRepository
+from src.crud.product_card.repositories import ProductCardRepository
 from src.database.models import Evaluate, Order_Detail, User, Order, Product, Product_Variant, Color
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import and_, func, or_, asc, desc
@@ -9,14 +10,22 @@ from sqlalchemy.orm import selectinload, joinedload, noload, load_only
 from src.schemas.evaluate import EvaluateCreateModel, EvaluateInputModel, SupplementEvaluateModel, GetEvaluateByProduct, \
     EvaluateFilterModel
 from src.errors.evaluate import EvaluateException
+from src.errors.product import ProductException
+from src.database.loaders import loader_profile
 
 evaluate_repository = EvaluateRepository()
 order_detail_repository = OrderDetailRepository()
 product_repository = ProductRepository()
+product_card_repository = ProductCardRepository()
+
+RATING_STARS = range(1, 6)
 
 
 class EvaluateService:
     async def create_evaluate_service(self, customer_id, evaluate_data: EvaluateInputModel, session: AsyncSession):
+        if evaluate_data.rate not in RATING_STARS:
+            EvaluateException.invalid_rate()
+
         condition = and_(Order_Detail.id == evaluate_data.order_detail_id, Order_Detail.deleted_at.is_(None))
         joins = [
             selectinload(Order_Detail.order).options(
@@ -49,17 +58,9 @@ class EvaluateService:
 
         new_evaluate = await evaluate_repository.create_evaluate(evaluate_create_data, session)
 
-        avg_rating = await evaluate_repository.get_average_rate(
-            Evaluate.product_id == order_detail.product_id,
-            session
-        )
-        avg_rating = avg_rating if avg_rating else 0.0
-
-        await product_repository.update_product_some_field(
-            Product.id == order_detail.product_id,
-            {"avg_rating": avg_rating, "updated_at": datetime.now()},
-            session
-        )
+        # Đánh giá và bộ đếm của sản phẩm được ghi trong cùng 1 transaction
+        await product_repository.update_rating_counters(order_detail.product_id, new_evaluate.rate, 1, session)
+        await product_card_repository.refresh_product_cards([order_detail.product_id], session)
 
         new_evaluate_dict = {
             "id": str(new_evaluate.id),
@@ -74,9 +75,7 @@ class EvaluateService:
 
     async def get_evaluates_by_customer(self, customer_id: str, session: AsyncSession, skip: int = 0, limit: int = 10):
         condition = and_(Evaluate.user_id == customer_id)
-        joins = [
-            selectinload(Evaluate.user), selectinload(Evaluate.product), selectinload(Evaluate.product_variant)
-        ]
+        joins = loader_profile("evaluate_public")
         evaluates = await evaluate_repository.get_all_evaluate(condition, session, joins, skip, limit)
 
         if not evaluates:
@@ -139,50 +138,7 @@ class EvaluateService:
         if not order_by:
             order_by = [desc(Evaluate.created_at)]
 
-        joins = [
-            joinedload(Evaluate.order_detail).options(
-                noload(Order_Detail.product),
-                noload(Order_Detail.product_variant),
-                noload(Order_Detail.evaluate),
-                joinedload(Order_Detail.order).options(
-                    noload(Order.user),
-                    noload(Order.order_detail),
-                ).load_only(
-                    Order.code
-                ),
-            ),
-            joinedload(Evaluate.user).options(
-                noload(User.address),
-                noload(User.order),
-                noload(User.evaluate),
-            ).load_only(
-                User.first_name,
-                User.last_name,
-            ),
-            joinedload(Evaluate.product).options(
-                noload(Product.order_detail),
-                noload(Product.categories_product),
-                noload(Product.product_variant),
-                noload(Product.evaluate),
-                noload(Product.categories),
-                noload(Product.special_offer),
-            ).load_only(
-                Product.name
-            ),
-            joinedload(Evaluate.product_variant).options(
-                noload(Product_Variant.order_detail),
-                noload(Product_Variant.product),
-                noload(Product_Variant.evaluate),
-                joinedload(Product_Variant.color).options(
-                    noload(Color.product_variant),
-                ).load_only(
-                    Color.name
-                )
-            ).load_only(
-                Product_Variant.color_name,
-                Product_Variant.size
-            )
-        ]
+        joins = loader_profile("evaluate_admin")
 
         evaluates, total = await evaluate_repository.get_all_evaluate(conditions, session, order_by, joins, skip, limit,
                                                                       need_join)
@@ -218,50 +174,7 @@ class EvaluateService:
         }
 
     async def get_detail_evaluate_admin(self, id: str, session: AsyncSession):
-        joins = [
-            joinedload(Evaluate.order_detail).options(
-                noload(Order_Detail.product),
-                noload(Order_Detail.product_variant),
-                noload(Order_Detail.evaluate),
-                joinedload(Order_Detail.order).options(
-                    noload(Order.user),
-                    noload(Order.order_detail),
-                ).load_only(
-                    Order.code
-                ),
-            ),
-            joinedload(Evaluate.user).options(
-                noload(User.address),
-                noload(User.order),
-                noload(User.evaluate),
-            ).load_only(
-                User.first_name,
-                User.last_name,
-            ),
-            joinedload(Evaluate.product).options(
-                noload(Product.order_detail),
-                noload(Product.categories_product),
-                noload(Product.product_variant),
-                noload(Product.evaluate),
-                noload(Product.categories),
-                noload(Product.special_offer),
-            ).load_only(
-                Product.name
-            ),
-            joinedload(Evaluate.product_variant).options(
-                noload(Product_Variant.order_detail),
-                noload(Product_Variant.product),
-                noload(Product_Variant.evaluate),
-                joinedload(Product_Variant.color).options(
-                    noload(Color.product_variant),
-                ).load_only(
-                    Color.name
-                )
-            ).load_only(
-                Product_Variant.color_name,
-                Product_Variant.size
-            )
-        ]
+        joins = loader_profile("evaluate_admin")
 
         condition = and_(Evaluate.id == id, Evaluate.deleted_at.is_(None))
         evaluate = await evaluate_repository.get_evaluate(condition, session, joins)
@@ -295,9 +208,7 @@ class EvaluateService:
         }
 
     async def get_all_evaluate_customer(self, session: AsyncSession, skip: int = 0, limit: int = 10):
-        joins = [
-            selectinload(Evaluate.user), selectinload(Evaluate.product), selectinload(Evaluate.product_variant)
-        ]
+        joins = loader_profile("evaluate_public")
         evaluates = await evaluate_repository.get_all_evaluate(None, session, joins, skip, limit)
 
         if not evaluates:
@@ -338,7 +249,7 @@ class EvaluateService:
 
         condition = and_(*conditions)
 
-        joins = [selectinload(Evaluate.user), selectinload(Evaluate.product_variant)]
+        joins = loader_profile("evaluate_public")
         evaluates = await evaluate_repository.get_all_evaluate(condition, session, joins, skip, limit)
 
         if not evaluates:
@@ -368,9 +279,19 @@ class EvaluateService:
         return response
 
     async def get_average_rate(self, product_id: str, session: AsyncSession):
-        conditions = and_(Evaluate.product_id == product_id)
-        average = await evaluate_repository.get_average_rate(conditions, session)
-        return round(average, 1) if average else 0.0
+        summary = await self.get_rating_summary(product_id, session)
+        return summary["average"]
+
+    async def get_rating_summary(self, product_id: str, session: AsyncSession):
+        counters = await product_repository.get_rating_counters(product_id, session)
+        if counters is None:
+            ProductException.not_found()
+
+        return {
+            "average": round(counters.rating_sum / counters.rating_count, 1) if counters.rating_count else 0.0,
+            "count": counters.rating_count,
+            "histogram": {str(star): getattr(counters, f"rating_{star}") for star in reversed(RATING_STARS)}
+        }
 
     async def supplement_evaluate(self, evaluate_id: str, customer_id: str,
                                   data: SupplementEvaluateModel, session: AsyncSession):
@@ -383,4 +304,13 @@ class EvaluateService:
 
     async def delete_evaluate(self, evaluate_id: str, session: AsyncSession):
         condition = and_(Evaluate.id == evaluate_id)
-        return await evaluate_repository.delete_evaluate(condition, session)
+        evaluate_deleted = await evaluate_repository.delete_evaluate(condition, session)
+
+        # Bộ đếm chỉ tính các đánh giá 1-5 sao
+        if evaluate_deleted.rate in RATING_STARS:
+            await product_repository.update_rating_counters(evaluate_deleted.product_id, evaluate_deleted.rate, -1,
+                                                            session)
+            await product_card_repository.refresh_product_cards([evaluate_deleted.product_id], session)
+        await session.commit()
+
+        return str(evaluate_deleted.id)
@@ -0,0 +1,39 @@
+from typing import Optional
+from fastapi import APIRouter, status, Depends
+from fastapi.responses import JSONResponse, PlainTextResponse
+from src.dependencies import AccessTokenBearer
+from src.dependencies import admin_role_middleware
+from src.database.profiler import get_query_stats, render_prometheus, reset_query_stats
+
+monitoring_admin_router = APIRouter(prefix="/monitoring")
+
+access_token_bearer = AccessTokenBearer()
+
+
+@monitoring_admin_router.get("/queries", status_code=status.HTTP_200_OK, dependencies=[Depends(admin_role_middleware)])
+async def get_queries(limit: int = 50, route: Optional[str] = None,
+                      token_details: dict = Depends(access_token_bearer)):
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Thống kê truy vấn SQL",
+            "content": get_query_stats(limit, route)
+        }
+    )
+
+
+@monitoring_admin_router.get("/queries/metrics", status_code=status.HTTP_200_OK, dependencies=[Depends(admin_role_middleware)])
+async def get_queries_metrics(token_details: dict = Depends(access_token_bearer)):
+    return PlainTextResponse(content=render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@monitoring_admin_router.delete("/queries", status_code=status.HTTP_200_OK, dependencies=[Depends(admin_role_middleware)])
+async def reset_queries(token_details: dict = Depends(access_token_bearer)):
+    reset_query_stats()
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Đã xóa thống kê truy vấn SQL"
+        }
+    )
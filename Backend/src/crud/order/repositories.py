@@ -3,7 +3,8 @@ from sqlalchemy import ColumnElement
 from sqlalchemy.orm import noload, load_only
 from src.database.models import Order
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, desc, and_, func, distinct
+from sqlmodel import select, desc, asc, and_, func, update
+from sqlalchemy import tuple_
 from datetime import datetime
 
 
@@ -26,35 +27,50 @@ class OrderRepository:
         return new_order
 
 
-    async def get_order(self, conditions: Optional[ColumnElement[bool]], session: AsyncSession, joins: list = None):
+    async def get_order(self, conditions: Optional[ColumnElement[bool]], session: AsyncSession, joins: list = None,
+                        for_update: bool = False):
         statement = select(Order).options(
             *joins if joins else []
         ).where(conditions)
 
+        if for_update:
+            # Giữ khoá dòng tới khi commit, đọc lại giá trị mới nhất sau khi chờ khoá
+            statement = statement.with_for_update(of=Order).execution_options(populate_existing=True)
+
         result = await session.exec(statement)
 
         return result.one_or_none()
 
 
-    async def get_all_order(self, conditions: List[Optional[ColumnElement[bool]]], session: AsyncSession, order_by: list = None, skip: int = 0,
-                            limit: int = 10, joins: list = None, join_user: bool = False):
-        count_stmt = select(func.count(distinct(Order.id))).select_from(Order).where(*conditions)
+    def _order_list_statement(self, conditions: List[Optional[ColumnElement[bool]]], joins: list = None,
+                              join_user: bool = False):
+        # Order -> User là quan hệ nhiều-một nên join không nhân bản dòng, không cần DISTINCT
+        statement = select(Order).options(
+            noload(Order.order_detail),
+            *joins if joins else []
+        )
         if join_user:
-            count_stmt = count_stmt.join(Order.user)
+            statement = statement.join(Order.user)
 
-        total_result = await session.exec(count_stmt)
-        total = total_result.one()
+        return statement.where(*conditions)
 
-        statement = select(Order).distinct(Order.id).options(
-            noload(Order.order_detail),
-            *joins if joins else []
-        ).where(*conditions)
+    async def _count_orders_for_list(self, conditions: List[Optional[ColumnElement[bool]]], session: AsyncSession,
+                                     join_user: bool = False):
+        count_stmt = select(func.count()).select_from(Order)
+        if join_user:
+            count_stmt = count_stmt.join(Order.user)
 
-        if order_by:
-            statement = statement.order_by(Order.id, *order_by)
-        else:
-            statement = statement.order_by(Order.id)
+        total_result = await session.exec(count_stmt.where(*conditions))
+        return total_result.one()
+
+    async def get_all_order(self, conditions: List[Optional[ColumnElement[bool]]], session: AsyncSession, order_by: list = None, skip: int = 0,
+                            limit: int = 10, joins: list = None, join_user: bool = False, with_total: bool = True):
+        total = None
+        if with_total:
+            total = await self._count_orders_for_list(conditions, session, join_user)
 
+        statement = self._order_list_statement(conditions, joins, join_user)
+        statement = statement.order_by(*(order_by or [desc(Order.created_at)]), desc(Order.id))
         statement = statement.offset(skip).limit(limit)
 
         result = await session.exec(statement)
@@ -62,37 +78,54 @@ class OrderRepository:
 
         return orders, total
 
+    async def get_all_order_by_keyset(self, conditions: List[Optional[ColumnElement[bool]]], session: AsyncSession,
+                                      sort_expr, descending: bool, after: tuple = None, limit: int = 10,
+                                      joins: list = None, join_user: bool = False, with_total: bool = False):
+        total = None
+        if with_total:
+            total = await self._count_orders_for_list(conditions, session, join_user)
 
-    async def count_orders(self, conditions: Optional[ColumnElement[bool]], session: AsyncSession):
-        base_condition = Order.deleted_at.is_(None)
+        statement = self._order_list_statement(conditions, joins, join_user)
 
-        if conditions is not None:
-            base_condition = and_(base_condition, conditions)
+        if after is not None:
+            row_key = tuple_(sort_expr, Order.id)
+            after_key = tuple_(*after, types=[sort_expr.type, Order.id.type])
+            statement = statement.where(row_key < after_key if descending else row_key > after_key)
 
-        statement = (
-            select(Order)
-            .options(
-                load_only(Order.id),
-                noload(Order.user),
-                noload(Order.order_detail),
-            )
-            .where(base_condition)
-        )
+        if descending:
+            statement = statement.order_by(desc(sort_expr), desc(Order.id))
+        else:
+            statement = statement.order_by(asc(sort_expr), asc(Order.id))
+
+        # Lấy dư 1 dòng để biết còn trang kế tiếp hay không
+        result = await session.exec(statement.limit(limit + 1))
+        orders = result.all()
+
+        return orders[:limit], len(orders) > limit, total
+
+
+    async def get_order_statuses(self, conditions: Optional[ColumnElement[bool]], session: AsyncSession,
+                                 for_update: bool = False):
+        statement = select(Order.id, Order.status).where(conditions)
+
+        if for_update:
+            # Khoá theo thứ tự id để 2 lô chồng nhau không deadlock
+            statement = statement.order_by(Order.id).with_for_update(of=Order)
 
         result = await session.exec(statement)
         return result.all()
 
-    async def get_statistics(self, column_expr: ColumnElement, conditions: Optional[ColumnElement[bool]], session: AsyncSession):
-        base_condition = Order.deleted_at.is_(None)
 
-        if conditions is not None:
-            base_condition = and_(base_condition, conditions)
+    async def update_orders_status(self, conditions: Optional[ColumnElement[bool]], status: str, session: AsyncSession):
+        statement = (
+            update(Order)
+            .where(conditions)
+            .values(status=status, updated_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
 
-        statement = select(column_expr).where(base_condition)
+        await session.exec(statement)
 
-        result = await session.exec(statement)
-        value = result.one_or_none()
-        return value
 
     async def update_order(self, data_need_update, update_data: dict, session: AsyncSession):
         for k, v in update_data.items():
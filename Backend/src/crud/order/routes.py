@@ -6,8 +6,9 @@ from src.dependencies import AccessTokenBearer
 from sqlmodel.ext.asyncio.session import AsyncSession
 from src.database.main import get_session
 from fastapi.responses import JSONResponse
-from src.schemas.order import OrderCreateModel, StatusUpdateModel, OrderFilterModel
+from src.schemas.order import OrderCreateModel, StatusUpdateModel, OrderFilterModel, BulkStatusUpdateModel
 from src.dependencies import admin_role_middleware, customer_role_middleware
+from src.database.query_budget import query_budget
 
 order_admin_router = APIRouter(prefix="/order")
 order_customer_router = APIRouter(prefix="/order")
@@ -104,7 +105,8 @@ async def get_detail_order_customer(order_id: str,
     )
 
 
-@order_admin_router.get("/{order_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(admin_role_middleware)])
+@order_admin_router.get("/{order_id}", status_code=status.HTTP_200_OK,
+                        dependencies=[Depends(admin_role_middleware), Depends(query_budget(4))])
 async def get_detail_order_admin(order_id: str,
                                  token_details: dict = Depends(access_token_bearer),
                                  session: AsyncSession = Depends(get_session)):
@@ -137,6 +139,8 @@ async def get_all_order_customer(skip: int = 0, limit: int = 10,
 
 @order_admin_router.get("/", status_code=status.HTTP_200_OK, dependencies=[Depends(admin_role_middleware)])
 async def get_all_order_admin(skip: int = 0, limit: int = 10,
+                              cursor: Optional[str] = None,
+                              include_total: Optional[bool] = None,
                               search: Optional[str] = None,
                               sort_by_total_price: Optional[str] = None,
                               sort_by_created_at: Optional[str] = None,
@@ -149,7 +153,8 @@ async def get_all_order_admin(skip: int = 0, limit: int = 10,
         sort_by_created_at=sort_by_created_at,
         status=status_filter,
     )
-    order_dict = await order_service.get_all_order_admin(session, filter_data, skip=skip, limit=limit)
+    order_dict = await order_service.get_all_order_admin(session, filter_data, skip=skip, limit=limit,
+                                                       cursor=cursor, include_total=include_total)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -160,6 +165,22 @@ async def get_all_order_admin(skip: int = 0, limit: int = 10,
     )
 
 
+@order_admin_router.put("/status/bulk", status_code=status.HTTP_200_OK,
+                        dependencies=[Depends(admin_role_middleware)])
+async def update_status_bulk(data: BulkStatusUpdateModel,
+                             token_details: dict = Depends(access_token_bearer),
+                             session: AsyncSession = Depends(get_session)):
+    result = await order_service.update_status_bulk(data, session)
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Cập nhật trạng thái các đơn hàng thành công",
+            "content": result
+        }
+    )
+
+
 @order_admin_router.put("/status/{order_id}", status_code=status.HTTP_201_CREATED,
                         dependencies=[Depends(admin_role_middleware)])
 async def update_status(order_id: str,
@@ -5,8 +5,12 @@ from src.crud.order.repositories import OrderRepository
 from src.crud.special_offer.repositories import SpecialOfferRepository
 from src.crud.user.repositories import UserRepository
 from src.crud.product.repositories import ProductRepository
+from src.crud.product_card.repositories import ProductCardRepository
+from src.crud.order_daily_stats.repositories import OrderDailyStatsRepository
 from src.crud.order_detail.repositories import OrderDetailRepository
 from src.crud.product_variant.repositories import ProductVariantRepository
+from src.crud.product.pricing import calculate_discounted_prices, calculate_order_discount
+from src.crud.special_offer.utils import active_offer_condition
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import and_, func, or_, asc, desc, update
 from sqlalchemy import update
@@ -14,18 +18,25 @@ from src.errors.address import AddressException
 from src.errors.order import OrderException
 from src.errors.product import ProductException
 from src.errors.special_offer import SpecialOfferException
-from src.schemas.order import OrderCreateModel, OrderFilterModel
+from src.schemas.order import OrderCreateModel, OrderFilterModel, BulkStatusUpdateModel
 import time
-import asyncio
+from uuid import UUID
 from src.errors.authentication import AuthException
+from src.database.loaders import loader_profile
+from src.crud.order.utils import encode_order_cursor, decode_order_cursor
 
 order_repository = OrderRepository()
 special_offer_repository = SpecialOfferRepository()
 user_repository = UserRepository()
 address_repository = AddressRepository()
 product_repository = ProductRepository()
+product_card_repository = ProductCardRepository()
 order_detail_repository = OrderDetailRepository()
 product_variant_repository = ProductVariantRepository()
+order_daily_stats_repository = OrderDailyStatsRepository()
+
+# Trạng thái đơn được tính vào total_sold
+SOLD_STATUSES = {"completed", "delivered"}
 
 
 class OrderService:
@@ -42,11 +53,11 @@ class OrderService:
         ]
         conditions_address = and_(Address.id == address_id, Address.deleted_at.is_(None))
 
-        tasks = [
-            user_repository.get_user(conditions_user, session, joins_user),
-            address_repository.get_address(conditions_address, session, joins_address),
-        ]
+        # Các truy vấn dùng chung 1 session nên phải chạy lần lượt: AsyncSession không cho phép thao tác song song
+        customer = await user_repository.get_user(conditions_user, session, joins_user)
+        address = await address_repository.get_address(conditions_address, session, joins_address)
 
+        order_offer = None
         if offer_id:
             joins_special_offer = [
                 noload(Special_Offer.products),
@@ -56,11 +67,7 @@ class OrderService:
                 Special_Offer.deleted_at.is_(None),
                 Special_Offer.scope == "order"
             )
-            tasks.append(special_offer_repository.get_special_offer(conditions_offer, session, joins_special_offer))
-        else:
-            tasks.append(asyncio.sleep(0))
-
-        customer, address, order_offer = await asyncio.gather(*tasks)
+            order_offer = await special_offer_repository.get_special_offer(conditions_offer, session, joins_special_offer)
 
         if not customer:
             AuthException.user_not_found()
@@ -78,7 +85,7 @@ class OrderService:
         condition = Product_Variant.id.in_(variant_ids)
         joins = [
             selectinload(Product_Variant.product).options(
-                selectinload(Product.special_offer).options(
+                selectinload(Product.special_offer.and_(active_offer_condition())).options(
                     noload(Special_Offer.products)
                 ),
                 noload(Product.order_detail),
@@ -104,6 +111,7 @@ class OrderService:
         order_detail_objs = []
         product_offers_to_update = {}
 
+        variants, offers = [], []
         for item in order_items:
             variant = variant_map.get(item.product_variant_id)
             if not variant:
@@ -116,25 +124,32 @@ class OrderService:
             if item.quantity > variant.quantity:
                 ProductException.out_of_stock(str(variant.id))
 
-            discounted_price = variant.price
-            product_discount_per_item = 0
+            # Voucher đã xoá không được nạp (xem active_offer_condition) nên product.special_offer là None
+            product_offer = product.special_offer
+            if product_offer and product_offer.scope != "product":
+                product_offer = None
 
-            if product.special_offer_id and product.special_offer:
-                product_offer = product.special_offer
-                if product_offer.scope != "product":
-                    continue
+            variants.append(variant)
+            offers.append(product_offer)
+
+        # Tính giá cả giỏ trong 1 lượt, cùng công thức với giá hiển thị ở trang sản phẩm
+        discounted_prices = calculate_discounted_prices(
+            [variant.price for variant in variants],
+            [(offer.type, offer.discount) if offer else (None, None) for offer in offers]
+        )
+
+        for item, variant, product_offer, discounted_price in zip(order_items, variants, offers, discounted_prices):
+            product = variant.product
+            product_discount_per_item = variant.price - discounted_price
 
+            if product_offer and product_discount_per_item > 0:
                 remaining_quantity = product_offer.total_quantity - product_offer.used_quantity
                 if remaining_quantity < item.quantity:
-                    raise Exception(f"Product offer {product_offer.code} không đủ số lượng")
+                    SpecialOfferException.out_of_quantity(product_offer.code)
 
-                if product_offer.type == "percent":
-                    product_discount_per_item = int(variant.price * product_offer.discount / 100)
-                    discounted_price = variant.price - product_discount_per_item
-
-                    if str(product_offer.id) not in product_offers_to_update:
-                        product_offers_to_update[str(product_offer.id)] = 0
-                    product_offers_to_update[str(product_offer.id)] += item.quantity
+                if str(product_offer.id) not in product_offers_to_update:
+                    product_offers_to_update[str(product_offer.id)] = 0
+                product_offers_to_update[str(product_offer.id)] += item.quantity
 
             item_sub_total = discounted_price * item.quantity
             item_total_discount = product_discount_per_item * item.quantity
@@ -174,32 +189,35 @@ class OrderService:
 
         remaining_quantity = order_offer.total_quantity - order_offer.used_quantity
         if remaining_quantity < 1:
-            raise Exception(f"Order offer {order_offer.code} đã hết lượt sử dụng")
-
-        order_discount = 0
-        if order_offer.type == "percent":
-            order_discount = int(sub_total * order_offer.discount / 100)
-        elif order_offer.type == "fixed":
-            order_discount = order_offer.discount
+            SpecialOfferException.out_of_quantity(order_offer.code)
 
-        return order_discount
+        return calculate_order_discount(sub_total, order_offer.type, order_offer.discount)
 
     async def update_offers_usage(self, product_offers_to_update, order_offer, session):
-        for offer_id, quantity_used in product_offers_to_update.items():
-            product_offer = await special_offer_repository.get_special_offer(
-                and_(Special_Offer.id == offer_id, Special_Offer.deleted_at.is_(None)),
-                session,
-                []
-            )
-            if product_offer:
-                product_offer.used_quantity += quantity_used
-                product_offer.total_quantity -= quantity_used
-                session.add(product_offer)
-
+        quantities = {UUID(str(offer_id)): quantity_used for offer_id, quantity_used in product_offers_to_update.items()}
         if order_offer:
-            order_offer.used_quantity += 1
-            order_offer.total_quantity -= 1
-            session.add(order_offer)
+            quantities[order_offer.id] = quantities.get(order_offer.id, 0) + 1
+
+        consumed_ids = await special_offer_repository.consume_special_offers(quantities, session)
+
+        exhausted_ids = set(quantities.keys()) - consumed_ids
+        if exhausted_ids:
+            await session.rollback()
+            codes = await special_offer_repository.get_special_offer_codes(list(exhausted_ids), session)
+            SpecialOfferException.offers_out_of_quantity(codes)
+
+    async def reserve_stock(self, order_items, session):
+        quantities = {}
+        for item in order_items:
+            variant_id = UUID(str(item.product_variant_id))
+            quantities[variant_id] = quantities.get(variant_id, 0) + item.quantity
+
+        reserved_ids = await product_variant_repository.reserve_stock(quantities, session)
+
+        missing_ids = set(quantities.keys()) - reserved_ids
+        if missing_ids:
+            await session.rollback()
+            ProductException.out_of_stock(str(sorted(missing_ids)[0]))
 
 
     async def create_order(self, customer_id: str, order_data: OrderCreateModel, session: AsyncSession):
@@ -246,12 +264,9 @@ class OrderService:
             od.order_id = new_order.id
         await order_detail_repository.create_order_detail(order_detail_objs, session)
 
-        for item in order_data.order_detail:
-            variant = variant_map[item.product_variant_id]
-            variant.quantity -= item.quantity
-            session.add(variant)
-
+        await self.reserve_stock(order_data.order_detail, session)
         await self.update_offers_usage(product_offers_to_update, order_offer, session)
+        await order_daily_stats_repository.add_orders([new_order.id], session)
         await session.commit()
 
         response = {
@@ -294,28 +309,7 @@ class OrderService:
 
 
     async def get_detail_order_admin(self, order_id: str, session: AsyncSession):
-        joins = [
-            selectinload(Order.order_detail).options(
-                noload(Order_Detail.product),
-                noload(Order_Detail.product_variant),
-                noload(Order_Detail.order),
-                noload(Order_Detail.evaluate),
-            ).load_only(
-                Order_Detail.id,
-                Order_Detail.Product
-            ),
-            selectinload(Order.user).options(
-                noload(User.address),
-                noload(User.order),
-                noload(User.evaluate),
-            ).load_only(
-                User.id,
-                User.first_name,
-                User.last_name,
-                User.email,
-                User.phone,
-            ),
-        ]
+        joins = loader_profile("order_admin_detail")
 
         condition = and_(Order.id == order_id, Order.deleted_at.is_(None))
         order = await order_repository.get_order(condition, session, joins)
@@ -377,11 +371,7 @@ class OrderService:
 
 
     async def get_detail_order_customer(self, order_id: str, customer_id: str, session: AsyncSession):
-        joins = [
-            selectinload(Order.order_detail).selectinload(Order_Detail.product),
-            selectinload(Order.order_detail).selectinload(Order_Detail.product_variant),
-            selectinload(Order.user),
-        ]
+        joins = loader_profile("order_customer_detail")
 
         condition = and_(Order.id == order_id)
         order = await order_repository.get_order(condition, session, joins)
@@ -447,7 +437,16 @@ class OrderService:
         return response
 
 
-    async def get_all_order_admin(self, session: AsyncSession, filter_data: OrderFilterModel, skip: int = 0, limit: int = 10):
+    def get_order_sort_key(self, filter_data: OrderFilterModel):
+        if filter_data.sort_by_total_price:
+            return "total_price", Order.total_price, filter_data.sort_by_total_price != "cheapest"
+
+        # Mặc định đơn mới nhất lên đầu
+        return "created_at", Order.created_at, filter_data.sort_by_created_at in (None, "newest")
+
+
+    async def get_all_order_admin(self, session: AsyncSession, filter_data: OrderFilterModel, skip: int = 0, limit: int = 10,
+                                  cursor: str = None, include_total: bool = None):
         conditions = [Order.deleted_at.is_(None), User.deleted_at.is_(None)]
 
         if filter_data.search:
@@ -459,37 +458,43 @@ class OrderService:
                 User.last_name.ilike(search_term),
                 full_name_search
             ))
-            need_user_join = True
-        else:
-            need_user_join = False
 
         if filter_data.status:
             conditions.append(Order.status == filter_data.status)
 
-        order_by = []
-        if filter_data.sort_by_total_price:
-            if filter_data.sort_by_total_price == "cheapest":
-                order_by.append(asc(Order.total_price))
-            else:
-                order_by.append(desc(Order.total_price))
+        # Điều kiện luôn có User.deleted_at nên luôn join user
+        joins = loader_profile("order_admin_list")
+
+        next_cursor = None
+        if cursor is not None:
+            # Chế độ keyset: cursor rỗng là trang đầu, mặc định không đếm tổng
+            sort_name, sort_expr, descending = self.get_order_sort_key(filter_data)
+            after = decode_order_cursor(cursor, sort_name) if cursor else None
+            orders, has_more, total = await order_repository.get_all_order_by_keyset(
+                conditions, session, sort_expr, descending, after, limit, joins, join_user=True,
+                with_total=bool(include_total)
+            )
 
-        if filter_data.sort_by_created_at:
-            if filter_data.sort_by_created_at == "newest":
-                order_by.append(desc(Order.created_at))
-            else:
-                order_by.append(asc(Order.created_at))
-
-        joins = [joinedload(Order.user).options(
-                     noload(User.address),
-                     noload(User.order),
-                     noload(User.evaluate),
-                 ).load_only(
-                     User.id,
-                     User.first_name,
-                     User.last_name,
-                     User.deleted_at,
-                 )]
-        orders, total = await order_repository.get_all_order(conditions, session, order_by, skip=skip, limit=limit, joins=joins, join_user=need_user_join)
+            if has_more and orders:
+                last_order = orders[-1]
+                next_cursor = encode_order_cursor(sort_name, getattr(last_order, sort_name), last_order.id)
+        else:
+            order_by = []
+            if filter_data.sort_by_total_price:
+                if filter_data.sort_by_total_price == "cheapest":
+                    order_by.append(asc(Order.total_price))
+                else:
+                    order_by.append(desc(Order.total_price))
+
+            if filter_data.sort_by_created_at:
+                if filter_data.sort_by_created_at == "newest":
+                    order_by.append(desc(Order.created_at))
+                else:
+                    order_by.append(asc(Order.created_at))
+
+            with_total = include_total if include_total is not None else True
+            orders, total = await order_repository.get_all_order(conditions, session, order_by, skip=skip, limit=limit,
+                                                                 joins=joins, join_user=True, with_total=with_total)
 
         response = []
         for order in orders:
@@ -509,15 +514,22 @@ class OrderService:
             }
             response.append(order_dict)
 
-        return {
+        result = {
             "data": response,
             "total": total,
         }
 
+        if cursor is not None:
+            result["next_cursor"] = next_cursor
+
+        return result
+
 
     async def get_all_order_customer(self, user_id: str, session: AsyncSession, skip: int = 0, limit: int = 10):
-        condition = and_(Order.user_id == user_id)
-        orders = await order_repository.get_all_order(condition, session, skip=skip, limit=limit)
+        conditions = [Order.user_id == user_id, Order.deleted_at.is_(None)]
+        joins = [noload(Order.user)]
+        orders, _ = await order_repository.get_all_order(conditions, session, skip=skip, limit=limit, joins=joins,
+                                                         with_total=False)
 
         response = []
         for order in orders:
@@ -537,58 +549,82 @@ class OrderService:
         joins = [
             load_only(Order.status),
             noload(Order.user),
-            selectinload(Order.order_detail).options(
-                noload(Order_Detail.product),
-                noload(Order_Detail.product_variant),
-                noload(Order_Detail.order),
-                noload(Order_Detail.evaluate),
-            ).load_only(Order_Detail.product_id),
+            noload(Order.order_detail),
         ]
-        order_to_update = await order_repository.get_order(condition, session, joins)
+        # Khoá đơn hàng: 2 lần cập nhật đồng thời không thể cùng thấy 1 trạng thái cũ và cộng counters 2 lần
+        order_to_update = await order_repository.get_order(condition, session, joins, for_update=True)
 
         if order_to_update is None:
             OrderException.not_found()
 
         old_status = order_to_update.status
         status_dict = status.model_dump()
-        order_after_update = await order_repository.update_order(order_to_update, status_dict, session)
 
-        if order_after_update.status in ["completed", "delivered"] and old_status not in ["completed", "delivered"]:
-            for od in order_after_update.order_detail:
-                await product_repository.update_product_some_field(Product.id == od.product_id, {"popularity_score": Product.popularity_score + 1}, session)
+        new_status = status_dict.get("status")
+        if new_status and new_status != old_status:
+            await order_daily_stats_repository.move_orders([order_to_update.id], new_status, session)
+
+        was_sold = (old_status or "").lower() in SOLD_STATUSES
+        is_sold = (status_dict.get("status") or old_status or "").lower() in SOLD_STATUSES
+        if was_sold != is_sold:
+            product_ids = await product_repository.update_sales_counters([order_to_update.id], 1 if is_sold else -1, session)
+            await product_card_repository.refresh_product_cards(product_ids, session)
+
+        order_after_update = await order_repository.update_order(order_to_update, status_dict, session)
 
         return order_after_update
 
 
-    async def count_new_orders(self, to_date, from_date, session: AsyncSession):
-        condition = and_(Order.created_at >= from_date, Order.created_at <= to_date)
-        orders = await order_repository.count_orders(condition, session)
+    async def update_status_bulk(self, data: BulkStatusUpdateModel, session: AsyncSession):
+        order_ids = list(dict.fromkeys(data.order_ids))
+        condition = and_(Order.id.in_(order_ids), Order.deleted_at.is_(None))
+        orders = await order_repository.get_order_statuses(condition, session, for_update=True)
 
-        if orders is None:
-            OrderException.not_found()
+        # So sánh trên UUID để id viết hoa / không chuẩn hoá vẫn khớp
+        existing_ids = {order.id for order in orders}
+        missing_ids = set(order_ids) - existing_ids
+        if missing_ids:
+            OrderException.not_found_orders({str(order_id) for order_id in missing_ids})
 
-        return len(orders)
+        is_sold = data.status.lower() in SOLD_STATUSES
+        changed_ids = [
+            order.id for order in orders
+            if ((order.status or "").lower() in SOLD_STATUSES) != is_sold
+        ]
 
+        # Cập nhật counters, bảng tổng hợp và trạng thái trong cùng 1 transaction
+        product_ids = await product_repository.update_sales_counters(changed_ids, 1 if is_sold else -1, session)
+        await product_card_repository.refresh_product_cards(product_ids, session)
+        await order_daily_stats_repository.move_orders(
+            [order.id for order in orders if order.status != data.status], data.status, session
+        )
+        await order_repository.update_orders_status(condition, data.status, session)
+        await session.commit()
 
-    async def get_total_sales(self, today, seven_days_ago, session: AsyncSession):
-        condition = and_(Order.created_at >= seven_days_ago, Order.status == "Delivered")
-        column_expr = func.coalesce(func.sum(Order.sub_total), 0)
-        total_sales = await order_repository.get_statistics(column_expr, condition, session)
+        return {
+            "updated_ids": [str(order.id) for order in orders],
+            "status": data.status
+        }
 
-        if total_sales is None:
-            OrderException.fail_get_total_sales()
 
-        return total_sales
+    # Các số liệu thống kê đọc từ order_daily_stats theo ngày, chi phí chỉ phụ thuộc số ngày
+    async def count_new_orders(self, to_date, from_date, session: AsyncSession):
+        totals = await order_daily_stats_repository.get_totals(from_date.date(), to_date.date(), session)
 
-    async def get_total_revenue(self, today, seven_days_ago, session: AsyncSession):
-        condition = and_(Order.created_at >= seven_days_ago, Order.status == "Delivered")
-        column_expr = func.coalesce(func.sum(Order.total_price), 0)
-        total_revenue = await order_repository.get_statistics(column_expr, condition, session)
+        return totals.orders
 
-        if total_revenue is None:
-            OrderException.fail_get_total_revenue()
 
-        return total_revenue
+    async def get_total_sales(self, today, seven_days_ago, session: AsyncSession):
+        totals = await order_daily_stats_repository.get_totals(seven_days_ago.date(), today.date(), session,
+                                                               statuses=["Delivered"])
+
+        return totals.sub_total
+
+    async def get_total_revenue(self, today, seven_days_ago, session: AsyncSession):
+        totals = await order_daily_stats_repository.get_totals(seven_days_ago.date(), today.date(), session,
+                                                               statuses=["Delivered"])
+
+        return totals.total_price
 
 
 
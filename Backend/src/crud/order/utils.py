@@ -0,0 +1,41 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any
+
+from src.errors.order import OrderException
+
+
+# Cursor phân trang dạng keyset cho danh sách đơn hàng: cột sort + giá trị sort của dòng cuối + id
+def encode_order_cursor(sort_name: str, sort_key: Any, order_id) -> str:
+    if isinstance(sort_key, datetime):
+        sort_key = sort_key.isoformat()
+
+    payload = {
+        "s": sort_name,
+        "k": sort_key,
+        "id": str(order_id),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_order_cursor(cursor: str, sort_name: str) -> tuple[Any, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+        if payload["s"] != sort_name:
+            OrderException.invalid_cursor()
+
+        sort_key = payload["k"]
+        if sort_name == "created_at":
+            sort_key = datetime.fromisoformat(sort_key)
+        elif not isinstance(sort_key, int):
+            OrderException.invalid_cursor()
+
+        return sort_key, uuid.UUID(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        OrderException.invalid_cursor()
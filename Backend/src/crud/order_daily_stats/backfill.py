@@ -0,0 +1,30 @@
+# Dựng lại bảng order_daily_stats, product_daily_sales và product_monthly_sales từ bảng order:
+#   python -m src.crud.order_daily_stats.backfill [--from-day 2024-01-01] [--to-day 2024-12-31]
+import argparse
+import asyncio
+from datetime import date
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.database.main import engine
+from src.crud.order_daily_stats.repositories import OrderDailyStatsRepository
+
+order_daily_stats_repository = OrderDailyStatsRepository()
+
+
+async def backfill_order_daily_stats(from_day: date = None, to_day: date = None) -> None:
+    session_maker = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_maker() as session:
+            await order_daily_stats_repository.backfill(session, from_day, to_day)
+            await session.commit()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill order_daily_stats, product_daily_sales and product_monthly_sales from the order table")
+    parser.add_argument("--from-day", type=date.fromisoformat, default=None)
+    parser.add_argument("--to-day", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    asyncio.run(backfill_order_daily_stats(args.from_day, args.to_day))
@@ -0,0 +1,273 @@
+import random
+from datetime import date, timedelta
+from typing import Optional, List
+from sqlalchemy import ColumnElement
+from sqlalchemy import select, func, cast, literal, literal_column, delete, and_, true, desc, union_all, Date, VARCHAR, \
+    BigInteger, SmallInteger
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.database.models import Order, Order_Detail, Order_Daily_Stats, Product_Daily_Sales, Product_Monthly_Sales, \
+    Product, Categories, Categories_Product
+
+STAT_COLUMNS = ("orders", "sub_total", "total_price", "discount", "items")
+SALES_COLUMNS = ("quantity", "revenue")
+# Số slot cho mỗi khoá của order_daily_stats (ngày, trạng thái) và product_daily_sales (ngày, trạng thái, sản phẩm)
+STATS_SLOTS = 16
+# Doanh số sản phẩm ghi song song theo ngày và theo tháng: (bảng, cột kỳ, kỳ của đơn hàng)
+DAILY_SALES = (Product_Daily_Sales, "day", cast(Order.created_at, Date))
+MONTHLY_SALES = (Product_Monthly_Sales, "month", cast(func.date_trunc(literal_column("'month'"), Order.created_at), Date))
+
+
+def next_month_start(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def created_between(from_day: Optional[date], to_day: Optional[date]) -> ColumnElement[bool]:
+    conditions = []
+    if from_day is not None:
+        conditions.append(cast(Order.created_at, Date) >= from_day)
+    if to_day is not None:
+        conditions.append(cast(Order.created_at, Date) <= to_day)
+
+    return and_(true(), *conditions)
+
+
+class OrderDailyStatsRepository:
+    async def add_orders(self, order_ids: list, session: AsyncSession):
+        if not order_ids:
+            return
+
+        await self._apply(Order.id.in_(order_ids), 1, session)
+        await self._apply_product_sales(Order.id.in_(order_ids), 1, session)
+
+    async def move_orders(self, order_ids: list, new_status: str, session: AsyncSession):
+        # Gọi trước khi đổi trạng thái: trừ khỏi dòng trạng thái cũ, cộng vào dòng trạng thái mới
+        if not order_ids:
+            return
+
+        await self._apply(Order.id.in_(order_ids), -1, session)
+        await self._apply(Order.id.in_(order_ids), 1, session, status=new_status)
+        await self._apply_product_sales(Order.id.in_(order_ids), -1, session)
+        await self._apply_product_sales(Order.id.in_(order_ids), 1, session, status=new_status)
+
+    async def backfill(self, session: AsyncSession, from_day: date = None, to_day: date = None):
+        # product_monthly_sales chỉ dựng lại được cả tháng, nên mở rộng khoảng ra đầu tháng / cuối tháng
+        from_month = from_day.replace(day=1) if from_day is not None else None
+        to_month = to_day.replace(day=1) if to_day is not None else None
+        periods = (
+            (Order_Daily_Stats.day, from_day, to_day),
+            (Product_Daily_Sales.day, from_day, to_day),
+            (Product_Monthly_Sales.month, from_month, to_month),
+        )
+        for period, start, end in periods:
+            conditions = []
+            if start is not None:
+                conditions.append(period >= start)
+            if end is not None:
+                conditions.append(period <= end)
+            await session.exec(delete(period.table).where(*conditions))
+
+        to_month_end = next_month_start(to_day) - timedelta(days=1) if to_day is not None else None
+        await self._apply(created_between(from_day, to_day), 1, session, slot=0)
+        await self._apply_product_sales(created_between(from_day, to_day), 1, session, slot=0, tables=[DAILY_SALES])
+        await self._apply_product_sales(created_between(from_month, to_month_end), 1, session, slot=0,
+                                        tables=[MONTHLY_SALES])
+
+    async def get_totals(self, from_day: date, to_day: date, session: AsyncSession, statuses: list = None):
+        conditions = [Order_Daily_Stats.day >= from_day, Order_Daily_Stats.day <= to_day]
+        if statuses:
+            conditions.append(Order_Daily_Stats.status.in_(statuses))
+
+        statement = select(
+            *(func.coalesce(func.sum(getattr(Order_Daily_Stats, column)), 0).label(column) for column in STAT_COLUMNS)
+        ).where(*conditions)
+        result = await session.exec(statement)
+
+        return result.one()
+
+    async def get_series(self, from_day: date, to_day: date, bucket: str, session: AsyncSession, statuses: list = None):
+        conditions = [Order_Daily_Stats.day >= from_day, Order_Daily_Stats.day <= to_day]
+        if statuses:
+            conditions.append(Order_Daily_Stats.status.in_(statuses))
+
+        # bucket đã được kiểm tra qua enum ở schema, nhúng thẳng để GROUP BY khớp với SELECT
+        bucket_start = cast(func.date_trunc(literal_column(f"'{bucket}'"), Order_Daily_Stats.day), Date).label("bucket")
+        statement = (
+            select(
+                bucket_start,
+                *(func.sum(getattr(Order_Daily_Stats, column)).label(column) for column in STAT_COLUMNS)
+            )
+            .where(*conditions)
+            .group_by(bucket_start)
+            .order_by(bucket_start)
+        )
+        result = await session.exec(statement)
+
+        return result.all()
+
+    async def get_top_products(self, from_day: date, to_day: date, session: AsyncSession, statuses: list = None,
+                               limit: int = 10):
+        totals = self._product_totals(from_day, to_day, statuses)
+        top_sales = (
+            select(totals)
+            .order_by(desc(totals.c.revenue), totals.c.product_id)
+            .limit(limit)
+            .subquery()
+        )
+        statement = (
+            select(top_sales.c.product_id, Product.name, top_sales.c.quantity, top_sales.c.revenue)
+            .join(Product, Product.id == top_sales.c.product_id)
+            .order_by(desc(top_sales.c.revenue), top_sales.c.product_id)
+        )
+        result = await session.exec(statement)
+
+        return result.all()
+
+    async def get_top_categories(self, from_day: date, to_day: date, session: AsyncSession, statuses: list = None,
+                                 limit: int = 10):
+        totals = self._product_totals(from_day, to_day, statuses)
+
+        # Sản phẩm thuộc nhiều danh mục được tính vào từng danh mục
+        revenue = func.sum(totals.c.revenue)
+        statement = (
+            select(
+                Categories.id,
+                Categories.name,
+                Categories.parent_id,
+                func.sum(totals.c.quantity).label("quantity"),
+                revenue.label("revenue")
+            )
+            .select_from(totals)
+            .join(Categories_Product, Categories_Product.product_id == totals.c.product_id)
+            .join(Categories, Categories.id == Categories_Product.categories_id)
+            .where(Categories_Product.deleted_at.is_(None), Categories.deleted_at.is_(None))
+            .group_by(Categories.id, Categories.name, Categories.parent_id)
+            .order_by(desc(revenue), Categories.id)
+            .limit(limit)
+        )
+        result = await session.exec(statement)
+
+        return result.all()
+
+    def _product_totals(self, from_day: date, to_day: date, statuses: list = None):
+        # Các tháng nằm trọn trong khoảng đọc từ product_monthly_sales, phần lẻ ở 2 đầu đọc từ product_daily_sales
+        months_from = from_day if from_day.day == 1 else next_month_start(from_day)
+        months_to = next_month_start(to_day) if next_month_start(to_day) - timedelta(days=1) == to_day \
+            else to_day.replace(day=1)
+
+        sales = []
+        if months_from < months_to:
+            sales.append(self._sales_between(Product_Monthly_Sales.month, months_from, months_to - timedelta(days=1),
+                                             statuses))
+            day_ranges = [(from_day, months_from - timedelta(days=1)), (months_to, to_day)]
+        else:
+            day_ranges = [(from_day, to_day)]
+
+        for start, end in day_ranges:
+            if start <= end:
+                sales.append(self._sales_between(Product_Daily_Sales.day, start, end, statuses))
+
+        rows = union_all(*sales).subquery()
+        return (
+            select(
+                rows.c.product_id,
+                func.sum(rows.c.quantity).label("quantity"),
+                func.sum(rows.c.revenue).label("revenue")
+            )
+            .group_by(rows.c.product_id)
+            .subquery()
+        )
+
+    def _sales_between(self, period, start: date, end: date, statuses: list = None):
+        table = period.table
+        conditions = [period >= start, period <= end]
+        if statuses:
+            conditions.append(table.c.status.in_(statuses))
+
+        return select(table.c.product_id, table.c.quantity, table.c.revenue).where(*conditions)
+
+    async def _apply(self, condition: Optional[ColumnElement[bool]], sign: int, session: AsyncSession,
+                     status: str = None, slot: int = None):
+        # Đẩy đơn hàng / chi tiết đơn vừa tạo xuống DB trước khi tổng hợp
+        await session.flush()
+
+        items = (
+            select(func.coalesce(func.sum(Order_Detail.quantity), 0))
+            .where(Order_Detail.order_id == Order.id)
+            .scalar_subquery()
+        )
+        orders = (
+            select(
+                cast(Order.created_at, Date).label("day"),
+                Order.status,
+                Order.sub_total,
+                Order.total_price,
+                func.coalesce(Order.discount, 0).label("discount"),
+                items.label("items")
+            )
+            .where(Order.deleted_at.is_(None), condition)
+            .subquery()
+        )
+
+        status_column = cast(literal(status), VARCHAR) if status is not None else orders.c.status
+        group_by = [orders.c.day] if status is not None else [orders.c.day, orders.c.status]
+        # Chỉ tổng theo slot mới có nghĩa, nên cộng / trừ vào slot nào cũng được
+        slot = random.randrange(STATS_SLOTS) if slot is None else slot
+        source = (
+            select(
+                orders.c.day,
+                status_column,
+                cast(literal(slot), SmallInteger),
+                func.count() * sign,
+                func.sum(orders.c.sub_total) * sign,
+                func.sum(orders.c.total_price) * sign,
+                func.sum(orders.c.discount) * sign,
+                func.sum(orders.c["items"]) * sign
+            )
+            .group_by(*group_by)
+        )
+
+        # Cộng dồn theo (ngày, trạng thái, slot), 1 câu INSERT ... SELECT cho cả lô đơn hàng
+        stmt = insert(Order_Daily_Stats).from_select(["day", "status", "slot", *STAT_COLUMNS], source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Order_Daily_Stats.day, Order_Daily_Stats.status, Order_Daily_Stats.slot],
+            set_={
+                **{column: getattr(Order_Daily_Stats, column) + stmt.excluded[column] for column in STAT_COLUMNS},
+                "updated_at": func.now()
+            }
+        )
+        await session.exec(stmt)
+
+    async def _apply_product_sales(self, condition: Optional[ColumnElement[bool]], sign: int, session: AsyncSession,
+                                   status: str = None, slot: int = None, tables: list = (DAILY_SALES, MONTHLY_SALES)):
+        await session.flush()
+
+        status_column = cast(literal(status), VARCHAR) if status is not None else Order.status
+        slot = random.randrange(STATS_SLOTS) if slot is None else slot
+        for table, period_name, period in tables:
+            group_by = [period, Order_Detail.product_id] if status is not None \
+                else [period, Order.status, Order_Detail.product_id]
+            source = (
+                select(
+                    period,
+                    status_column,
+                    Order_Detail.product_id,
+                    cast(literal(slot), SmallInteger),
+                    func.sum(Order_Detail.quantity) * sign,
+                    func.sum(cast(Order_Detail.price, BigInteger) * Order_Detail.quantity) * sign
+                )
+                .select_from(Order_Detail)
+                .join(Order, Order.id == Order_Detail.order_id)
+                .where(Order.deleted_at.is_(None), condition)
+                .group_by(*group_by)
+            )
+
+            stmt = insert(table).from_select([period_name, "status", "product_id", "slot", *SALES_COLUMNS], source)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[getattr(table, period_name), table.status, table.product_id, table.slot],
+                set_={
+                    **{column: getattr(table, column) + stmt.excluded[column] for column in SALES_COLUMNS},
+                    "updated_at": func.now()
+                }
+            )
+            await session.exec(stmt)
@@ -0,0 +1,59 @@
+from typing import Callable, Sequence
+
+# Mọi giá sau giảm / số tiền giảm đều làm tròn tới hàng nghìn
+PRICE_ROUNDING = 1000
+
+Offer = tuple[str | None, int | None]
+
+
+def round_price(value: float) -> int:
+    return int(round(value / PRICE_ROUNDING) * PRICE_ROUNDING)
+
+
+def _price_function(offer_type: str | None, offer_discount: int | None) -> Callable[[int], int]:
+    if not offer_type or offer_discount is None:
+        return lambda price: price
+
+    if offer_type == "percent":
+        ratio = 1 - offer_discount / 100
+        return lambda price: round_price(price * ratio)
+    elif offer_type == "fixed":
+        return lambda price: round_price(max(0, price - offer_discount))
+
+    return lambda price: price
+
+
+# Giá sau giảm của 1 variant
+def calculate_discounted_price(price: int, offer_type: str | None, offer_discount: int | None) -> int:
+    return _price_function(offer_type, offer_discount)(price)
+
+
+# Tính giá sau giảm cho cả trang / giỏ hàng trong 1 lượt, mỗi offer chỉ dựng hàm tính 1 lần
+def calculate_discounted_prices(prices: Sequence[int], offers: Sequence[Offer]) -> list[int]:
+    if len(prices) != len(offers):
+        raise ValueError("prices and offers must have the same length")
+
+    functions: dict[Offer, Callable[[int], int]] = {}
+    discounted_prices = []
+    for price, offer in zip(prices, offers):
+        function = functions.get(offer)
+        if function is None:
+            function = functions[offer] = _price_function(*offer)
+        discounted_prices.append(function(price))
+
+    return discounted_prices
+
+
+# Số tiền giảm của offer áp cho cả đơn hàng, không vượt quá tổng tiền
+def calculate_order_discount(sub_total: int, offer_type: str | None, offer_discount: int | None) -> int:
+    if not offer_type or offer_discount is None:
+        return 0
+
+    if offer_type == "percent":
+        discount = round_price(sub_total * offer_discount / 100)
+    elif offer_type == "fixed":
+        discount = offer_discount
+    else:
+        return 0
+
+    return min(discount, sub_total)
@@ -4,7 +4,7 @@ from src.database.models import Product, Product_Variant, Categories, Evaluate,
     Special_Offer
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select, update, func, and_, desc
-from sqlalchemy import select, func, and_, desc, case
+from sqlalchemy import select, func, and_, desc, case, cast, Float
 from sqlalchemy.orm import aliased
 from datetime import datetime
 from fastapi import HTTPException, status
@@ -12,6 +12,8 @@ from sqlalchemy.orm import noload, selectinload
 from uuid import UUID
 
 from src.errors.product import ProductException
+from src.crud.product.pricing import calculate_discounted_prices
+from src.crud.special_offer.utils import active_offer_condition
 from src.schemas.product import DeleteMultipleProductModel
 
 
@@ -45,10 +47,13 @@ class ProductRepository:
         return new_product
 
     async def get_all_product(self, conditions: List[Optional[ColumnElement[bool]]], session: AsyncSession,
-                              joins: list = None, skip: int = 0, limit: int = 10, order_by_clause=None):
-        count_stmt = select(func.count(Product.id)).where(*conditions)
-        total_result = await session.exec(count_stmt)
-        total = total_result.one()
+                              joins: list = None, skip: int = 0, limit: int = 10, order_by_clause=None,
+                              with_total: bool = True):
+        total = None
+        if with_total:
+            count_stmt = select(func.count(Product.id)).where(*conditions)
+            total_result = await session.exec(count_stmt)
+            total = total_result.one()
 
         statement = select(Product).options(
             *joins if joins else []
@@ -62,7 +67,6 @@ class ProductRepository:
 
         return products, total
 
-
     async def get_product(self, conditions: Optional[ColumnElement[bool]], session: AsyncSession, joins: list = None):
         statement = select(Product).options(
             *joins if joins else []
@@ -72,6 +76,21 @@ class ProductRepository:
 
         return result.one_or_none()
 
+    async def get_product_ids(self, condition: Optional[ColumnElement[bool]], session: AsyncSession):
+        statement = select(Product.id).where(condition)
+        result = await session.exec(statement)
+
+        return [row[0] for row in result.all()]
+
+    async def get_suggest_products(self, session: AsyncSession):
+        statement = select(Product.id, Product.name, Product.popularity_score).where(
+            Product.deleted_at.is_(None),
+            Product.status == "active"
+        )
+        result = await session.exec(statement)
+
+        return result.all()
+
     async def update_product(self, data_need_update, update_data: dict, session: AsyncSession):
         for k, v in update_data.items():
             if v is not None:
@@ -93,6 +112,119 @@ class ProductRepository:
         await session.commit()
 
 
+    async def refresh_price_aggregates(self, product_ids: list, session: AsyncSession):
+        if not product_ids:
+            return
+
+        stmt = (
+            select(
+                Product.id,
+                func.coalesce(func.min(Product_Variant.price), 0).label("min_price"),
+                func.coalesce(func.max(Product_Variant.price), 0).label("max_price"),
+                Special_Offer.type.label("offer_type"),
+                Special_Offer.discount.label("offer_discount")
+            )
+            .select_from(Product)
+            .outerjoin(Product_Variant, and_(Product_Variant.product_id == Product.id, Product_Variant.deleted_at.is_(None)))
+            .outerjoin(Special_Offer, and_(Special_Offer.id == Product.special_offer_id, active_offer_condition()))
+            .where(Product.id.in_(product_ids))
+            .group_by(Product.id, Special_Offer.type, Special_Offer.discount)
+        )
+        result = await session.exec(stmt)
+        rows = result.all()
+
+        if not rows:
+            return
+
+        discounted_min_prices = calculate_discounted_prices(
+            [row.min_price for row in rows], [(row.offer_type, row.offer_discount) for row in rows]
+        )
+
+        min_cases, max_cases, discounted_cases = [], [], []
+        for row, discounted_min_price in zip(rows, discounted_min_prices):
+            min_cases.append((Product.id == row.id, row.min_price))
+            max_cases.append((Product.id == row.id, row.max_price))
+            discounted_cases.append((Product.id == row.id, discounted_min_price))
+
+        # 1 câu UPDATE cho toàn bộ sản phẩm bị ảnh hưởng
+        update_stmt = (
+            update(Product)
+            .where(Product.id.in_([row.id for row in rows]))
+            .values(
+                min_price=case(*min_cases, else_=Product.min_price),
+                max_price=case(*max_cases, else_=Product.max_price),
+                discounted_min_price=case(*discounted_cases, else_=Product.discounted_min_price)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await session.exec(update_stmt)
+
+
+    async def update_rating_counters(self, product_id, rate: int, sign: int, session: AsyncSession):
+        # Vế phải của UPDATE đọc giá trị cũ nên avg_rating tính từ bộ đếm mới ngay trong cùng câu lệnh
+        rating_count = Product.rating_count + sign
+        rating_sum = Product.rating_sum + sign * rate
+        rating_column = getattr(Product, f"rating_{rate}")
+
+        stmt = (
+            update(Product)
+            .where(Product.id == product_id)
+            .values(
+                rating_count=rating_count,
+                rating_sum=rating_sum,
+                **{f"rating_{rate}": rating_column + sign},
+                avg_rating=case((rating_count > 0, cast(rating_sum, Float) / rating_count), else_=0.0),
+                updated_at=datetime.now()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await session.exec(stmt)
+
+    async def get_rating_counters(self, product_id, session: AsyncSession):
+        statement = select(
+            Product.rating_count,
+            Product.rating_sum,
+            Product.rating_1,
+            Product.rating_2,
+            Product.rating_3,
+            Product.rating_4,
+            Product.rating_5
+        ).where(Product.id == product_id, Product.deleted_at.is_(None))
+        result = await session.exec(statement)
+
+        return result.one_or_none()
+
+    async def update_sales_counters(self, order_ids: list, sign: int, session: AsyncSession):
+        if not order_ids:
+            return []
+
+        # Gom số lượng và số dòng theo sản phẩm rồi cập nhật bằng 1 câu UPDATE ... FROM
+        sold = (
+            select(
+                Order_Detail.product_id.label("product_id"),
+                func.sum(Order_Detail.quantity).label("quantity"),
+                func.count(Order_Detail.id).label("line_count")
+            )
+            .where(Order_Detail.order_id.in_(order_ids))
+            .group_by(Order_Detail.product_id)
+            .subquery()
+        )
+
+        stmt = (
+            update(Product)
+            .where(Product.id == sold.c.product_id)
+            .values(
+                total_sold=func.greatest(Product.total_sold + sign * sold.c.quantity, 0),
+                popularity_score=func.greatest(Product.popularity_score + sign * sold.c.line_count, 0)
+            )
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(stmt)
+
+        return [row[0] for row in result.all()]
+
+
     async def delete_product(self, condition: Optional[ColumnElement[bool]], session: AsyncSession):
         joins = [
             noload(Product.order_detail),
@@ -178,7 +310,7 @@ class ProductRepository:
             .join(Categories_Product, Categories_Product.product_id == Product.id)
             .join(Categories, Categories_Product.categories_id == Categories.id)
             .outerjoin(Product_Variant, Product_Variant.product_id == Product.id)
-            .outerjoin(Special_Offer, Special_Offer.id == Product.special_offer_id)
+            .outerjoin(Special_Offer, and_(Special_Offer.id == Product.special_offer_id, active_offer_condition()))
             .where(conditions)
             .group_by(Product.id, Product.name, Product.images, Product.popularity_score, Special_Offer.discount, Special_Offer.type, Product.avg_rating)
             .order_by(desc(Product.popularity_score))
@@ -210,7 +342,7 @@ class ProductRepository:
             .join(Categories_Product, Categories_Product.product_id == Product.id)
             .join(Categories, Categories_Product.categories_id == Categories.id)
             .outerjoin(Product_Variant, Product_Variant.product_id == Product.id)
-            .outerjoin(Special_Offer, Special_Offer.id == Product.special_offer_id)
+            .outerjoin(Special_Offer, and_(Special_Offer.id == Product.special_offer_id, active_offer_condition()))
             .where(Special_Offer.discount.isnot(None), Special_Offer.type == "percent")
             .group_by(Product.id, Product.name, Product.images, Special_Offer.discount, Product.avg_rating)
             .order_by(desc(Special_Offer.discount))
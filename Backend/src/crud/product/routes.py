@@ -1,4 +1,4 @@
-from fastapi import APIRouter, status, Depends, Query
+from fastapi import APIRouter, status, Depends, Query, Request
 from src.crud.product.services import ProductService
 from src.dependencies import AccessTokenBearer
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -8,6 +8,9 @@ from fastapi.responses import JSONResponse
 from src.errors.categories import CategoriesException
 from src.schemas.product import ProductCreateModel, ProductUpdateModel, DeleteMultipleProductModel, ProductFilterModel
 from src.dependencies import admin_role_middleware
+from src.database.redis import get_product_detail_cache_stats
+from src.database.query_budget import query_budget
+from src.http_cache import http_cache
 from typing import Optional, List
 
 product_admin_router = APIRouter(prefix="/product")
@@ -19,10 +22,10 @@ access_token_bearer = AccessTokenBearer()
 
 
 @product_admin_router.post("/", status_code=status.HTTP_201_CREATED, dependencies=[Depends(admin_role_middleware)])
-async def create_product(product_data: ProductCreateModel,
+async def create_product(product_data: ProductCreateModel, request: Request,
                          token_details: dict = Depends(access_token_bearer),
                          session: AsyncSession = Depends(get_session)):
-    product_dict = await product_service.create_product(product_data, session)
+    product_dict = await product_service.create_product(product_data, session, request)
     return JSONResponse(
         status_code=status.HTTP_201_CREATED,
         content={
@@ -31,8 +34,9 @@ async def create_product(product_data: ProductCreateModel,
         }
     )
 
-@product_customer_router.get('/category')
+@product_customer_router.get('/category', dependencies=[Depends(http_cache(max_age=60, stale_while_revalidate=30))])
 async def get_all_products_customer(category_id: str,
+                                    request: Request,
                                     search: Optional[str] = None,
                                     category_ids: Optional[List[str]] = Query(default=[]),
                                     min_price: Optional[int] = None,
@@ -42,6 +46,8 @@ async def get_all_products_customer(category_id: str,
                                     sizes: Optional[List[str]] = None,
                                     rating: Optional[List[int]] = Query(None),
                                     skip: int = 0, limit: int = 16,
+                                    cursor: Optional[str] = None,
+                                    include_total: Optional[bool] = None,
                                     session: AsyncSession = Depends(get_session)):
     filter_data = ProductFilterModel(
         search=search,
@@ -54,7 +60,8 @@ async def get_all_products_customer(category_id: str,
         rating=rating
     )
 
-    products = await product_service.get_all_products_customer_service(category_id, filter_data, session, skip, limit)
+    products = await product_service.get_all_products_customer_service(category_id, filter_data, session, skip, limit,
+                                                                 cursor, include_total, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -64,7 +71,7 @@ async def get_all_products_customer(category_id: str,
         }
     )
 
-@product_customer_router.get('/popular/{parent_category_id}')
+@product_customer_router.get('/popular/{parent_category_id}', dependencies=[Depends(http_cache(max_age=300, stale_while_revalidate=60))])
 async def get_products_popular(parent_category_id: str, limit_per_category: int = 12, session: AsyncSession = Depends(get_session)):
     products = await product_service.get_products_popular_service(parent_category_id, session, limit_per_category)
 
@@ -92,7 +99,7 @@ async def get_products_offer(categories_id: str, session: AsyncSession = Depends
         }
     )
 
-@product_customer_router.get('/latest')
+@product_customer_router.get('/latest', dependencies=[Depends(http_cache(max_age=300, stale_while_revalidate=60))])
 async def get_products_latest(limit_per_category: int = 12, session: AsyncSession = Depends(get_session)):
     products = await product_service.get_latest_products_service(session, limit_per_category)
 
@@ -104,7 +111,7 @@ async def get_products_latest(limit_per_category: int = 12, session: AsyncSessio
         }
     )
 
-@product_customer_router.get('/top-discount')
+@product_customer_router.get('/top-discount', dependencies=[Depends(http_cache(max_age=300, stale_while_revalidate=60))])
 async def get_products_top_discount(limit: int = 12, session: AsyncSession = Depends(get_session)):
     products = await product_service.get_top_discount_service(session, limit)
 
@@ -116,15 +123,45 @@ async def get_products_top_discount(limit: int = 12, session: AsyncSession = Dep
         }
     )
 
-@product_customer_router.get('/filter-info')
-async def get_products_top_discount(limit: int = 12, session: AsyncSession = Depends(get_session)):
-    products = await product_service.get_top_discount_service(session, limit)
+@product_common_router.get('/suggest', dependencies=[Depends(http_cache(max_age=60))])
+async def suggest_products(q: str, limit: int = 10):
+    suggestions = product_service.suggest_products(q, limit)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
-            "message": "Thông tin của các sản phẩm",
-            "content": products
+            "message": "Gợi ý tìm kiếm",
+            "content": suggestions
+        }
+    )
+
+@product_customer_router.get('/filter-info', dependencies=[Depends(http_cache(max_age=60, stale_while_revalidate=30))])
+async def get_products_filter_info(category_id: str,
+                                   request: Request,
+                                   search: Optional[str] = None,
+                                   category_ids: Optional[List[str]] = Query(default=[]),
+                                   min_price: Optional[int] = None,
+                                   max_price: Optional[int] = None,
+                                   colors: Optional[List[str]] = Query(None),
+                                   sizes: Optional[List[str]] = Query(None),
+                                   rating: Optional[List[int]] = Query(None),
+                                   session: AsyncSession = Depends(get_session)):
+    filter_data = ProductFilterModel(
+        search=search,
+        category_ids=category_ids,
+        min_price=min_price,
+        max_price=max_price,
+        colors=colors,
+        sizes=sizes,
+        rating=rating
+    )
+    facets = await product_service.get_filter_info_service(category_id, filter_data, session, request)
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Thông tin bộ lọc sản phẩm",
+            "content": facets
         }
     )
 
@@ -180,9 +217,20 @@ async def get_all_product_admin(search: Optional[str] = None,
     )
 
 
-@product_customer_router.get('/{id}')
-async def get_detail_product_customer(id: str, session: AsyncSession = Depends(get_session)):
-    product_dict = await product_service.get_detail_product_customer_service(id, session)
+@product_admin_router.get('/cache-stats', dependencies=[Depends(admin_role_middleware)])
+async def get_product_cache_stats(token_details: dict = Depends(access_token_bearer)):
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Thống kê cache chi tiết sản phẩm",
+            "content": get_product_detail_cache_stats()
+        }
+    )
+
+
+@product_customer_router.get('/{id}', dependencies=[Depends(query_budget(5)), Depends(http_cache(max_age=60, stale_while_revalidate=30))])
+async def get_detail_product_customer(id: str, request: Request, session: AsyncSession = Depends(get_session)):
+    product_dict = await product_service.get_detail_product_customer_service(id, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -193,11 +241,11 @@ async def get_detail_product_customer(id: str, session: AsyncSession = Depends(g
     )
 
 
-@product_admin_router.get('/{id}', dependencies=[Depends(admin_role_middleware)])
-async def get_detail_product_admin(id: str,
+@product_admin_router.get('/{id}', dependencies=[Depends(admin_role_middleware), Depends(query_budget(5))])
+async def get_detail_product_admin(id: str, request: Request,
                                    token_details: dict = Depends(access_token_bearer),
                                    session: AsyncSession = Depends(get_session)):
-    product_dict = await product_service.get_detail_product_admin_service(id, session)
+    product_dict = await product_service.get_detail_product_admin_service(id, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -242,10 +290,10 @@ async def get_products_offer(categories_id: str, session: AsyncSession = Depends
 
 
 @product_admin_router.put('/{id}', dependencies=[Depends(admin_role_middleware)])
-async def update_product(id: str, product_data: ProductUpdateModel,
+async def update_product(id: str, product_data: ProductUpdateModel, request: Request,
                          token_details: dict = Depends(access_token_bearer),
                          session: AsyncSession = Depends(get_session)):
-    product = await product_service.update_product(id, product_data, session)
+    product = await product_service.update_product(id, product_data, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -257,9 +305,9 @@ async def update_product(id: str, product_data: ProductUpdateModel,
 
 
 @product_admin_router.delete('/{id}', dependencies=[Depends(admin_role_middleware)])
-async def delete_product(id: str, token_details: dict = Depends(access_token_bearer),
+async def delete_product(id: str, request: Request, token_details: dict = Depends(access_token_bearer),
                          session: AsyncSession = Depends(get_session)):
-    product = await product_service.delete_product(id, session)
+    product = await product_service.delete_product(id, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -271,9 +319,10 @@ async def delete_product(id: str, token_details: dict = Depends(access_token_bea
 
 
 @product_admin_router.post('/delete', dependencies=[Depends(admin_role_middleware)])
-async def delete_multiple_product(data: DeleteMultipleProductModel, token_details: dict = Depends(access_token_bearer),
+async def delete_multiple_product(data: DeleteMultipleProductModel, request: Request,
+                                  token_details: dict = Depends(access_token_bearer),
                                   session: AsyncSession = Depends(get_session)):
-    product_ids = await product_service.delete_multiple_product(data, session)
+    product_ids = await product_service.delete_multiple_product(data, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
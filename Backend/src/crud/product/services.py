@@ -1,15 +1,20 @@
 from sqlalchemy.orm import selectinload, load_only, joinedload, noload
 from collections import defaultdict
-from src.crud.color.repositories import ColorRepository
+import hashlib
+import json
 from src.crud.color.services import ColorService
 from src.crud.product_variant.repositories import ProductVariantRepository
-from src.database.models import Product, Categories_Product, Categories, Product_Variant, Color, Order_Detail, Evaluate, \
-    Special_Offer
+from src.database.models import Product, Categories_Product, Categories, Product_Variant, Order_Detail, Evaluate, \
+    Special_Offer, Product_Card
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import and_, desc, asc, or_, func, select
+from uuid import UUID
+from sqlalchemy import Float
 from datetime import datetime
 from src.crud.product.repositories import ProductRepository
+from src.crud.product_card.repositories import ProductCardRepository
 from src.crud.categories.repositories import CategoriesRepository
+from src.crud.categories.tree import category_tree_cache
 from src.crud.categories_product.repositories import CategoriesProductRepository
 from src.crud.product_variant.services import ProductVariantService
 from src.crud.categories_product.services import CategoriesProductService
@@ -17,20 +22,30 @@ from src.errors.color import ColorException
 from src.errors.product import ProductException
 from src.errors.categories import CategoriesException
 from src.schemas.product import DeleteMultipleProductModel, ProductFilterModel, SortBy
+from src.crud.product.utils import encode_product_cursor, decode_product_cursor
+from src.crud.product.pricing import calculate_discounted_prices
+from src.database.redis import get_product_detail_cache, set_product_detail_cache, invalidate_product_detail_cache, \
+    get_product_facets_cache, set_product_facets_cache
+from fastapi import Request
+from src.database.loaders import loader_profile
+from src.crud.product.suggest import suggest_index, index_product, unindex_products
 
 product_repository = ProductRepository()
+product_card_repository = ProductCardRepository()
 categories_repository = CategoriesRepository()
 cate_product_repository = CategoriesProductRepository()
 product_variant_repository = ProductVariantRepository()
-color_repository = ColorRepository()
 
 product_variant_service = ProductVariantService()
 categories_product_service = CategoriesProductService()
 color_service = ColorService()
 
+# Cận trên của các khoảng giá trong facet, khoảng cuối không giới hạn
+PRICE_BUCKET_BOUNDS = [200000, 500000, 1000000, 2000000]
+
 
 class ProductService:
-    async def create_product(self, product_data, session: AsyncSession):
+    async def create_product(self, product_data, session: AsyncSession, request: Request = None):
         if not product_data.name:
             ProductException.invalid_name()
 
@@ -64,13 +79,7 @@ class ProductService:
                 else:
                     ColorException.invalid_color_format()
 
-            if color_ids:
-                condition = [Color.id.in_(color_ids), Color.deleted_at.is_(None)]
-                existing_colors, _ = await color_repository.get_all_color(condition, session)
-                existing_color_ids = {str(c.id) for c in existing_colors}
-                missing_color_ids = set(color_ids) - existing_color_ids
-                if missing_color_ids:
-                    ColorException.color_not_exists()
+            await color_service.validate_color_ids(color_ids, session, request)
 
             new_product = await product_repository.create_product(product_data, session)
 
@@ -78,9 +87,12 @@ class ProductService:
 
             await product_variant_repository.create_product_variant(product_data.product_variant, new_product.id,
                                                                     session)
+            await product_repository.refresh_price_aggregates([new_product.id], session)
+            await product_card_repository.refresh_product_cards([new_product.id], session)
 
             await session.commit()
             await session.refresh(new_product)
+            index_product(new_product)
 
             product_dict = {
                 "id": str(new_product.id),
@@ -104,58 +116,18 @@ class ProductService:
             await session.rollback()
             ProductException.invalid_create_product()
 
-    async def get_detail_product(self, product_id: str, session: AsyncSession):
+    async def get_detail_product(self, product_id: str, session: AsyncSession, request: Request = None):
+        if request is not None:
+            cached_product = await get_product_detail_cache(product_id, request)
+            if cached_product is not None:
+                # Tồn kho đổi theo từng đơn hàng nên không nằm trong cache, luôn đọc trực tiếp
+                quantities = await product_variant_repository.get_variant_quantities(product_id, session)
+                for variant in cached_product["product_variant"]:
+                    variant["quantity"] = quantities.get(variant["id"], 0)
+                return cached_product
+
         condition = and_(Product.id == product_id, Product.deleted_at.is_(None))
-        joins = [
-            selectinload(Product.categories_product).options(
-                noload(Categories_Product.product),
-                joinedload(Categories_Product.categories).options(
-                    noload(Categories.categories_product),
-                    noload(Categories.products),
-                    noload(Categories.children),
-                    noload(Categories.parent)
-                ).load_only(
-                    Categories.id,
-                    Categories.name,
-                    Categories.parent_id,
-                    Categories.deleted_at
-                )
-            ),
-
-            selectinload(Product.product_variant).options(
-                noload(Product_Variant.order_detail),
-                noload(Product_Variant.evaluate),
-                noload(Product_Variant.product),
-                joinedload(Product_Variant.color).options(
-                    noload(Color.product_variant)
-                ).load_only(
-                    Color.id,
-                    Color.name,
-                    Color.code,
-                )
-            ).load_only(
-                Product_Variant.id,
-                Product_Variant.size,
-                Product_Variant.price,
-                Product_Variant.quantity,
-                Product_Variant.sku,
-                Product_Variant.color_name,
-                Product_Variant.color_code,
-                Product_Variant.deleted_at
-            ),
-
-            selectinload(Product.special_offer).options(
-                noload(Special_Offer.products)
-            ).load_only(
-                Special_Offer.id,
-                Special_Offer.discount,
-                Special_Offer.type
-            ),
-
-            noload(Product.order_detail),
-            noload(Product.categories),
-            noload(Product.evaluate),
-        ]
+        joins = loader_profile("product_detail")
 
         product_obj = await product_repository.get_product(condition, session, joins)
 
@@ -176,51 +148,52 @@ class ProductService:
         ]
 
         offer = product.special_offer
-        offer_type = offer.type if offer else None
-        offer_discount = offer.discount if offer else None
+        offer_key = (offer.type, offer.discount) if offer else (None, None)
+
+        active_variants = [variant for variant in product.product_variant if variant.deleted_at is None]
+        discounted_prices = calculate_discounted_prices(
+            [variant.price for variant in active_variants], [offer_key] * len(active_variants)
+        )
 
         product_dict["product_variant"] = []
-        for variant in product.product_variant:
-            if variant.deleted_at is None:
-                original_price = variant.price
-                discounted_price = original_price
-
-                if offer_type and offer_discount is not None:
-                    if offer_type == "percent":
-                        raw_discounted_price = original_price * (1 - offer_discount / 100)
-                        discounted_price = int(round(raw_discounted_price / 1000) * 1000)
-                    elif offer_type == "fixed":
-                        raw_discounted_price = max(0, original_price - offer_discount)
-                        discounted_price = int(round(raw_discounted_price / 1000) * 1000)
-
-                variant_data = {
-                    "id": str(variant.id),
-                    "size": variant.size,
-                    "original_price": original_price,
-                    "discounted_price": discounted_price,
-                    "quantity": variant.quantity,
-                    "sku": variant.sku
-                }
+        for variant, discounted_price in zip(active_variants, discounted_prices):
+            original_price = variant.price
 
-                if variant.color:
-                    variant_data.update({
-                        "color_id": str(variant.color.id),
-                        "color_name": variant.color.name,
-                        "color_code": variant.color.code
-                    })
-                else:
-                    variant_data.update({
-                        "color_id": None,
-                        "color_name": variant.color_name,
-                        "color_code": variant.color_code
-                    })
+            variant_data = {
+                "id": str(variant.id),
+                "size": variant.size,
+                "original_price": original_price,
+                "discounted_price": discounted_price,
+                "quantity": variant.quantity,
+                "sku": variant.sku
+            }
 
-                product_dict["product_variant"].append(variant_data)
+            if variant.color:
+                variant_data.update({
+                    "color_id": str(variant.color.id),
+                    "color_name": variant.color.name,
+                    "color_code": variant.color.code
+                })
+            else:
+                variant_data.update({
+                    "color_id": None,
+                    "color_name": variant.color_name,
+                    "color_code": variant.color_code
+                })
+
+            product_dict["product_variant"].append(variant_data)
+
+        if request is not None:
+            cached_variants = [
+                {k: v for k, v in variant.items() if k != "quantity"}
+                for variant in product_dict["product_variant"]
+            ]
+            await set_product_detail_cache(product_id, {**product_dict, "product_variant": cached_variants}, request)
 
         return product_dict
 
-    async def get_detail_product_admin_service(self, product_id: str, session: AsyncSession):
-        product = await self.get_detail_product(product_id, session)
+    async def get_detail_product_admin_service(self, product_id: str, session: AsyncSession, request: Request = None):
+        product = await self.get_detail_product(product_id, session, request)
 
         if product is None:
             ProductException.not_found()
@@ -252,8 +225,8 @@ class ProductService:
 
         return product_dict
 
-    async def get_detail_product_customer_service(self, product_id: str, session: AsyncSession):
-        product = await self.get_detail_product(product_id, session)
+    async def get_detail_product_customer_service(self, product_id: str, session: AsyncSession, request: Request = None):
+        product = await self.get_detail_product(product_id, session, request)
 
         if product is None:
             ProductException.not_found()
@@ -295,27 +268,18 @@ class ProductService:
 
         categories_dict = defaultdict(list)
 
-        for product in products:
-            offer_type = product.type_offer if product.type_offer else None
-            offer_discount = product.discount if product.discount else None
-
-            original_price = product.min_price
-            discounted_price = original_price
-
-            if offer_type and offer_discount is not None:
-                if offer_type == "percent":
-                    raw_discounted_price = original_price * (1 - offer_discount / 100)
-                    discounted_price = int(round(raw_discounted_price / 1000) * 1000)
-                elif offer_type == "fixed":
-                    raw_discounted_price = max(0, original_price - offer_discount)
-                    discounted_price = int(round(raw_discounted_price / 1000) * 1000)
+        discounted_prices = calculate_discounted_prices(
+            [product.min_price for product in products],
+            [(product.type_offer, product.discount) for product in products]
+        )
 
+        for product, discounted_price in zip(products, discounted_prices):
             categories_dict[str(parent_category_id)].append({
                 "id": str(product.product_id),
                 "name": product.product_name,
                 "images": product.images,
                 "avg_rating": product.avg_rating,
-                "original_price": original_price,
+                "original_price": product.min_price,
                 "discounted_price": discounted_price,
                 "categories": product.categories
             })
@@ -325,23 +289,20 @@ class ProductService:
     async def get_top_discount_service(self, session: AsyncSession, limit: int = 12):
         products = await product_repository.get_top_discount(session, limit)
 
-        product_list = []
-        for product in products:
-            offer_discount = product.discount if product.discount else None
-
-            original_price = product.min_price
-            discounted_price = original_price
-
-            if offer_discount is not None:
-                raw_discounted_price = original_price * (1 - offer_discount / 100)
-                discounted_price = int(round(raw_discounted_price / 1000) * 1000)
+        # Repository chỉ lấy offer dạng percent
+        discounted_prices = calculate_discounted_prices(
+            [product.min_price for product in products],
+            [("percent", product.discount) for product in products]
+        )
 
+        product_list = []
+        for product, discounted_price in zip(products, discounted_prices):
             product_list.append({
                 "id": str(product.product_id),
                 "name": product.product_name,
                 "images": product.images,
                 "avg_rating": product.avg_rating,
-                "original_price": original_price,
+                "original_price": product.min_price,
                 "discounted_price": discounted_price,
                 "categories": product.categories
             })
@@ -349,112 +310,53 @@ class ProductService:
         return product_list
 
     async def get_latest_products_service(self, session: AsyncSession, limit_per_category: int = 12):
-        condition = [Product.deleted_at.is_(None), Product.status == "active"]
-        order_by = desc(Product.created_at)
-
-        joins = [
-            selectinload(Product.categories).options(
-                noload(Categories.categories_product),
-                noload(Categories.products),
-                noload(Categories.children),
-                joinedload(Categories.parent).options(
-                    noload(Categories.categories_product),
-                    noload(Categories.products),
-                    noload(Categories.children),
-                    noload(Categories.parent)
-                )
-            ).load_only(
-                Categories.id,
-                Categories.name,
-                Categories.parent_id,
-                Categories.deleted_at
-            ),
-
-            selectinload(Product.product_variant).options(
-                noload(Product_Variant.order_detail),
-                noload(Product_Variant.evaluate),
-                noload(Product_Variant.product),
-                noload(Product_Variant.color)
-            ).load_only(
-                Product_Variant.id,
-                Product_Variant.price,
-                Product_Variant.deleted_at
-            ),
-
-            selectinload(Product.special_offer).options(
-                noload(Special_Offer.products)
-            ).load_only(
-                Special_Offer.id,
-                Special_Offer.discount,
-                Special_Offer.type
-            ),
-
-            noload(Product.order_detail),
-            noload(Product.categories_product),
-            noload(Product.evaluate),
-        ]
+        condition = [Product_Card.deleted_at.is_(None), Product_Card.status == "active"]
+        order_by = desc(Product_Card.created_at)
 
-        products, _ = await product_repository.get_all_product(condition, session, joins, skip=0,
-                                                               limit=limit_per_category, order_by_clause=order_by)
+        cards, _ = await product_card_repository.get_all_product_card(condition, session, skip=0, limit=limit_per_category,
+                                                                      order_by_clause=order_by, with_total=False)
 
-        product_list = []
-        for product in products:
-            valid_categories = [cat for cat in product[0].categories if cat.deleted_at is None]
+        return [self.card_response(card) for card in cards]
 
-            active_variants = [
-                variant for variant in product[0].product_variant if variant.deleted_at is None
-            ]
 
-            offer = product[0].special_offer
-            offer_type = offer.type if offer else None
-            offer_discount = offer.discount if offer else None
+    async def get_all_products_customer_service(self, category_id: str, filter_data: ProductFilterModel, session: AsyncSession, skip: int = 0, limit: int = 16,
+                                                cursor: str = None, include_total: bool = None, request: Request = None):
+        await self.apply_category_filter(category_id, filter_data, session, request)
 
-            price_min = 0
-            if active_variants:
-                prices = [variant.price for variant in active_variants if variant.price is not None]
-                if prices:
-                    price_min = min(prices)
-
-            original_price = price_min
-            discounted_price = original_price
-
-            if offer_type and offer_discount is not None:
-                if offer_type == "percent":
-                    raw_discounted_price = original_price * (1 - offer_discount / 100)
-                    discounted_price = int(round(raw_discounted_price / 1000) * 1000)
-                elif offer_type == "fixed":
-                    raw_discounted_price = max(0, original_price - offer_discount)
-                    discounted_price = int(round(raw_discounted_price / 1000) * 1000)
+        filters, order_by_clause = await self.filter_product(filter_data, session)
 
-            product_data = {
-                "id": str(product[0].id),
-                "name": product[0].name,
-                "images": product[0].images,
-                "categories": [
-                    {
-                        "id": str(category.id),
-                        "name": category.name,
-                    }
-                    for category in valid_categories
-                ],
-                "original_price": original_price,
-                "discounted_price": discounted_price,
-                "avg_rating": product[0].avg_rating
-            }
+        next_cursor = None
+        if cursor is not None:
+            # Chế độ keyset: cursor rỗng là trang đầu, mặc định không đếm tổng
+            sort_expr, descending = self.get_sort_key(filter_data.sort_by, filter_data.search)
+            after = decode_product_cursor(cursor, filter_data.sort_by) if cursor else None
+            cards, has_more, total = await product_card_repository.get_all_product_card_by_keyset(
+                filters, session, sort_expr, descending, after, limit, with_total=bool(include_total)
+            )
 
-            product_list.append(product_data)
+            if has_more and cards:
+                last_card = cards[-1]
+                next_cursor = encode_product_cursor(filter_data.sort_by, last_card.sort_key, last_card.product_id)
+        else:
+            with_total = include_total if include_total is not None else True
+            cards, total = await product_card_repository.get_all_product_card(filters, session, skip, limit,
+                                                                              order_by_clause, with_total)
 
-        return product_list
+        product_list = [self.card_response(card) for card in cards]
 
+        response = {
+            "data": product_list,
+            "total": total
+        }
 
-    async def get_all_products_customer_service(self, category_id: str, filter_data: ProductFilterModel, session: AsyncSession, skip: int = 0, limit: int = 16):
-        condition_cate = and_(Categories.id == category_id,Categories.deleted_at.is_(None))
-        category = await categories_repository.get_category(condition_cate, session)
+        if cursor is not None:
+            response["next_cursor"] = next_cursor
 
-        if not category:
-            CategoriesException.not_found()
+        return response
 
-        category_ids_to_filter = await self.get_category_ids_for_filter(category, session)
+    async def apply_category_filter(self, category_id: str, filter_data: ProductFilterModel, session: AsyncSession,
+                                    request: Request = None):
+        category_ids_to_filter = await self.get_category_ids_for_filter(category_id, session, request)
 
         if filter_data.category_ids:
             existing_categories = set(filter_data.category_ids)
@@ -467,320 +369,217 @@ class ProductService:
         else:
             filter_data.category_ids = category_ids_to_filter
 
-        joins = [
-            selectinload(Product.categories).options(
-                noload(Categories.categories_product),
-                noload(Categories.products),
-                noload(Categories.children),
-                joinedload(Categories.parent).options(
-                    noload(Categories.categories_product),
-                    noload(Categories.products),
-                    noload(Categories.children),
-                    noload(Categories.parent)
-                )
-            ).load_only(
-                Categories.id,
-                Categories.name,
-                Categories.parent_id,
-                Categories.deleted_at
-            ),
-
-            selectinload(Product.product_variant).options(
-                noload(Product_Variant.order_detail),
-                noload(Product_Variant.evaluate),
-                noload(Product_Variant.product),
-                noload(Product_Variant.color)
-            ).load_only(
-                Product_Variant.id,
-                Product_Variant.price,
-                Product_Variant.deleted_at
-            ),
-
-            selectinload(Product.special_offer).options(
-                noload(Special_Offer.products)
-            ).load_only(
-                Special_Offer.id,
-                Special_Offer.discount,
-                Special_Offer.type
-            ),
-
-            noload(Product.order_detail),
-            noload(Product.categories_product),
-            noload(Product.evaluate),
-        ]
-
-        filters, order_by_clause = await self.filter_product(filter_data, session)
-        products, total = await product_repository.get_all_product(filters, session, joins, skip, limit,
-                                                                   order_by_clause)
-
-        product_list = []
-        for product in products:
-            valid_categories = [cat for cat in product[0].categories if cat.deleted_at is None]
-
-            active_variants = [
-                variant for variant in product[0].product_variant if variant.deleted_at is None
-            ]
-
-            offer = product[0].special_offer
-            offer_discount = offer.discount if offer else None
-
-            price_min = 0
-            if active_variants:
-                prices = [variant.price for variant in active_variants if variant.price is not None]
-                if prices:
-                    price_min = min(prices)
-
-            original_price = price_min
-            discounted_price = original_price
-
-            if offer_discount is not None:
-                raw_discounted_price = original_price * (1 - offer_discount / 100)
-                discounted_price = int(round(raw_discounted_price / 1000) * 1000)
-
-            product_data = {
-                "id": str(product[0].id),
-                "name": product[0].name,
-                "images": product[0].images,
-                "categories": [
-                    {
-                        "id": str(category.id),
-                        "name": category.name,
-                    }
-                    for category in valid_categories
-                ],
-                "original_price": original_price,
-                "discounted_price": discounted_price,
-                "avg_rating": product[0].avg_rating
-            }
-
-            product_list.append(product_data)
-
-        return {
-            "data": product_list,
-            "total": total[0]
+    async def get_filter_info_service(self, category_id: str, filter_data: ProductFilterModel, session: AsyncSession,
+                                      request: Request = None):
+        filter_hash = hashlib.sha1(
+            json.dumps(filter_data.model_dump(exclude={"sort_by"}), sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+        if request is not None:
+            cached_facets = await get_product_facets_cache(category_id, filter_hash, request)
+            if cached_facets is not None:
+                return cached_facets
+
+        await self.apply_category_filter(category_id, filter_data, session, request)
+
+        filters, facet_filters = self.build_filter_conditions(filter_data)
+        rows = await product_card_repository.get_facet_counts(filters, facet_filters, PRICE_BUCKET_BOUNDS, session)
+
+        counts = defaultdict(dict)
+        for row in rows:
+            counts[row.facet][row.value] = row.total
+
+        bounds = [0, *PRICE_BUCKET_BOUNDS, None]
+        facets = {
+            "colors": [
+                {"value": value, "count": count}
+                for value, count in sorted(counts["colors"].items(), key=lambda item: (-item[1], item[0]))
+            ],
+            "sizes": [
+                {"value": value, "count": count}
+                for value, count in sorted(counts["sizes"].items(), key=lambda item: (-item[1], item[0]))
+            ],
+            "price_ranges": [
+                {"min": bounds[index], "max": bounds[index + 1], "count": counts["price"].get(str(index), 0)}
+                for index in range(len(bounds) - 1)
+            ],
+            "ratings": [
+                {"rating": rating, "count": counts["rating"].get(str(rating), 0)}
+                for rating in range(5, 0, -1)
+            ],
         }
 
-    async def get_category_ids_for_filter(self, category: Categories, session: AsyncSession):
-        if category.parent_id is None:
-            condition = [Categories.parent_id == category.id, Categories.deleted_at.is_(None)]
-            joins = [noload(Categories.products), noload(Categories.categories_product), noload(Categories.children), noload(Categories.parent)]
-            child_categories, _ = await categories_repository.get_all_categories(condition, session, 0, 1000, joins)
+        if request is not None:
+            await set_product_facets_cache(category_id, filter_hash, facets, request)
 
-            child_category_ids = [str(row.id) for row in child_categories]
+        return facets
 
-            return [str(category.id)] + child_category_ids
-        else:
-            return [str(category.id)]
+    async def get_category_ids_for_filter(self, category_id: str, session: AsyncSession, request: Request = None):
+        tree = await category_tree_cache.get(session, request)
+        if not tree.get(category_id):
+            CategoriesException.not_found()
+
+        return list(tree.get_descendant_ids(category_id))
 
 
     async def get_all_product_admin_service(self, filter_data: ProductFilterModel, session: AsyncSession, skip: int = 0,
                                             limit: int = 10,
                                             include_status: bool = True):
-
-        joins = [
-            selectinload(Product.categories).options(
-                noload(Categories.categories_product),
-                noload(Categories.products),
-                noload(Categories.children),
-                joinedload(Categories.parent).options(
-                    noload(Categories.categories_product),
-                    noload(Categories.products),
-                    noload(Categories.children),
-                    noload(Categories.parent)
-                )
-            ).load_only(
-                Categories.id,
-                Categories.name,
-                Categories.parent_id,
-                Categories.deleted_at
-            ),
-
-            selectinload(Product.product_variant).options(
-                noload(Product_Variant.order_detail),
-                noload(Product_Variant.evaluate),
-                noload(Product_Variant.product),
-                noload(Product_Variant.color)
-            ).load_only(
-                Product_Variant.id,
-                Product_Variant.price,
-                Product_Variant.deleted_at
-            ),
-
-            selectinload(Product.special_offer).options(
-                noload(Special_Offer.products)
-            ).load_only(
-                Special_Offer.id,
-                Special_Offer.name,
-            ),
-
-            noload(Product.order_detail),
-            noload(Product.evaluate),
-            noload(Product.categories_product),
-        ]
-
         filters, order_by_clause = await self.filter_product(filter_data, session)
-        products, total = await product_repository.get_all_product(filters, session, joins, skip, limit,
-                                                                   order_by_clause)
+        cards, total = await product_card_repository.get_all_product_card(filters, session, skip, limit,
+                                                                          order_by_clause)
 
         product_list = []
-        for product in products:
-            valid_categories = [cat for cat in product[0].categories if cat.deleted_at is None]
-
-            active_variants = [
-                variant for variant in product[0].product_variant if variant.deleted_at is None
-            ]
-            variant_count = len(active_variants)
-
-            price_range = None
-            if active_variants:
-                prices = [variant.price for variant in active_variants if variant.price is not None]
-                if prices:
-                    price_range = {
-                        "min": min(prices),
-                        "max": max(prices)
-                    }
-
+        for card in cards:
             product_data = {
-                "id": str(product[0].id),
-                "name": product[0].name,
-                "images": product[0].images,
-                "categories": [
-                    {
-                        "id": str(category.id),
-                        "name": category.name,
-                        "parent_id": str(category.parent_id) if category.parent_id else None
-                    }
-                    for category in valid_categories
-                ],
-                "created_at": str(product[0].created_at),
-                "variant_count": variant_count,
-                "price_range": price_range,
-                "avg_rating": product[0].avg_rating,
-                "offer_name": product[0].special_offer.name if product[0].special_offer else None,
+                "id": str(card.product_id),
+                "name": card.name,
+                "images": card.images,
+                "categories": card.categories,
+                "created_at": str(card.created_at),
+                "variant_count": card.variant_count,
+                "price_range": {"min": card.min_price, "max": card.max_price} if card.variant_count else None,
+                "avg_rating": card.avg_rating,
+                "offer_name": card.offer_name,
             }
             if include_status:
-                product_data["status"] = product[0].status
+                product_data["status"] = card.status
 
             product_list.append(product_data)
 
         return {
             "data": product_list,
-            "total": total[0]
+            "total": total
+        }
+
+    def suggest_products(self, prefix: str, limit: int = 10):
+        # Đọc từ index trong bộ nhớ, không chạm tới DB
+        return suggest_index.suggest(prefix, max(1, min(limit, 20)))
+
+    def card_response(self, card):
+        return {
+            "id": str(card.product_id),
+            "name": card.name,
+            "images": card.images,
+            "categories": [
+                {
+                    "id": category["id"],
+                    "name": category["name"],
+                }
+                for category in card.categories
+            ],
+            "original_price": card.min_price,
+            "discounted_price": card.discounted_min_price,
+            "avg_rating": card.avg_rating
         }
 
     async def filter_product(self, filter_data: ProductFilterModel, session: AsyncSession):
-        filters = [Product.deleted_at.is_(None)]
+        filters, facet_filters = self.build_filter_conditions(filter_data)
+        filters += [condition for condition in facet_filters.values() if condition is not None]
 
-        if filter_data.search:
-            filters.append(Product.name.ilike(f"%{filter_data.search}%"))
+        if filter_data.search and filter_data.search.strip():
+            # Có từ khoá mà không chọn cách sắp xếp thì xếp theo độ liên quan
+            if filter_data.sort_by is None:
+                filter_data.sort_by = SortBy.relevance
+        elif filter_data.sort_by == SortBy.relevance:
+            filter_data.sort_by = None
 
-        if filter_data.category_ids:
-            filters.append(
-                Product.categories.any(
-                    and_(
-                        Categories.id.in_(filter_data.category_ids),
-                        Categories.deleted_at.is_(None)
-                    )
-                )
-            )
+        order_by_clause = await self.filter_sort_product(filter_data.sort_by, session, filter_data.search)
+        return filters, order_by_clause
 
-        if filter_data.min_price is not None or filter_data.max_price is not None:
-            price_conditions = []
-            if filter_data.min_price is not None:
-                price_conditions.append(Product_Variant.price >= filter_data.min_price)
-            if filter_data.max_price is not None:
-                price_conditions.append(Product_Variant.price <= filter_data.max_price)
+    def build_filter_conditions(self, filter_data: ProductFilterModel):
+        # Tách điều kiện chung và điều kiện theo từng facet để facet có thể bỏ qua chính nó khi đếm
+        filters = [Product_Card.deleted_at.is_(None)]
 
-            filters.append(
-                Product.product_variant.any(
-                    and_(
-                        *price_conditions,
-                        Product_Variant.deleted_at.is_(None)
-                    )
-                )
-            )
+        if filter_data.search and filter_data.search.strip():
+            search_condition, _ = self.get_search_expressions(filter_data.search)
+            filters.append(search_condition)
+
+        if filter_data.category_ids:
+            filters.append(Product_Card.category_ids.overlap([UUID(category_id) for category_id in filter_data.category_ids]))
+
+        facet_filters = {"colors": None, "sizes": None, "price": None, "rating": None}
 
         if filter_data.colors:
-            filters.append(
-                Product.product_variant.any(
-                    and_(
-                        Product_Variant.color_name.in_(filter_data.colors),
-                        Product_Variant.deleted_at.is_(None)
-                    )
-                )
-            )
+            facet_filters["colors"] = Product_Card.colors.overlap(filter_data.colors)
 
         if filter_data.sizes:
-            filters.append(
-                Product.product_variant.any(
-                    and_(
-                        Product_Variant.size.in_(filter_data.sizes),
-                        Product_Variant.deleted_at.is_(None)
-                    )
-                )
-            )
+            facet_filters["sizes"] = Product_Card.sizes.overlap(filter_data.sizes)
+
+        # Khoảng giá [min_price, max_price] của sản phẩm chỉ cần giao với khoảng lọc
+        price_conditions = []
+        if filter_data.min_price is not None:
+            price_conditions.append(Product_Card.max_price >= filter_data.min_price)
+        if filter_data.max_price is not None:
+            price_conditions.append(Product_Card.min_price <= filter_data.max_price)
+        if price_conditions:
+            facet_filters["price"] = and_(*price_conditions)
 
         if filter_data.rating:
             rating_conditions = []
             for rating in filter_data.rating:
                 rating_conditions.append(
                     and_(
-                        Product.avg_rating >= rating,
-                        Product.avg_rating < rating + 1
+                        Product_Card.avg_rating >= rating,
+                        Product_Card.avg_rating < rating + 1
                     )
                 )
 
-            filters.append(or_(*rating_conditions))
+            facet_filters["rating"] = or_(*rating_conditions)
 
-        order_by_clause = await self.filter_sort_product(filter_data.sort_by, session)
-        return filters, order_by_clause
+        return filters, facet_filters
 
 
-    async def filter_sort_product(self, sort_by: SortBy, session: AsyncSession):
-        if not sort_by or sort_by == SortBy.newest:
-            return desc(Product.created_at)
+    def get_search_expressions(self, search: str):
+        term = search.strip().lower()
+        # Escape ký tự đại diện của LIKE trong từ khoá người dùng nhập
+        like_term = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
-        elif sort_by == SortBy.price_asc:
-            min_price_subquery = (
-                select(func.min(Product_Variant.price))
-                .where(Product_Variant.product_id == Product.id)
-                .where(Product_Variant.deleted_at.is_(None))
-                .scalar_subquery()
-            )
-            return asc(min_price_subquery)
-
-        elif sort_by == SortBy.price_desc:
-            min_price_subquery = (
-                select(func.min(Product_Variant.price))
-                .where(Product_Variant.product_id == Product.id)
-                .where(Product_Variant.deleted_at.is_(None))
-                .scalar_subquery()
-            )
-            return desc(min_price_subquery)
+        query = func.plainto_tsquery("simple", func.f_unaccent(term))
+        name = func.f_unaccent(func.lower(Product_Card.name))
 
-        elif sort_by == SortBy.name_asc:
-            return asc(Product.name)
+        condition = or_(
+            Product_Card.search_vector.op("@@")(query),
+            name.like(func.concat("%", func.f_unaccent(like_term), "%"))
+        )
+        rank = (
+            func.ts_rank_cd(Product_Card.search_vector, query, type_=Float)
+            + func.similarity(name, func.f_unaccent(term), type_=Float)
+        )
+
+        return condition, rank
 
-        elif sort_by == SortBy.name_desc:
-            return desc(Product.name)
+
+    def get_sort_key(self, sort_by: SortBy, search: str = None):
+        if sort_by == SortBy.relevance and search:
+            _, rank = self.get_search_expressions(search)
+            return rank, True
+
+        elif sort_by in (SortBy.price_asc, SortBy.price_desc):
+            return Product_Card.min_price, sort_by == SortBy.price_desc
 
         elif sort_by == SortBy.best_seller:
-            pass
+            return Product_Card.total_sold, True
+
+        elif sort_by == SortBy.name_asc:
+            return Product_Card.name, False
+
+        elif sort_by == SortBy.name_desc:
+            return Product_Card.name, True
 
         elif sort_by == SortBy.sale_desc:
-            discount_subquery = (
-                select(func.coalesce(Special_Offer.discount, 0))
-                .where(Special_Offer.id == Product.special_offer_id)
-                .where(Special_Offer.deleted_at.is_(None))
-                .scalar_subquery()
-            )
-            return desc(discount_subquery)
+            return Product_Card.offer_discount, True
 
-        else:
-            return desc(Product.created_at)
+        # newest (mặc định)
+        return Product_Card.created_at, True
+
+
+    async def filter_sort_product(self, sort_by: SortBy, session: AsyncSession, search: str = None):
+        sort_expr, descending = self.get_sort_key(sort_by, search)
+        return desc(sort_expr) if descending else asc(sort_expr)
 
 
-    async def update_product(self, product_id: str, product_data, session: AsyncSession):
+    async def update_product(self, product_id: str, product_data, session: AsyncSession, request: Request = None):
         try:
             condition = and_(Product.id == product_id)
             joins = [
@@ -812,7 +611,10 @@ class ProductService:
                 ProductException.not_enough_infor_to_update()
 
             if new_variants is not None:
-                await product_variant_service.update_product_variant(product_id, new_variants, session)
+                await color_service.validate_color_ids(
+                    [variant["color_id"] for variant in new_variants if variant.get("color_id")], session, request
+                )
+                await product_variant_service.update_product_variant(product_id, new_variants, session, request)
 
             if new_category_ids is not None:
                 await categories_product_service.update_categories_product(product_id, new_category_ids, session)
@@ -823,7 +625,12 @@ class ProductService:
             product_to_update[0].updated_at = datetime.now()
 
             await session.flush()
+            await product_card_repository.refresh_product_cards([product_id], session)
             await session.commit()
+            index_product(product_to_update[0])
+
+            if request is not None:
+                await invalidate_product_detail_cache([product_id], request)
 
             return await self.updated_product_response(product_id, session)
         except:
@@ -858,13 +665,29 @@ class ProductService:
 
         return product_dict
 
-    async def delete_product(self, product_id: str, session: AsyncSession):
+    async def delete_product(self, product_id: str, session: AsyncSession, request: Request = None):
         condition = and_(Product.id == product_id)
         product_delete = await product_repository.delete_product(condition, session)
+
+        await product_card_repository.refresh_product_cards([product_id], session)
+        await session.commit()
+        unindex_products([product_id])
+
+        if request is not None:
+            await invalidate_product_detail_cache([product_id], request)
+
         return product_delete
 
-    async def delete_multiple_product(self, data: DeleteMultipleProductModel, session: AsyncSession):
+    async def delete_multiple_product(self, data: DeleteMultipleProductModel, session: AsyncSession, request: Request = None):
         product_ids = await product_repository.delete_multiple_product(data, session)
+
+        await product_card_repository.refresh_product_cards(product_ids, session)
+        await session.commit()
+        unindex_products(product_ids)
+
+        if request is not None:
+            await invalidate_product_detail_cache(product_ids, request)
+
         return product_ids
 
     async def count_all_products(self, session: AsyncSession):
@@ -876,29 +699,7 @@ class ProductService:
         return count_products[0]
 
     async def get_all_product_for_offer(self, categories_id: list, session: AsyncSession):
-        joins = [
-            selectinload(Product.categories).options(
-                noload(Categories.categories_product),
-                noload(Categories.products),
-                noload(Categories.children),
-                joinedload(Categories.parent).options(
-                    noload(Categories.categories_product),
-                    noload(Categories.products),
-                    noload(Categories.children),
-                    noload(Categories.parent)
-                )
-            ).load_only(
-                Categories.id,
-                Categories.name,
-                Categories.parent_id,
-                Categories.deleted_at
-            ),
-            noload(Product.product_variant),
-            noload(Product.order_detail),
-            noload(Product.evaluate),
-            noload(Product.categories_product),
-            noload(Product.special_offer)
-        ]
+        joins = loader_profile("product_card")
 
         conditions = [
             Product.deleted_at.is_(None),
@@ -0,0 +1,124 @@
+import asyncio
+import bisect
+import logging
+import unicodedata
+from sqlalchemy.orm import sessionmaker
+from src.config import Config
+from src.crud.product.repositories import ProductRepository
+from src.crud.categories.repositories import CategoriesRepository
+
+# Số khoá tối đa duyệt cho 1 tiền tố, tránh quét cả index với tiền tố 1 ký tự
+MAX_SCAN = 2000
+
+product_repository = ProductRepository()
+categories_repository = CategoriesRepository()
+
+
+def normalize_text(value: str) -> str:
+    value = value.replace("đ", "d").replace("Đ", "D")
+    decomposed = unicodedata.normalize("NFD", value)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.lower().split())
+
+
+class PrefixIndex:
+    def __init__(self):
+        # Mảng (khoá đã chuẩn hoá, mã entry) luôn được giữ có thứ tự để tìm bằng bisect
+        self.keys: list[tuple[str, str]] = []
+        self.entries: dict[str, dict] = {}
+        self.ready = False
+
+    @staticmethod
+    def _name_keys(name: str) -> list[str]:
+        # Mỗi từ trong tên đều là điểm bắt đầu: "áo thun nam" khớp cả "thun" và "nam"
+        words = normalize_text(name).split(" ")
+        return list(dict.fromkeys(" ".join(words[i:]) for i in range(len(words)) if words[i]))
+
+    def upsert(self, kind: str, entry_id: str, name: str, score: int) -> None:
+        entry_key = f"{kind}:{entry_id}"
+        self.remove(kind, entry_id)
+
+        keys = self._name_keys(name)
+        self.entries[entry_key] = {"type": kind, "id": entry_id, "name": name, "score": score or 0, "keys": keys}
+        for key in keys:
+            bisect.insort(self.keys, (key, entry_key))
+
+    def remove(self, kind: str, entry_id: str) -> None:
+        entry_key = f"{kind}:{entry_id}"
+        entry = self.entries.pop(entry_key, None)
+        if entry is None:
+            return
+
+        for key in entry["keys"]:
+            index = bisect.bisect_left(self.keys, (key, entry_key))
+            if index < len(self.keys) and self.keys[index] == (key, entry_key):
+                del self.keys[index]
+
+    def rebuild(self, items: list[tuple[str, str, str, int]]) -> None:
+        keys, entries = [], {}
+        for kind, entry_id, name, score in items:
+            entry_key = f"{kind}:{entry_id}"
+            name_keys = self._name_keys(name)
+            entries[entry_key] = {"type": kind, "id": entry_id, "name": name, "score": score or 0, "keys": name_keys}
+            keys.extend((key, entry_key) for key in name_keys)
+
+        keys.sort()
+        self.keys, self.entries = keys, entries
+        self.ready = True
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[dict]:
+        prefix = normalize_text(prefix)
+        if not prefix:
+            return []
+
+        matched = set()
+        index = bisect.bisect_left(self.keys, (prefix, ""))
+        end = min(len(self.keys), index + MAX_SCAN)
+        while index < end and self.keys[index][0].startswith(prefix):
+            matched.add(self.keys[index][1])
+            index += 1
+
+        entries = sorted((self.entries[key] for key in matched), key=lambda entry: (-entry["score"], entry["name"]))
+
+        return [
+            {"type": entry["type"], "id": entry["id"], "name": entry["name"]}
+            for entry in entries[:limit]
+        ]
+
+
+suggest_index = PrefixIndex()
+
+
+async def rebuild_suggest_index(session_maker: sessionmaker) -> None:
+    async with session_maker() as session:
+        products = await product_repository.get_suggest_products(session)
+        categories = await categories_repository.get_suggest_categories(session)
+
+    items = [("product", str(row.id), row.name, row.popularity_score) for row in products]
+    items += [("category", str(row.id), row.name, row.popularity_score) for row in categories]
+    suggest_index.rebuild(items)
+
+
+async def sync_suggest_index(session_maker: sessionmaker) -> None:
+    # Mỗi worker tự cập nhật index khi chính nó ghi sản phẩm, dựng lại định kỳ để nhận thay đổi từ worker khác
+    while True:
+        try:
+            await rebuild_suggest_index(session_maker)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.warning(f"Suggest index rebuild failed: {str(e)}")
+
+        await asyncio.sleep(Config.SUGGEST_REBUILD_INTERVAL)
+
+
+def index_product(product) -> None:
+    if product.deleted_at is None and product.status == "active":
+        suggest_index.upsert("product", str(product.id), product.name, product.popularity_score)
+    else:
+        suggest_index.remove("product", str(product.id))
+
+
+def unindex_products(product_ids: list) -> None:
+    for product_id in product_ids:
+        suggest_index.remove("product", str(product_id))
@@ -0,0 +1,41 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any
+
+from src.errors.product import ProductException
+from src.schemas.product import SortBy
+
+
+# Cursor phân trang dạng keyset: mã hóa giá trị sort của dòng cuối cùng + id
+def encode_product_cursor(sort_by: SortBy | None, sort_key: Any, product_id) -> str:
+    if isinstance(sort_key, datetime):
+        sort_key = sort_key.isoformat()
+
+    payload = {
+        "s": (sort_by or SortBy.newest).value,
+        "k": sort_key,
+        "id": str(product_id),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_product_cursor(cursor: str, sort_by: SortBy | None) -> tuple[Any, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+        if payload["s"] != (sort_by or SortBy.newest).value:
+            ProductException.invalid_cursor()
+
+        sort_key = payload["k"]
+        if payload["s"] == SortBy.newest.value and isinstance(sort_key, str):
+            sort_key = datetime.fromisoformat(sort_key)
+
+        return sort_key, uuid.UUID(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        ProductException.invalid_cursor()
+
@@ -0,0 +1,211 @@
+from typing import Optional, List
+from sqlalchemy import ColumnElement
+from sqlalchemy import select, func, and_, desc, asc, tuple_, cast, literal_column, literal, true, case, union_all, Integer
+from sqlalchemy.dialects.postgresql import insert, ARRAY, UUID, VARCHAR, JSONB
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.crud.special_offer.utils import active_offer_condition
+from src.database.models import Product_Card, Product, Product_Variant, Categories, Categories_Product, Special_Offer, \
+    Color
+
+card_columns = [column for column in Product_Card.__table__.c if column.name not in ("search_vector", "refreshed_at")]
+
+
+class ProductCardRepository:
+    async def get_all_product_card(self, conditions: List[Optional[ColumnElement[bool]]], session: AsyncSession,
+                                   skip: int = 0, limit: int = 10, order_by_clause=None, with_total: bool = True):
+        total = None
+        if with_total:
+            count_stmt = select(func.count()).select_from(Product_Card).where(*conditions)
+            total_result = await session.exec(count_stmt)
+            total = total_result.scalar_one()
+
+        # Đọc thẳng các cột, không dựng đối tượng ORM
+        statement = select(*card_columns).where(*conditions)
+        if order_by_clause is not None:
+            statement = statement.order_by(order_by_clause, desc(Product_Card.product_id))
+
+        result = await session.exec(statement.offset(skip).limit(limit))
+
+        return result.all(), total
+
+    async def get_all_product_card_by_keyset(self, conditions: List[Optional[ColumnElement[bool]]], session: AsyncSession,
+                                             sort_expr, descending: bool, after: tuple = None, limit: int = 10,
+                                             with_total: bool = False):
+        total = None
+        if with_total:
+            count_stmt = select(func.count()).select_from(Product_Card).where(*conditions)
+            total_result = await session.exec(count_stmt)
+            total = total_result.scalar_one()
+
+        statement = select(*card_columns, sort_expr.label("sort_key")).where(*conditions)
+
+        if after is not None:
+            row_key = tuple_(sort_expr, Product_Card.product_id)
+            after_key = tuple_(*after, types=[sort_expr.type, Product_Card.product_id.type])
+            statement = statement.where(row_key < after_key if descending else row_key > after_key)
+
+        if descending:
+            statement = statement.order_by(desc(sort_expr), desc(Product_Card.product_id))
+        else:
+            statement = statement.order_by(asc(sort_expr), asc(Product_Card.product_id))
+
+        # Lấy dư 1 dòng để biết còn trang kế tiếp hay không
+        result = await session.exec(statement.limit(limit + 1))
+        rows = result.all()
+
+        return rows[:limit], len(rows) > limit, total
+
+
+    async def get_facet_counts(self, conditions: List[Optional[ColumnElement[bool]]], facet_filters: dict,
+                               price_bounds: list, session: AsyncSession):
+        # Mỗi dòng mang cờ "khớp" cho từng facet, facet nào cũng đếm theo mọi bộ lọc trừ chính nó
+        match_columns = [
+            (condition if condition is not None else true()).label(f"match_{name}")
+            for name, condition in facet_filters.items()
+        ]
+        base = (
+            select(Product_Card.colors, Product_Card.sizes, Product_Card.min_price, Product_Card.avg_rating, *match_columns)
+            .where(*conditions)
+            .cte("facet_base")
+        )
+
+        def other_matches(name: str):
+            return and_(*(base.c[f"match_{other}"] for other in facet_filters if other != name))
+
+        colors = select(func.unnest(base.c.colors).label("value")).where(other_matches("colors")).subquery()
+        sizes = select(func.unnest(base.c.sizes).label("value")).where(other_matches("sizes")).subquery()
+        price_bucket = case(
+            *[(base.c.min_price < bound, index) for index, bound in enumerate(price_bounds)],
+            else_=len(price_bounds)
+        )
+        rating_bucket = cast(func.floor(base.c.avg_rating), Integer)
+
+        statement = union_all(
+            select(literal("colors").label("facet"), colors.c.value, func.count().label("total"))
+            .group_by(colors.c.value),
+            select(literal("sizes").label("facet"), sizes.c.value, func.count().label("total"))
+            .group_by(sizes.c.value),
+            select(literal("price").label("facet"), cast(price_bucket, VARCHAR).label("value"), func.count().label("total"))
+            .where(other_matches("price"))
+            .group_by(price_bucket),
+            select(literal("rating").label("facet"), cast(rating_bucket, VARCHAR).label("value"), func.count().label("total"))
+            .where(other_matches("rating"))
+            .group_by(rating_bucket),
+        )
+        result = await session.exec(statement)
+
+        return result.all()
+
+
+    async def refresh_product_cards(self, product_ids: list, session: AsyncSession):
+        if not product_ids:
+            return []
+
+        return await self._refresh_where(Product.id.in_(product_ids), session)
+
+    async def refresh_product_cards_by_categories(self, category_ids: list, session: AsyncSession):
+        if not category_ids:
+            return []
+
+        product_ids = select(Categories_Product.product_id).where(Categories_Product.categories_id.in_(category_ids))
+        return await self._refresh_where(Product.id.in_(product_ids), session)
+
+    async def refresh_product_cards_by_colors(self, color_ids: list, session: AsyncSession):
+        if not color_ids:
+            return []
+
+        product_ids = select(Product_Variant.product_id).where(Product_Variant.color_id.in_(color_ids))
+        return await self._refresh_where(Product.id.in_(product_ids), session)
+
+    async def _refresh_where(self, condition: ColumnElement[bool], session: AsyncSession):
+        # Đẩy các thay đổi ORM còn chờ xuống DB trước khi đọc lại
+        await session.flush()
+
+        active_variant = and_(Product_Variant.product_id == Product.id, Product_Variant.deleted_at.is_(None))
+        active_category = and_(Categories_Product.product_id == Product.id, Categories.deleted_at.is_(None))
+        empty_uuid_array = cast(literal_column("'{}'"), ARRAY(UUID))
+        empty_varchar_array = cast(literal_column("'{}'"), ARRAY(VARCHAR))
+
+        variant_count = select(func.count(Product_Variant.id)).where(active_variant).scalar_subquery()
+        # Variant chọn màu có sẵn chỉ lưu color_id, lấy tên từ bảng color
+        color_name = func.coalesce(Product_Variant.color_name, Color.name)
+        colors = (
+            select(func.array_agg(func.distinct(color_name)))
+            .select_from(Product_Variant)
+            .outerjoin(Color, Color.id == Product_Variant.color_id)
+            .where(active_variant, color_name.isnot(None))
+            .scalar_subquery()
+        )
+        sizes = (
+            select(func.array_agg(func.distinct(Product_Variant.size)))
+            .where(active_variant, Product_Variant.size.isnot(None))
+            .scalar_subquery()
+        )
+        categories = (
+            select(func.jsonb_agg(
+                func.jsonb_build_object(
+                    "id", Categories.id,
+                    "name", Categories.name,
+                    "parent_id", Categories.parent_id
+                )
+            ))
+            .select_from(Categories_Product)
+            .join(Categories, Categories.id == Categories_Product.categories_id)
+            .where(active_category)
+            .scalar_subquery()
+        )
+        category_ids = (
+            select(func.array_agg(Categories.id))
+            .select_from(Categories_Product)
+            .join(Categories, Categories.id == Categories_Product.categories_id)
+            .where(active_category)
+            .scalar_subquery()
+        )
+        search_vector = (
+            func.setweight(func.to_tsvector("simple", func.f_unaccent(Product.name)), literal_column("'A'"))
+            .op("||")(func.setweight(
+                func.to_tsvector("simple", func.f_unaccent(func.coalesce(Product.description, ""))),
+                literal_column("'B'")
+            ))
+        )
+
+        source = (
+            select(
+                Product.id,
+                Product.name,
+                Product.images,
+                Product.status,
+                Product.min_price,
+                Product.max_price,
+                Product.discounted_min_price,
+                Product.total_sold,
+                Product.avg_rating,
+                variant_count,
+                Special_Offer.name,
+                func.coalesce(Special_Offer.discount, 0),
+                func.coalesce(categories, cast(literal_column("'[]'"), JSONB)),
+                func.coalesce(category_ids, empty_uuid_array),
+                func.coalesce(colors, empty_varchar_array),
+                func.coalesce(sizes, empty_varchar_array),
+                Product.created_at,
+                Product.deleted_at,
+                search_vector,
+                func.now()
+            )
+            .select_from(Product)
+            .outerjoin(Special_Offer, and_(Special_Offer.id == Product.special_offer_id, active_offer_condition()))
+            .where(condition)
+        )
+
+        # Upsert toàn bộ thẻ bị ảnh hưởng bằng 1 câu INSERT ... SELECT
+        stmt = insert(Product_Card).from_select(
+            [*card_columns, Product_Card.search_vector, Product_Card.refreshed_at], source
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Product_Card.product_id],
+            set_={column.name: stmt.excluded[column.name] for column in Product_Card.__table__.c if column.name != "product_id"}
+        ).returning(Product_Card.product_id)
+        result = await session.exec(stmt)
+
+        # Trả về các sản phẩm vừa làm mới để bên gọi xoá cache trang chi tiết
+        return [row[0] for row in result.all()]
@@ -1,5 +1,7 @@
 from typing import Optional
-from sqlalchemy import ColumnElement
+from uuid import UUID
+from sqlalchemy import ColumnElement, Integer, column, values
+from sqlalchemy.dialects import postgresql as pg
 from sqlalchemy.orm import noload
 
 from src.database.models import Product_Variant
@@ -49,12 +51,12 @@ class ProductVariantRepository:
 
 
     async def get_all_product_variant(self, conditions: Optional[ColumnElement[bool]], session: AsyncSession, joins: list = None):
+        # Có joins thì để joins quyết định cách nạp product: noload + selectinload cùng 1 quan hệ sẽ bị SQLAlchemy báo xung đột
         statement = select(Product_Variant).options(
             noload(Product_Variant.order_detail),
-            noload(Product_Variant.product),
             noload(Product_Variant.evaluate),
             noload(Product_Variant.color),
-            *joins if joins else []
+            *joins if joins else [noload(Product_Variant.product)]
         )
 
         if conditions is not None:
@@ -88,6 +90,59 @@ class ProductVariantRepository:
         await session.exec(statement)
 
 
+    async def reserve_stock(self, quantities: dict[UUID, int], session: AsyncSession):
+        if not quantities:
+            return set()
+
+        variant_ids = sorted(quantities.keys())
+
+        # Khóa các dòng theo thứ tự id để 2 đơn cùng mua nhiều variant không deadlock.
+        # FOR NO KEY UPDATE (key_share) vì order_detail vừa insert đã giữ FOR KEY SHARE qua khoá ngoại:
+        # FOR UPDATE xung đột với khoá đó nên 2 đơn cùng variant sẽ chờ lẫn nhau
+        lock_stmt = (
+            select(Product_Variant.id)
+            .where(Product_Variant.id.in_(variant_ids))
+            .order_by(Product_Variant.id)
+            .with_for_update(key_share=True)
+        )
+        await session.exec(lock_stmt)
+
+        requested = values(
+            column("id", pg.UUID(as_uuid=True)),
+            column("quantity", Integer),
+            name="requested"
+        ).data([(variant_id, quantities[variant_id]) for variant_id in variant_ids])
+
+        # Trừ kho có điều kiện cho tất cả dòng trong 1 câu lệnh
+        stmt = (
+            update(Product_Variant)
+            .where(
+                Product_Variant.id == requested.c.id,
+                Product_Variant.deleted_at.is_(None),
+                Product_Variant.quantity >= requested.c.quantity
+            )
+            .values(
+                quantity=Product_Variant.quantity - requested.c.quantity,
+                updated_at=datetime.now()
+            )
+            .returning(Product_Variant.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(stmt)
+
+        return {row[0] for row in result.all()}
+
+
+    async def get_variant_quantities(self, product_id, session: AsyncSession):
+        statement = select(Product_Variant.id, Product_Variant.quantity).where(
+            Product_Variant.product_id == product_id,
+            Product_Variant.deleted_at.is_(None)
+        )
+        result = await session.exec(statement)
+
+        return {str(variant_id): quantity for variant_id, quantity in result.all()}
+
+
     async def delete_product_variant(self, condition: Optional[ColumnElement[bool]], session: AsyncSession):
         product_variant_delete = await self.get_product_variant(condition, session)
 
@@ -3,16 +3,20 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import and_, case
 from sqlalchemy import literal, text
 from src.crud.product_variant.repositories import ProductVariantRepository
+from src.crud.product.repositories import ProductRepository
 from src.database.models import Product_Variant
 from uuid import UUID
 
 from src.errors.color import ColorException
+from src.database.redis import invalidate_product_detail_cache
+from fastapi import Request
 
 product_variant_repository = ProductVariantRepository()
+product_repository = ProductRepository()
 
 
 class ProductVariantService:
-    async def update_product_variant(self, product_id: str, new_variants: list, session: AsyncSession):
+    async def update_product_variant(self, product_id: str, new_variants: list, session: AsyncSession, request: Request = None):
         condition = and_(Product_Variant.product_id == product_id)
         existing_variants = await product_variant_repository.get_all_product_variant(condition, session)
 
@@ -72,8 +76,13 @@ class ProductVariantService:
         if to_create:
             await self._bulk_create_variants(to_create, product_id, session)
 
+        await product_repository.refresh_price_aggregates([product_id], session)
+
         await session.commit()
 
+        if request is not None:
+            await invalidate_product_detail_cache([product_id], request)
+
     async def _bulk_update_variants(self, update_data: dict[UUID, dict], session: AsyncSession):
         ids = list(update_data.keys())
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, status, Depends, Query
+from fastapi import APIRouter, status, Depends, Query, Request
 from typing import List
 from src.crud.size.services import SizeService
 from src.dependencies import AccessTokenBearer
@@ -6,6 +6,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from src.database.main import get_session
 from fastapi.responses import JSONResponse
 from src.dependencies import admin_role_middleware
+from src.http_cache import http_cache
 
 size_admin_router = APIRouter(prefix="/size")
 size_customer_router = APIRouter(prefix="/size")
@@ -14,10 +15,12 @@ size_common_router = APIRouter(prefix="/size")
 size_service = SizeService()
 access_token_bearer = AccessTokenBearer()
 
-@size_admin_router.get("/", status_code=status.HTTP_200_OK, dependencies=[Depends(admin_role_middleware)])
-async def get_all_size_by_type_size(type_sizes: List[str] = Query(...), token_details: dict = Depends(access_token_bearer),
+@size_admin_router.get("/", status_code=status.HTTP_200_OK,
+                       dependencies=[Depends(admin_role_middleware), Depends(http_cache(max_age=0, private=True))])
+async def get_all_size_by_type_size(request: Request, type_sizes: List[str] = Query(...),
+                                    token_details: dict = Depends(access_token_bearer),
                                     session: AsyncSession = Depends(get_session)):
-    sizes_dict = await size_service.get_all_size_by_type_size(type_sizes, session)
+    sizes_dict = await size_service.get_all_size_by_type_size(type_sizes, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -28,6 +31,15 @@ async def get_all_size_by_type_size(type_sizes: List[str] = Query(...), token_de
     )
 
 
+@size_admin_router.delete("/cache", status_code=status.HTTP_200_OK, dependencies=[Depends(admin_role_middleware)])
+async def invalidate_size_cache(request: Request, token_details: dict = Depends(access_token_bearer)):
+    # Bảng size được nạp trực tiếp vào DB nên cần làm mới cache thủ công sau khi sửa dữ liệu
+    await size_service.invalidate_size_cache(request)
 
-
-
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Làm mới dữ liệu size thành công",
+            "content": {}
+        }
+    )
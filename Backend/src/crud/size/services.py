@@ -1,39 +1,40 @@
 from src.crud.size.repositories import SizeRepository
 from src.database.models import Color, Size
+from src.database.reference import ReferenceDataCache
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import and_
 from typing import List
+from fastapi import Request
 
 size_repository = SizeRepository()
 
 
-class SizeService:
-    async def get_all_size(self, session: AsyncSession):
-        sizes = await size_repository.get_all_size(None, session)
+async def load_sizes(session: AsyncSession):
+    sizes = await size_repository.get_all_size(None, session)
+
+    return [
+        {
+            "id": str(size.id),
+            "name": size.name,
+            "type": size.type,
+        }
+        for size in sizes
+    ]
+
 
-        response = []
-        for size in sizes:
-            response.append({
-                "id": str(size.id),
-                "name": size.name,
-                "type": size.type,
-            })
+size_cache = ReferenceDataCache("size", load_sizes)
 
-        return response
 
-    async def get_all_size_by_type_size(self, type_sizes: List[str], session: AsyncSession):
-        condition = and_(Size.type.in_(type_sizes))
-        sizes = await size_repository.get_all_size(condition, session)
+class SizeService:
+    async def get_all_size(self, session: AsyncSession, request: Request = None):
+        sizes = await size_cache.get(session, request)
 
-        response = []
-        for size in sizes:
-            response.append({
-                "id": str(size.id),
-                "name": size.name,
-                "type": size.type,
-            })
+        return [dict(size) for size in sizes]
 
-        return response
+    async def get_all_size_by_type_size(self, type_sizes: List[str], session: AsyncSession, request: Request = None):
+        sizes = await size_cache.get(session, request)
+
+        return [dict(size) for size in sizes if size["type"] in type_sizes]
 
     async def get_size(self, type_size: str, session: AsyncSession):
         condition = and_(Size.type_size == type_size)
@@ -44,3 +45,6 @@ class SizeService:
             "name": size.name,
             "type": size.type,
         }
+
+    async def invalidate_size_cache(self, request: Request = None):
+        await size_cache.invalidate(request)
@@ -1,8 +1,10 @@
 from typing import Optional, List
-from sqlalchemy import ColumnElement
+from uuid import UUID
+from sqlalchemy import ColumnElement, Integer, column, values
+from sqlalchemy.dialects import postgresql as pg
 from src.database.models import Special_Offer
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, desc, and_, func
+from sqlmodel import select, desc, and_, func, update
 from sqlalchemy.orm import noload
 from datetime import datetime
 import time
@@ -59,6 +61,42 @@ class SpecialOfferRepository:
         return data_need_update
 
 
+    async def consume_special_offers(self, quantities: dict[UUID, int], session: AsyncSession):
+        if not quantities:
+            return set()
+
+        offer_ids = sorted(quantities.keys())
+        requested = values(
+            column("id", pg.UUID(as_uuid=True)),
+            column("quantity", Integer),
+            name="requested"
+        ).data([(offer_id, quantities[offer_id]) for offer_id in offer_ids])
+
+        # Cộng used_quantity cho mọi voucher trong 1 câu lệnh, chỉ khi còn đủ lượt
+        used_quantity = func.coalesce(Special_Offer.used_quantity, 0)
+        stmt = (
+            update(Special_Offer)
+            .where(
+                Special_Offer.id == requested.c.id,
+                Special_Offer.deleted_at.is_(None),
+                Special_Offer.total_quantity - used_quantity >= requested.c.quantity
+            )
+            .values(used_quantity=used_quantity + requested.c.quantity)
+            .returning(Special_Offer.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(stmt)
+
+        return {row[0] for row in result.all()}
+
+
+    async def get_special_offer_codes(self, offer_ids: list, session: AsyncSession):
+        statement = select(Special_Offer.code).where(Special_Offer.id.in_(offer_ids))
+        result = await session.exec(statement)
+
+        return list(result.all())
+
+
     async def delete_special_offer(self, condition: Optional[ColumnElement[bool]], session: AsyncSession):
         special_offer_to_delete = await self.get_special_offer(condition, session)
 
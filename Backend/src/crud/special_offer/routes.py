@@ -1,4 +1,4 @@
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Request
 from src.crud.special_offer.services import SpecialOfferService
 from src.dependencies import AccessTokenBearer
 from src.schemas.special_offer import SpecialOfferCreateModel, SpecialOfferUpdateModel, SpecialOfferFilterModel, \
@@ -66,11 +66,11 @@ async def get_all_special_offer_admin(skip: int = 0, limit: int = 10,
 
 
 @special_offer_admin_router.post('/set-offer', dependencies=[Depends(admin_role_middleware)])
-async def set_offer_to_product(data: SetOfferToProduct,
+async def set_offer_to_product(data: SetOfferToProduct, request: Request,
                                session: AsyncSession = Depends(get_session),
                                token_details: dict = Depends(access_token_bearer)):
 
-    await special_offer_service.set_offer_to_product_service(data, session)
+    await special_offer_service.set_offer_to_product_service(data, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -110,9 +110,10 @@ async def get_all_special_offer_customer(session: AsyncSession = Depends(get_ses
 @special_offer_admin_router.put('/{id}', dependencies=[Depends(admin_role_middleware)])
 async def update_special_offer(id: str,
                                special_offer_update: SpecialOfferUpdateModel,
+                               request: Request,
                                token_details: dict = Depends(access_token_bearer),
                                session: AsyncSession = Depends(get_session)):
-    special_offer_update = await special_offer_service.update_special_offer_service(id, special_offer_update, session)
+    special_offer_update = await special_offer_service.update_special_offer_service(id, special_offer_update, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -124,9 +125,9 @@ async def update_special_offer(id: str,
 
 
 @special_offer_admin_router.delete('/{id}', dependencies=[Depends(admin_role_middleware)])
-async def delete_categories(id: str, token_details: dict = Depends(access_token_bearer),
+async def delete_categories(id: str, request: Request, token_details: dict = Depends(access_token_bearer),
                             session: AsyncSession = Depends(get_session)):
-    special_offer_delete = await special_offer_service.delete_categories_service(id, session)
+    special_offer_delete = await special_offer_service.delete_categories_service(id, session, request)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -1,4 +1,5 @@
 from src.crud.product.repositories import ProductRepository
+from src.crud.product_card.repositories import ProductCardRepository
 from src.database.models import Special_Offer, Product
 from src.errors.special_offer import SpecialOfferException
 from src.schemas.special_offer import SpecialOfferCreateModel, SpecialOfferUpdateModel, SpecialOfferFilterModel, \
@@ -9,9 +10,12 @@ from src.crud.special_offer.repositories import SpecialOfferRepository
 from datetime import datetime
 from typing import Any
 from sqlalchemy.orm import noload
+from fastapi import Request
+from src.database.redis import invalidate_product_detail_cache
 
 special_offer_repository = SpecialOfferRepository()
 product_repository = ProductRepository()
+product_card_repository = ProductCardRepository()
 
 
 class SpecialOfferService:
@@ -110,7 +114,7 @@ class SpecialOfferService:
         }
 
     async def update_special_offer_service(self, id: str, special_offer_update: SpecialOfferUpdateModel,
-                                           session: AsyncSession):
+                                           session: AsyncSession, request: Request = None):
         condition = and_(Special_Offer.id == id)
         joins = [noload(Special_Offer.products)]
         special_offer = await special_offer_repository.get_special_offer(condition, session, joins)
@@ -160,6 +164,15 @@ class SpecialOfferService:
 
         await special_offer_repository.update_special_offer(special_offer, update_data, session)
 
+        product_ids = await product_repository.get_product_ids(Product.special_offer_id == special_offer.id, session)
+        if 'discount' in update_data or 'type' in update_data:
+            await product_repository.refresh_price_aggregates(product_ids, session)
+        await product_card_repository.refresh_product_cards(product_ids, session)
+        await session.commit()
+
+        if request is not None:
+            await invalidate_product_detail_cache(product_ids, request)
+
         def serialize(obj: Any):
             if isinstance(obj, datetime):
                 return obj.isoformat()
@@ -167,12 +180,22 @@ class SpecialOfferService:
 
         return {k: serialize(v) for k, v in update_data.items()}
 
-    async def delete_categories_service(self, id: str, session: AsyncSession):
+    async def delete_categories_service(self, id: str, session: AsyncSession, request: Request = None):
         condition = and_(Special_Offer.id == id)
-        return await special_offer_repository.delete_special_offer(condition, session)
+        deleted = await special_offer_repository.delete_special_offer(condition, session)
+
+        product_ids = await product_repository.get_product_ids(Product.special_offer_id == id, session)
+        await product_repository.refresh_price_aggregates(product_ids, session)
+        await product_card_repository.refresh_product_cards(product_ids, session)
+        await session.commit()
 
+        if request is not None:
+            await invalidate_product_detail_cache(product_ids, request)
 
-    async def set_offer_to_product_service(self, data: SetOfferToProduct, session: AsyncSession):
+        return deleted
+
+
+    async def set_offer_to_product_service(self, data: SetOfferToProduct, session: AsyncSession, request: Request = None):
         condition_offer = and_(Special_Offer.id == data.special_offer_id, Special_Offer.deleted_at.is_(None))
         joins_offer = [noload(Special_Offer.products)]
         special_offer = await special_offer_repository.get_special_offer(condition_offer, session, joins_offer)
@@ -192,3 +215,9 @@ class SpecialOfferService:
             {"special_offer_id": data.special_offer_id},
             session
         )
+        await product_repository.refresh_price_aggregates(data.product_id, session)
+        await product_card_repository.refresh_product_cards(data.product_id, session)
+        await session.commit()
+
+        if request is not None:
+            await invalidate_product_detail_cache(data.product_id, request)
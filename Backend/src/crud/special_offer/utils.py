@@ -0,0 +1,7 @@
+from src.database.models import Special_Offer
+
+
+# Voucher gắn trên sản phẩm chỉ được tính giá khi chưa bị xoá.
+# Danh sách (product / product_card), trang chi tiết và thanh toán đều dùng chung điều kiện này
+def active_offer_condition():
+    return Special_Offer.deleted_at.is_(None)
@@ -62,7 +62,7 @@ class UserRepository:
 
     async def create_user(self, user_data, session: AsyncSession):
         user_data_dict = user_data.model_dump()
-        user_data_dict['password'] = generate_password_hash(user_data_dict['password'])
+        user_data_dict['password'] = await generate_password_hash(user_data_dict['password'])
 
         new_user = User(
             **user_data_dict,
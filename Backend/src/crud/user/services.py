@@ -1,4 +1,4 @@
-from sqlalchemy.orm import noload
+from sqlalchemy.orm import noload, selectinload
 from starlette.responses import JSONResponse
 from src.database.models import User
 from src.errors.authentication import AuthException
@@ -20,7 +20,7 @@ user_repository = UserRepository()
 class UserService:
     async def get_detail_admin_service(self, id: str, session: AsyncSession):
         condition = and_(User.id == id)
-        user = await user_repository.get_user(condition, session=session)
+        user = await user_repository.get_user(condition, session=session, joins=[selectinload(User.address)])
 
         if not user:
             AuthException.user_not_found()
@@ -208,7 +208,7 @@ class UserService:
     async def change_password_service(self, id: str, password_data, session: AsyncSession):
         condition = and_(User.id == id)
         user = await user_repository.get_user(condition, session)
-        password_valid = verify_password(password_data.old_password, user.password)
+        password_valid = await verify_password(password_data.old_password, user.password)
 
         if not password_valid:
             AuthException.invalid_password()
@@ -225,7 +225,7 @@ class UserService:
         if not user:
             AuthException.user_not_found()
 
-        password_hash = generate_password_hash(new_password)
+        password_hash = await generate_password_hash(new_password)
         await user_repository.update_user(user, {'password': password_hash}, session)
         await session.commit()
 
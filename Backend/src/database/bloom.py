@@ -0,0 +1,75 @@
+import hashlib
+import math
+import time
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        # m = -n*ln(p) / (ln2)^2, k = m/n * ln2
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+
+        # Double hashing: vị trí thứ i = h1 + i*h2
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class JtiBlocklistFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filter = BloomFilter(capacity, error_rate)
+        # Chỉ tin bộ lọc sau lần đồng bộ đầu tiên từ Redis và khi pub/sub còn kết nối
+        self.ready = False
+        self.last_sync = None
+        self.started_at = time.monotonic()
+        self.stats = {"checks": 0, "redis_lookups": 0, "saved_lookups": 0}
+
+    def add(self, jti: str) -> None:
+        self.filter.add(jti)
+
+    def rebuild(self, jtis: list[str]) -> None:
+        new_filter = BloomFilter(max(self.capacity, len(jtis)), self.error_rate)
+        for jti in jtis:
+            new_filter.add(jti)
+
+        self.filter = new_filter
+        self.last_sync = time.time()
+        self.ready = True
+
+    def might_contain(self, jti: str) -> bool:
+        self.stats["checks"] += 1
+
+        if self.ready and jti not in self.filter:
+            self.stats["saved_lookups"] += 1
+            return False
+
+        self.stats["redis_lookups"] += 1
+        return True
+
+    def get_stats(self) -> dict:
+        elapsed = time.monotonic() - self.started_at
+        return {
+            **self.stats,
+            "ready": self.ready,
+            "items": self.filter.count,
+            "size_bits": self.filter.size,
+            "num_hashes": self.filter.num_hashes,
+            "last_sync": self.last_sync,
+            "saved_lookups_per_second": round(self.stats["saved_lookups"] / elapsed, 4) if elapsed else 0.0
+        }
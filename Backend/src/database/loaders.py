@@ -0,0 +1,115 @@
+from sqlalchemy.orm import selectinload, joinedload, contains_eager
+from src.crud.special_offer.utils import active_offer_condition
+from src.database.models import Product, Product_Variant, Categories, Categories_Product, Special_Offer, Color, \
+    Order, Order_Detail, User, Evaluate
+
+# Mọi relationship mặc định lazy='raise', mỗi truy vấn tự khai báo những gì cần load qua các profile dưới đây
+
+LOADER_PROFILES = {
+    # Thẻ sản phẩm trong danh sách: giá đã nằm trên product, chỉ cần danh mục
+    "product_card": (
+        selectinload(Product.categories).load_only(
+            Categories.id,
+            Categories.name,
+            Categories.parent_id,
+            Categories.deleted_at
+        ),
+    ),
+
+    "product_detail": (
+        selectinload(Product.categories_product).options(
+            joinedload(Categories_Product.categories).load_only(
+                Categories.id,
+                Categories.name,
+                Categories.parent_id,
+                Categories.deleted_at
+            )
+        ),
+        selectinload(Product.product_variant).options(
+            joinedload(Product_Variant.color).load_only(
+                Color.id,
+                Color.name,
+                Color.code
+            )
+        ).load_only(
+            Product_Variant.id,
+            Product_Variant.size,
+            Product_Variant.price,
+            Product_Variant.quantity,
+            Product_Variant.sku,
+            Product_Variant.color_name,
+            Product_Variant.color_code,
+            Product_Variant.deleted_at
+        ),
+        selectinload(Product.special_offer.and_(active_offer_condition())).load_only(
+            Special_Offer.id,
+            Special_Offer.discount,
+            Special_Offer.type
+        ),
+    ),
+
+    # Truy vấn danh sách đã join user để lọc, nạp luôn user từ chính join đó
+    "order_admin_list": (
+        contains_eager(Order.user).load_only(
+            User.id,
+            User.first_name,
+            User.last_name,
+            User.deleted_at
+        ),
+    ),
+
+    "order_admin_detail": (
+        selectinload(Order.order_detail).load_only(
+            Order_Detail.id,
+            Order_Detail.Product
+        ),
+        selectinload(Order.user).load_only(
+            User.id,
+            User.first_name,
+            User.last_name,
+            User.email,
+            User.phone
+        ),
+    ),
+
+    "order_customer_detail": (
+        selectinload(Order.order_detail).selectinload(Order_Detail.product).load_only(
+            Product.id,
+            Product.name,
+            Product.images
+        ),
+        selectinload(Order.order_detail).selectinload(Order_Detail.product_variant).selectinload(Product_Variant.color),
+        selectinload(Order.user),
+    ),
+
+    "evaluate_admin": (
+        joinedload(Evaluate.order_detail).joinedload(Order_Detail.order).load_only(
+            Order.code
+        ),
+        joinedload(Evaluate.user).load_only(
+            User.first_name,
+            User.last_name
+        ),
+        joinedload(Evaluate.product).load_only(
+            Product.name
+        ),
+        joinedload(Evaluate.product_variant).options(
+            joinedload(Product_Variant.color).load_only(
+                Color.name
+            )
+        ).load_only(
+            Product_Variant.color_name,
+            Product_Variant.size
+        ),
+    ),
+
+    "evaluate_public": (
+        selectinload(Evaluate.user),
+        selectinload(Evaluate.product),
+        selectinload(Evaluate.product_variant).selectinload(Product_Variant.color),
+    ),
+}
+
+
+def loader_profile(name: str) -> list:
+    return list(LOADER_PROFILES[name])
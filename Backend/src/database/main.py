@@ -3,8 +3,8 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 from src.config import Config
 from fastapi import Request
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import event
-import time
+from src.database.profiler import setup_query_profiler
+from src.database.query_budget import setup_query_budget
 
 engine: AsyncEngine = create_async_engine(
     url=Config.DATABASE_URL,
@@ -14,18 +14,8 @@ engine: AsyncEngine = create_async_engine(
     echo=False
 )
 
-def setup_query_logger(engine):
-    @event.listens_for(engine.sync_engine, "before_cursor_execute")
-    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-        context._query_start_time = time.time()
-        print(f"\n[SQL START] {statement}")
-
-    @event.listens_for(engine.sync_engine, "after_cursor_execute")
-    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-        total = time.time() - context._query_start_time
-        print(f"[SQL END] Took: {total:.4f} seconds")
-
-setup_query_logger(engine)
+setup_query_profiler(engine)
+setup_query_budget(engine)
 
 async def init_db():
     async with engine.begin() as conn:
@@ -1,9 +1,9 @@
 import uuid
 import sqlalchemy.dialects.postgresql as pg
 from sqlmodel import SQLModel, Field, Column, Relationship
-from datetime import datetime
+from datetime import datetime, date
 from typing import Optional, List
-from sqlalchemy import text, UniqueConstraint
+from sqlalchemy import text, UniqueConstraint, Index, ForeignKey
 from sqlalchemy.dialects.postgresql import JSONB
 
 
@@ -38,9 +38,9 @@ class User(SQLModel, table=True):
     expires_at: Optional[datetime] = Field(sa_column=Column(pg.TIMESTAMP, nullable=True))
 
 
-    address: List["Address"] = Relationship(back_populates="user", sa_relationship_kwargs={'lazy': 'selectin'})
-    order: List["Order"] = Relationship(back_populates="user", sa_relationship_kwargs={'lazy': 'selectin'})
-    evaluate: List["Evaluate"] = Relationship(back_populates="user", sa_relationship_kwargs={'lazy': 'selectin'})
+    address: List["Address"] = Relationship(back_populates="user", sa_relationship_kwargs={'lazy': 'raise'})
+    order: List["Order"] = Relationship(back_populates="user", sa_relationship_kwargs={'lazy': 'raise'})
+    evaluate: List["Evaluate"] = Relationship(back_populates="user", sa_relationship_kwargs={'lazy': 'raise'})
 
 
 class Address(SQLModel, table=True):
@@ -66,11 +66,17 @@ class Address(SQLModel, table=True):
     deleted_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=True))
     user_id: uuid.UUID = Field(foreign_key="user.id")
 
-    user: Optional["User"] = Relationship(back_populates="address", sa_relationship_kwargs={'lazy': 'selectin'})
+    user: Optional["User"] = Relationship(back_populates="address", sa_relationship_kwargs={'lazy': 'raise'})
 
 
 class Order(SQLModel, table=True):
     __tablename__ = 'order'
+    __table_args__ = (
+        Index('ix_order_status_created_at_id', 'status', 'created_at', 'id'),
+        Index('ix_order_created_at_id', 'created_at', 'id'),
+        Index('ix_order_total_price_id', 'total_price', 'id'),
+        Index('ix_order_user_id_created_at', 'user_id', 'created_at'),
+    )
 
     id: uuid.UUID = Field(
         sa_column=Column(
@@ -95,13 +101,81 @@ class Order(SQLModel, table=True):
     user_id: uuid.UUID = Field(foreign_key="user.id")
     Address: dict = Field(sa_column=Column(pg.JSONB, nullable=False))
 
-    user: Optional["User"] = Relationship(back_populates="order", sa_relationship_kwargs={'lazy': 'joined'})
+    user: Optional["User"] = Relationship(back_populates="order", sa_relationship_kwargs={'lazy': 'raise'})
     order_detail: List["Order_Detail"] = Relationship(back_populates="order",
-                                                      sa_relationship_kwargs={'lazy': 'selectin'})
+                                                      sa_relationship_kwargs={'lazy': 'raise'})
+
+
+# Tổng hợp đơn hàng theo ngày tạo + trạng thái, cập nhật dồn bởi OrderDailyStatsRepository
+class Order_Daily_Stats(SQLModel, table=True):
+    __tablename__ = 'order_daily_stats'
+
+    day: date = Field(sa_column=Column(pg.DATE, nullable=False, primary_key=True))
+    status: str = Field(sa_column=Column(pg.VARCHAR, nullable=False, primary_key=True))
+    # Mỗi (ngày, trạng thái) chia thành nhiều slot để các checkout đồng thời không tranh nhau 1 dòng, đọc thì SUM
+    slot: int = Field(sa_column=Column(pg.SMALLINT, nullable=False, primary_key=True, server_default="0"), default=0)
+    orders: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    sub_total: int = Field(sa_column=Column(pg.BIGINT, nullable=False, server_default="0"), default=0)
+    total_price: int = Field(sa_column=Column(pg.BIGINT, nullable=False, server_default="0"), default=0)
+    discount: int = Field(sa_column=Column(pg.BIGINT, nullable=False, server_default="0"), default=0)
+    items: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    updated_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=False, server_default=text("CURRENT_TIMESTAMP")), default=datetime.now)
+
+
+# Doanh số theo ngày tạo đơn + trạng thái đơn + sản phẩm, cập nhật cùng Order_Daily_Stats
+class Product_Daily_Sales(SQLModel, table=True):
+    __tablename__ = 'product_daily_sales'
+    __table_args__ = (
+        Index('ix_product_daily_sales_product_id_day', 'product_id', 'day'),
+    )
+
+    day: date = Field(sa_column=Column(pg.DATE, nullable=False, primary_key=True))
+    status: str = Field(sa_column=Column(pg.VARCHAR, nullable=False, primary_key=True))
+    product_id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID,
+            ForeignKey("product.id", ondelete="CASCADE"),
+            nullable=False,
+            primary_key=True
+        )
+    )
+    # Chia slot như order_daily_stats: các checkout cùng sản phẩm (khác variant) không tranh nhau 1 dòng
+    slot: int = Field(sa_column=Column(pg.SMALLINT, nullable=False, primary_key=True, server_default="0"), default=0)
+    quantity: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    # Tổng price * quantity của order_detail (giá sau giảm theo sản phẩm, chưa trừ giảm giá cấp đơn hàng)
+    revenue: int = Field(sa_column=Column(pg.BIGINT, nullable=False, server_default="0"), default=0)
+    updated_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=False, server_default=text("CURRENT_TIMESTAMP")), default=datetime.now)
+
+
+# Như Product_Daily_Sales nhưng gộp theo tháng (ngày đầu tháng), để top sản phẩm / danh mục khoảng dài đọc ít dòng
+class Product_Monthly_Sales(SQLModel, table=True):
+    __tablename__ = 'product_monthly_sales'
+    __table_args__ = (
+        Index('ix_product_monthly_sales_product_id_month', 'product_id', 'month'),
+    )
+
+    month: date = Field(sa_column=Column(pg.DATE, nullable=False, primary_key=True))
+    status: str = Field(sa_column=Column(pg.VARCHAR, nullable=False, primary_key=True))
+    product_id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID,
+            ForeignKey("product.id", ondelete="CASCADE"),
+            nullable=False,
+            primary_key=True
+        )
+    )
+    slot: int = Field(sa_column=Column(pg.SMALLINT, nullable=False, primary_key=True, server_default="0"), default=0)
+    quantity: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    revenue: int = Field(sa_column=Column(pg.BIGINT, nullable=False, server_default="0"), default=0)
+    updated_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=False, server_default=text("CURRENT_TIMESTAMP")), default=datetime.now)
 
 
 class Order_Detail(SQLModel, table=True):
     __tablename__ = 'order_detail'
+    __table_args__ = (
+        # Rollup thống kê và chi tiết đơn đều tra order_detail theo order_id
+        Index('ix_order_detail_order_id', 'order_id'),
+    )
 
     id: uuid.UUID = Field(
         sa_column=Column(
@@ -122,10 +196,10 @@ class Order_Detail(SQLModel, table=True):
     updated_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=True))
     deleted_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=True))
 
-    product: Optional["Product"] = Relationship(back_populates="order_detail", sa_relationship_kwargs={'lazy': 'joined'})
-    product_variant: Optional["Product_Variant"] = Relationship(back_populates="order_detail", sa_relationship_kwargs={'lazy': 'joined'})
-    order: Optional["Order"] = Relationship(back_populates="order_detail", sa_relationship_kwargs={'lazy': 'joined'})
-    evaluate: Optional["Evaluate"] = Relationship(back_populates="order_detail", sa_relationship_kwargs={'lazy': 'joined', "uselist": False})
+    product: Optional["Product"] = Relationship(back_populates="order_detail", sa_relationship_kwargs={'lazy': 'raise'})
+    product_variant: Optional["Product_Variant"] = Relationship(back_populates="order_detail", sa_relationship_kwargs={'lazy': 'raise'})
+    order: Optional["Order"] = Relationship(back_populates="order_detail", sa_relationship_kwargs={'lazy': 'raise'})
+    evaluate: Optional["Evaluate"] = Relationship(back_populates="order_detail", sa_relationship_kwargs={'lazy': 'raise', "uselist": False})
 
 
 class Categories_Product(SQLModel, table=True):
@@ -147,13 +221,21 @@ class Categories_Product(SQLModel, table=True):
     deleted_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=True))
 
     categories: Optional["Categories"] = Relationship(back_populates="categories_product",
-                                                                  sa_relationship_kwargs={'lazy': 'joined'})
+                                                                  sa_relationship_kwargs={'lazy': 'raise'})
     product: Optional["Product"] = Relationship(back_populates="categories_product",
-                                                sa_relationship_kwargs={'lazy': 'joined'})
+                                                sa_relationship_kwargs={'lazy': 'raise'})
 
 
 class Product(SQLModel, table=True):
     __tablename__ = 'product'
+    __table_args__ = (
+        Index('ix_product_created_at_id', 'created_at', 'id'),
+        Index('ix_product_name_id', 'name', 'id'),
+        Index('ix_product_min_price_id', 'min_price', 'id'),
+        Index('ix_product_max_price', 'max_price'),
+        Index('ix_product_discounted_min_price_id', 'discounted_min_price', 'id'),
+        Index('ix_product_total_sold_id', 'total_sold', 'id'),
+    )
 
     id: uuid.UUID = Field(
         sa_column=Column(
@@ -170,18 +252,78 @@ class Product(SQLModel, table=True):
     popularity_score: Optional[int] = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
     total_sold: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"),default=0)
     avg_rating: Optional[float] = Field(sa_column=Column(pg.FLOAT, nullable=False, server_default="0"), default=0.0)
+    # Bộ đếm đánh giá còn hiệu lực, cập nhật bởi ProductRepository.update_rating_counters
+    rating_count: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    rating_sum: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    rating_1: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    rating_2: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    rating_3: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    rating_4: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    rating_5: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    # Giá tổng hợp từ các variant còn hoạt động, cập nhật bởi ProductRepository.refresh_price_aggregates
+    min_price: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    max_price: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    discounted_min_price: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
     status: str = Field(sa_column=Column(pg.VARCHAR, nullable=False, server_default="active"), default="active")
     special_offer_id: Optional[uuid.UUID] = Field(foreign_key="special_offer.id", default=None, nullable=True)
     created_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=False, server_default=text("CURRENT_TIMESTAMP")), default=datetime.now)
     updated_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=True))
     deleted_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=True))
 
-    order_detail: List["Order_Detail"] = Relationship(back_populates="product", sa_relationship_kwargs={'lazy': 'selectin'})
-    categories_product: List["Categories_Product"] = Relationship(back_populates="product", sa_relationship_kwargs={'lazy': 'selectin'})
-    product_variant: List["Product_Variant"] = Relationship(back_populates="product", sa_relationship_kwargs={'lazy': 'selectin'})
-    evaluate: List["Evaluate"] = Relationship(back_populates="product", sa_relationship_kwargs={'lazy': 'selectin'})
-    categories: List["Categories"] = Relationship(back_populates="products", link_model=Categories_Product, sa_relationship_kwargs={'lazy': 'selectin'})
-    special_offer: Optional["Special_Offer"] = Relationship(back_populates="products", sa_relationship_kwargs={'lazy': 'selectin'})
+    order_detail: List["Order_Detail"] = Relationship(back_populates="product", sa_relationship_kwargs={'lazy': 'raise'})
+    categories_product: List["Categories_Product"] = Relationship(back_populates="product", sa_relationship_kwargs={'lazy': 'raise'})
+    product_variant: List["Product_Variant"] = Relationship(back_populates="product", sa_relationship_kwargs={'lazy': 'raise'})
+    evaluate: List["Evaluate"] = Relationship(back_populates="product", sa_relationship_kwargs={'lazy': 'raise'})
+    categories: List["Categories"] = Relationship(back_populates="products", link_model=Categories_Product, sa_relationship_kwargs={'lazy': 'raise'})
+    special_offer: Optional["Special_Offer"] = Relationship(back_populates="products", sa_relationship_kwargs={'lazy': 'raise'})
+
+
+# Bản chiếu phẳng của thẻ sản phẩm cho các trang danh sách, làm mới bởi ProductCardRepository.refresh_product_cards
+class Product_Card(SQLModel, table=True):
+    __tablename__ = 'product_card'
+    __table_args__ = (
+        Index('ix_product_card_created_at_id', 'created_at', 'product_id'),
+        Index('ix_product_card_name_id', 'name', 'product_id'),
+        Index('ix_product_card_min_price_id', 'min_price', 'product_id'),
+        Index('ix_product_card_total_sold_id', 'total_sold', 'product_id'),
+        Index('ix_product_card_offer_discount_id', 'offer_discount', 'product_id'),
+        Index('ix_product_card_category_ids', 'category_ids', postgresql_using='gin'),
+        Index('ix_product_card_colors', 'colors', postgresql_using='gin'),
+        Index('ix_product_card_sizes', 'sizes', postgresql_using='gin'),
+        Index('ix_product_card_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_product_card_name_trgm', text('f_unaccent(lower(name)) gin_trgm_ops'), postgresql_using='gin'),
+    )
+
+    product_id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID,
+            ForeignKey("product.id", ondelete="CASCADE"),
+            nullable=False,
+            primary_key=True
+        )
+    )
+
+    name: str = Field(sa_column=Column(pg.VARCHAR, nullable=False))
+    images: List[str] = Field(sa_column=Column(JSONB, nullable=False))
+    status: str = Field(sa_column=Column(pg.VARCHAR, nullable=False))
+    min_price: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    max_price: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    discounted_min_price: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    total_sold: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    avg_rating: float = Field(sa_column=Column(pg.FLOAT, nullable=False, server_default="0"), default=0.0)
+    variant_count: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    offer_name: Optional[str] = Field(sa_column=Column(pg.VARCHAR, nullable=True))
+    offer_discount: int = Field(sa_column=Column(pg.INTEGER, nullable=False, server_default="0"), default=0)
+    # [{"id", "name", "parent_id"}] của các danh mục chưa xoá
+    categories: List[dict] = Field(sa_column=Column(JSONB, nullable=False, server_default="[]"))
+    category_ids: List[uuid.UUID] = Field(sa_column=Column(pg.ARRAY(pg.UUID), nullable=False, server_default="{}"))
+    colors: List[str] = Field(sa_column=Column(pg.ARRAY(pg.VARCHAR), nullable=False, server_default="{}"))
+    sizes: List[str] = Field(sa_column=Column(pg.ARRAY(pg.VARCHAR), nullable=False, server_default="{}"))
+    # Tên (trọng số A) + mô tả (trọng số B), đã bỏ dấu qua f_unaccent
+    search_vector: Optional[str] = Field(sa_column=Column(pg.TSVECTOR, nullable=False, server_default=""))
+    created_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=False))
+    deleted_at: Optional[datetime] = Field(sa_column=Column(pg.TIMESTAMP, nullable=True))
+    refreshed_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=False, server_default=text("CURRENT_TIMESTAMP")), default=datetime.now)
 
 
 class Product_Variant(SQLModel, table=True):
@@ -211,13 +353,13 @@ class Product_Variant(SQLModel, table=True):
     color_code: Optional[str] = Field(sa_column=Column(pg.VARCHAR, nullable=True))
 
     order_detail: List["Order_Detail"] = Relationship(back_populates="product_variant",
-                                                      sa_relationship_kwargs={'lazy': 'selectin'})
+                                                      sa_relationship_kwargs={'lazy': 'raise'})
     product: Optional["Product"] = Relationship(back_populates="product_variant",
-                                                sa_relationship_kwargs={'lazy': 'joined'})
+                                                sa_relationship_kwargs={'lazy': 'raise'})
     evaluate: List["Evaluate"] = Relationship(back_populates="product_variant",
-                                              sa_relationship_kwargs={'lazy': 'selectin'})
+                                              sa_relationship_kwargs={'lazy': 'raise'})
     color: Optional["Color"] = Relationship(back_populates="product_variant",
-                                                sa_relationship_kwargs={'lazy': 'joined'})
+                                                sa_relationship_kwargs={'lazy': 'raise'})
 
 
 class Categories(SQLModel, table=True):
@@ -241,15 +383,15 @@ class Categories(SQLModel, table=True):
     deleted_at: Optional[datetime] = Field(sa_column=Column(pg.TIMESTAMP, nullable=True))
 
     categories_product: List["Categories_Product"] = Relationship(back_populates="categories",
-                                                sa_relationship_kwargs={'lazy': 'selectin'})
-    products: List["Product"] = Relationship(back_populates="categories", link_model=Categories_Product, sa_relationship_kwargs={'lazy': 'selectin'})
+                                                sa_relationship_kwargs={'lazy': 'raise'})
+    products: List["Product"] = Relationship(back_populates="categories", link_model=Categories_Product, sa_relationship_kwargs={'lazy': 'raise'})
     parent: Optional["Categories"] = Relationship(
         back_populates="children",
-        sa_relationship_kwargs={"remote_side": "Categories.id", "lazy": "joined"}
+        sa_relationship_kwargs={"remote_side": "Categories.id", "lazy": "raise"}
     )
     children: List["Categories"] = Relationship(
         back_populates="parent",
-        sa_relationship_kwargs={"lazy": "noload"}
+        sa_relationship_kwargs={"lazy": "raise"}
     )
 
 Categories.model_rebuild()
@@ -284,13 +426,13 @@ class Evaluate(SQLModel, table=True):
     user_id: uuid.UUID = Field(foreign_key="user.id")
 
     order_detail: Optional["Order_Detail"] = Relationship(back_populates="evaluate",
-                                                      sa_relationship_kwargs={'lazy': 'joined', "uselist": False})
+                                                      sa_relationship_kwargs={'lazy': 'raise', "uselist": False})
     product: Optional["Product"] = Relationship(back_populates="evaluate",
-                                                sa_relationship_kwargs={'lazy': 'joined'})
+                                                sa_relationship_kwargs={'lazy': 'raise'})
     user: Optional["User"] = Relationship(back_populates="evaluate",
-                                                sa_relationship_kwargs={'lazy': 'joined'})
+                                                sa_relationship_kwargs={'lazy': 'raise'})
     product_variant: Optional["Product_Variant"] = Relationship(back_populates="evaluate",
-                                                            sa_relationship_kwargs={'lazy': 'joined'})
+                                                            sa_relationship_kwargs={'lazy': 'raise'})
 
 
 class Special_Offer(SQLModel, table=True):
@@ -319,7 +461,7 @@ class Special_Offer(SQLModel, table=True):
     updated_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=True))
     deleted_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=True))
 
-    products: List["Product"] = Relationship(back_populates="special_offer", sa_relationship_kwargs={"lazy": "selectin"})
+    products: List["Product"] = Relationship(back_populates="special_offer", sa_relationship_kwargs={"lazy": "raise"})
 
 
 class Color(SQLModel, table=True):
@@ -341,7 +483,7 @@ class Color(SQLModel, table=True):
     deleted_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, nullable=True))
 
     product_variant: List["Product_Variant"] = Relationship(back_populates="color",
-                                                                sa_relationship_kwargs={'lazy': 'selectin'})
+                                                                sa_relationship_kwargs={'lazy': 'raise'})
 
 
 class Size(SQLModel, table=True):
@@ -0,0 +1,174 @@
+import random
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from src.config import Config
+
+# scope ASGI của request hiện tại, Starlette cập nhật "endpoint" vào chính dict này sau khi định tuyến
+current_scope: ContextVar[dict | None] = ContextVar("query_profiler_scope", default=None)
+
+MAX_SAMPLES_PER_KEY = 500
+NO_ROUTE = "<no request>"
+
+_LITERAL_PATTERN = re.compile(r"\$\d+|%\(\w+\)s|'(?:[^']|'')*'|\b\d+\b")
+_IN_LIST_PATTERN = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+query_stats: dict[tuple[str, str], dict] = {}
+_route_paths: dict[int, str] = {}
+
+
+def fingerprint(statement: str) -> str:
+    normalized = _LITERAL_PATTERN.sub("?", statement)
+    normalized = _IN_LIST_PATTERN.sub("(?, ...)", normalized)
+    return _WHITESPACE_PATTERN.sub(" ", normalized).strip()
+
+
+def _resolve_route(scope: dict | None) -> str:
+    if scope is None:
+        return NO_ROUTE
+
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return f"{scope.get('method', '')} {scope.get('path', '')}".strip()
+
+    route = _route_paths.get(id(endpoint))
+    if route is None:
+        app = scope.get("app")
+        for app_route in getattr(app, "routes", []):
+            if getattr(app_route, "endpoint", None) is endpoint:
+                methods = ",".join(sorted(getattr(app_route, "methods", None) or []))
+                route = f"{methods} {app_route.path}".strip()
+                break
+        else:
+            route = getattr(endpoint, "__name__", str(endpoint))
+        _route_paths[id(endpoint)] = route
+
+    return route
+
+
+def _record(route: str, statement: str, elapsed_ms: float, rows: int | None) -> None:
+    key = (route, fingerprint(statement))
+    stats = query_stats.get(key)
+    if stats is None:
+        stats = {"count": 0, "total_ms": 0.0, "rows": 0, "samples": deque(maxlen=MAX_SAMPLES_PER_KEY)}
+        query_stats[key] = stats
+
+    stats["count"] += 1
+    stats["total_ms"] += elapsed_ms
+    stats["samples"].append(elapsed_ms)
+    if rows is not None and rows > 0:
+        stats["rows"] += rows
+
+
+def _row_count(cursor) -> int | None:
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount is not None and rowcount >= 0:
+        return rowcount
+
+    # Cursor asyncpg của SQLAlchemy trả rowcount = -1 cho SELECT, số dòng nằm trong buffer
+    rows = getattr(cursor, "_rows", None)
+    return len(rows) if rows is not None else None
+
+
+def setup_query_profiler(engine: AsyncEngine) -> None:
+    if not Config.QUERY_PROFILER_ENABLED:
+        return
+
+    sample_rate = Config.QUERY_PROFILER_SAMPLE_RATE
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._profiler_start = time.perf_counter() if random.random() < sample_rate else None
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started_at = getattr(context, "_profiler_start", None)
+        if started_at is None:
+            return
+
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        _record(_resolve_route(current_scope.get()), statement, elapsed_ms, _row_count(cursor))
+
+
+class QueryProfilerMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
+
+
+def _percentile(samples, percentile: float) -> float:
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percentile * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def get_query_stats(limit: int = 50, route: str = None) -> dict:
+    items = []
+    for (stat_route, statement), stats in query_stats.items():
+        if route and stat_route != route:
+            continue
+
+        items.append({
+            "route": stat_route,
+            "statement": statement,
+            "count": stats["count"],
+            "total_ms": round(stats["total_ms"], 3),
+            "avg_ms": round(stats["total_ms"] / stats["count"], 3),
+            "p95_ms": round(_percentile(stats["samples"], 0.95), 3),
+            "rows": stats["rows"],
+        })
+
+    items.sort(key=lambda item: item["total_ms"], reverse=True)
+
+    return {
+        "enabled": Config.QUERY_PROFILER_ENABLED,
+        "sample_rate": Config.QUERY_PROFILER_SAMPLE_RATE,
+        "queries": items[:limit]
+    }
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", " ").replace('"', '\\"')
+
+
+def render_prometheus() -> str:
+    lines = [
+        "# HELP db_query_count Sampled SQL statements per route and fingerprint",
+        "# TYPE db_query_count counter",
+        "# HELP db_query_seconds_total Sampled SQL time per route and fingerprint",
+        "# TYPE db_query_seconds_total counter",
+        "# HELP db_query_p95_seconds p95 SQL time over the most recent samples",
+        "# TYPE db_query_p95_seconds gauge",
+        "# HELP db_query_rows_total Rows returned or affected",
+        "# TYPE db_query_rows_total counter",
+    ]
+
+    for (route, statement), stats in query_stats.items():
+        labels = f'route="{_escape_label(route)}",statement="{_escape_label(statement)}"'
+        lines.append(f"db_query_count{{{labels}}} {stats['count']}")
+        lines.append(f"db_query_seconds_total{{{labels}}} {stats['total_ms'] / 1000:.6f}")
+        lines.append(f"db_query_p95_seconds{{{labels}}} {_percentile(stats['samples'], 0.95) / 1000:.6f}")
+        lines.append(f"db_query_rows_total{{{labels}}} {stats['rows']}")
+
+    return "\n".join(lines) + "\n"
+
+
+def reset_query_stats() -> None:
+    query_stats.clear()
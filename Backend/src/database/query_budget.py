@@ -0,0 +1,91 @@
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from src.config import Config
+from src.database.profiler import fingerprint
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestQueryLog:
+    def __init__(self, path: str):
+        self.path = path
+        self.budget = Config.QUERY_BUDGET_DEFAULT
+        self.count = 0
+        self.statements = Counter()
+        self.reported = set()
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        shape = fingerprint(statement)
+        self.statements[shape] += 1
+
+        if self.statements[shape] == Config.QUERY_BUDGET_N_PLUS_ONE_THRESHOLD:
+            self._violation(f"N+1: câu lệnh lặp {self.statements[shape]} lần trong {self.path}: {shape}")
+
+        if self.budget is not None and self.count == self.budget + 1:
+            self._violation(f"Vượt ngân sách {self.budget} truy vấn trong {self.path}")
+
+    def _violation(self, message: str) -> None:
+        if message in self.reported:
+            return
+        self.reported.add(message)
+
+        # Strict mode (dùng cho test) làm request lỗi ngay tại câu lệnh vi phạm
+        if Config.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logging.warning(message)
+
+
+current_query_log: ContextVar[RequestQueryLog | None] = ContextVar("request_query_log", default=None)
+
+
+def setup_query_budget(engine: AsyncEngine) -> None:
+    if not Config.QUERY_BUDGET_ENABLED:
+        return
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        query_log = current_query_log.get()
+        if query_log is not None:
+            query_log.record(statement)
+
+
+# Khai báo ngân sách truy vấn cho route: dependencies=[Depends(query_budget(5))]
+def query_budget(max_queries: int):
+    async def set_query_budget(request: Request):
+        query_log = current_query_log.get()
+        if query_log is not None:
+            query_log.budget = max_queries
+
+    return set_query_budget
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        query_log = RequestQueryLog(scope.get("path", ""))
+        token = current_query_log.set(query_log)
+
+        async def send_with_query_count(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(query_log.count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_query_count)
+        finally:
+            current_query_log.reset(token)
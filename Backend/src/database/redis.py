@@ -1,13 +1,257 @@
+import asyncio
+import json
+import logging
+import time
 from fastapi import Request
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from src.config import Config
+from src.database.bloom import JtiBlocklistFilter
 
 JTI_EXPIRY = 3600
+JTI_BLOCKLIST_SET = "jti_blocklist"
+JTI_BLOCKLIST_CHANNEL = "jti_blocklist:revoked"
+JTI_BLOCKLIST_BACKFILL_KEY = "jti_blocklist:backfill_since"
+JTI_BLOCKLIST_RETRY_DELAY = 5
+# JTI là uuid4, khoá blocklist kiểu cũ chính là "<jti>"
+JTI_KEY_PATTERN = "????????-????-????-????-????????????"
+
+# Bộ lọc bloom các JTI đã bị thu hồi (theo từng worker), chỉ khi bộ lọc báo "có thể có" mới hỏi Redis
+jti_blocklist_filter = JtiBlocklistFilter(Config.JTI_BLOOM_CAPACITY, Config.JTI_BLOOM_ERROR_RATE)
+
+PRODUCT_DETAIL_EXPIRY = 600
+PRODUCT_DETAIL_KEY = "product_detail:{}"
+
+# Facet chỉ cache ngắn hạn, không invalidate theo từng sản phẩm
+PRODUCT_FACETS_EXPIRY = 120
+PRODUCT_FACETS_KEY = "product_facets:{}:{}"
+
+# Cây danh mục dùng chung giữa các worker, bản cache chỉ hợp lệ khi khớp version hiện tại
+CATEGORY_TREE_KEY = "category_tree"
+CATEGORY_TREE_VERSION_KEY = "category_tree:version"
+REFERENCE_VERSION_KEY = "reference:{}:version"
+
+# Bộ đếm hit/miss của cache chi tiết sản phẩm (theo từng worker)
+product_detail_cache_stats = {"hits": 0, "misses": 0}
+
 
 async def add_jti_to_blocklist(jti: str, request: Request) -> None:
     token_blocklist = request.app.state.redis
-    await token_blocklist.set(name=jti, value="", ex=JTI_EXPIRY)
+    jti_blocklist_filter.add(jti)
+
+    async with token_blocklist.pipeline(transaction=False) as pipe:
+        pipe.set(name=jti, value="", ex=JTI_EXPIRY)
+        pipe.zadd(JTI_BLOCKLIST_SET, {jti: time.time() + JTI_EXPIRY})
+        pipe.publish(JTI_BLOCKLIST_CHANNEL, jti)
+        await pipe.execute()
 
 async def token_in_blocklist(jti: str, request: Request) -> bool:
+    if not jti_blocklist_filter.might_contain(jti):
+        return False
+
     token_blocklist = request.app.state.redis
     exists = await token_blocklist.exists(jti)
     return exists == 1
 
+
+async def backfill_jti_blocklist_set(redis: Redis) -> None:
+    # JTI thu hồi trước khi có sorted set (hoặc bởi worker bản cũ trong lúc rollout) chỉ nằm ở khoá riêng lẻ.
+    # Chép chúng sang sorted set ở mỗi lần dựng lại bộ lọc, cho tới khi qua 1 vòng đời token kể từ lần chạy đầu
+    now = time.time()
+    await redis.set(JTI_BLOCKLIST_BACKFILL_KEY, now, nx=True)
+    since = float(await redis.get(JTI_BLOCKLIST_BACKFILL_KEY))
+    if now - since > JTI_EXPIRY:
+        return
+
+    keys = [key async for key in redis.scan_iter(match=JTI_KEY_PATTERN, count=1000)]
+    for start in range(0, len(keys), 500):
+        batch = keys[start:start + 500]
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in batch:
+                pipe.ttl(key)
+            ttls = await pipe.execute()
+
+        expiries = {key: now + ttl for key, ttl in zip(batch, ttls) if ttl > 0}
+        if expiries:
+            await redis.zadd(JTI_BLOCKLIST_SET, expiries)
+
+
+async def rebuild_jti_blocklist_filter(redis: Redis) -> None:
+    await backfill_jti_blocklist_set(redis)
+
+    now = time.time()
+    await redis.zremrangebyscore(JTI_BLOCKLIST_SET, "-inf", now)
+    jtis = await redis.zrangebyscore(JTI_BLOCKLIST_SET, now, "+inf")
+    jti_blocklist_filter.rebuild(jtis)
+
+
+async def sync_jti_blocklist_filter(redis: Redis) -> None:
+    # Nhận JTI mới qua pub/sub, định kỳ dựng lại bộ lọc từ sorted set để loại JTI đã hết hạn
+    while True:
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(JTI_BLOCKLIST_CHANNEL)
+            await rebuild_jti_blocklist_filter(redis)
+            next_rebuild = time.monotonic() + Config.JTI_BLOOM_SYNC_INTERVAL
+
+            while True:
+                message = await pubsub.get_message(timeout=1.0)
+                if message and message.get("type") == "message":
+                    jti_blocklist_filter.add(message["data"])
+
+                if time.monotonic() >= next_rebuild:
+                    await rebuild_jti_blocklist_filter(redis)
+                    next_rebuild = time.monotonic() + Config.JTI_BLOOM_SYNC_INTERVAL
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Lỗi bất kỳ (mất kết nối, payload hỏng...) thì quay về hỏi Redis cho mọi request cho tới khi đồng bộ lại,
+            # task phải sống tiếp: bộ lọc còn ready mà không nhận JTI mới sẽ cho token đã thu hồi đi qua
+            jti_blocklist_filter.ready = False
+            logging.warning(f"JTI blocklist sync failed: {str(e)}")
+            await asyncio.sleep(JTI_BLOCKLIST_RETRY_DELAY)
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception as e:
+                jti_blocklist_filter.ready = False
+                logging.warning(f"JTI blocklist pubsub close failed: {str(e)}")
+
+
+def get_jti_blocklist_stats() -> dict:
+    return jti_blocklist_filter.get_stats()
+
+
+async def get_product_detail_cache(product_id: str, request: Request) -> dict | None:
+    redis = request.app.state.redis
+    try:
+        cached = await redis.get(PRODUCT_DETAIL_KEY.format(product_id))
+    except RedisError as e:
+        logging.warning(f"Product detail cache read failed for {product_id}: {str(e)}")
+        cached = None
+
+    if cached is None:
+        product_detail_cache_stats["misses"] += 1
+        return None
+
+    product_detail_cache_stats["hits"] += 1
+    return json.loads(cached)
+
+
+async def set_product_detail_cache(product_id: str, product_dict: dict, request: Request) -> None:
+    redis = request.app.state.redis
+    try:
+        await redis.set(
+            name=PRODUCT_DETAIL_KEY.format(product_id),
+            value=json.dumps(product_dict, default=str),
+            ex=PRODUCT_DETAIL_EXPIRY
+        )
+    except RedisError as e:
+        logging.warning(f"Product detail cache write failed for {product_id}: {str(e)}")
+
+
+async def invalidate_product_detail_cache(product_ids: list, request: Request) -> None:
+    if not product_ids:
+        return
+
+    redis = request.app.state.redis
+    keys = [PRODUCT_DETAIL_KEY.format(product_id) for product_id in product_ids]
+    try:
+        await redis.delete(*keys)
+    except RedisError as e:
+        logging.warning(f"Product detail cache invalidation failed for {product_ids}: {str(e)}")
+
+
+async def get_product_facets_cache(category_id: str, filter_hash: str, request: Request) -> dict | None:
+    redis = request.app.state.redis
+    try:
+        cached = await redis.get(PRODUCT_FACETS_KEY.format(category_id, filter_hash))
+    except RedisError as e:
+        logging.warning(f"Product facets cache read failed for {category_id}: {str(e)}")
+        return None
+
+    return json.loads(cached) if cached is not None else None
+
+
+async def set_product_facets_cache(category_id: str, filter_hash: str, facets: dict, request: Request) -> None:
+    redis = request.app.state.redis
+    try:
+        await redis.set(
+            name=PRODUCT_FACETS_KEY.format(category_id, filter_hash),
+            value=json.dumps(facets),
+            ex=PRODUCT_FACETS_EXPIRY
+        )
+    except RedisError as e:
+        logging.warning(f"Product facets cache write failed for {category_id}: {str(e)}")
+
+
+async def get_category_tree_version(request: Request) -> int | None:
+    redis = request.app.state.redis
+    try:
+        version = await redis.get(CATEGORY_TREE_VERSION_KEY)
+    except RedisError as e:
+        logging.warning(f"Category tree version read failed: {str(e)}")
+        return None
+
+    return int(version) if version is not None else 0
+
+
+async def get_category_tree_cache(request: Request) -> dict | None:
+    redis = request.app.state.redis
+    try:
+        cached = await redis.get(CATEGORY_TREE_KEY)
+    except RedisError as e:
+        logging.warning(f"Category tree cache read failed: {str(e)}")
+        return None
+
+    return json.loads(cached) if cached is not None else None
+
+
+async def set_category_tree_cache(tree: dict, request: Request) -> None:
+    redis = request.app.state.redis
+    try:
+        await redis.set(name=CATEGORY_TREE_KEY, value=json.dumps(tree))
+    except RedisError as e:
+        logging.warning(f"Category tree cache write failed: {str(e)}")
+
+
+async def bump_category_tree_version(request: Request) -> None:
+    redis = request.app.state.redis
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.incr(CATEGORY_TREE_VERSION_KEY)
+            pipe.delete(CATEGORY_TREE_KEY)
+            await pipe.execute()
+    except RedisError as e:
+        logging.warning(f"Category tree invalidation failed: {str(e)}")
+
+
+async def get_reference_version(name: str, request: Request) -> int | None:
+    redis = request.app.state.redis
+    try:
+        version = await redis.get(REFERENCE_VERSION_KEY.format(name))
+    except RedisError as e:
+        logging.warning(f"Reference data version read failed: {str(e)}")
+        return None
+
+    return int(version) if version is not None else 0
+
+
+async def bump_reference_version(name: str, request: Request) -> None:
+    redis = request.app.state.redis
+    try:
+        await redis.incr(REFERENCE_VERSION_KEY.format(name))
+    except RedisError as e:
+        logging.warning(f"Reference data invalidation failed: {str(e)}")
+
+
+def get_product_detail_cache_stats() -> dict:
+    hits = product_detail_cache_stats["hits"]
+    misses = product_detail_cache_stats["misses"]
+    total = hits + misses
+
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0
+    }
@@ -0,0 +1,46 @@
+import time
+from typing import Awaitable, Callable
+from fastapi import Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.config import Config
+from src.database.redis import get_reference_version, bump_reference_version
+
+# Khoảng thời gian tin bản trong bộ nhớ mà không hỏi lại version trên Redis
+REFERENCE_CHECK_INTERVAL = 5
+
+
+class ReferenceDataCache:
+    def __init__(self, name: str, loader: Callable[[AsyncSession], Awaitable[list[dict]]]):
+        self.name = name
+        self.loader = loader
+        self.items: list[dict] | None = None
+        self.version: int | None = None
+        self.loaded_at = 0.0
+        self.checked_at = 0.0
+
+    async def get(self, session: AsyncSession, request: Request = None) -> list[dict]:
+        now = time.monotonic()
+        # Dù Redis không đổi version, bản trong bộ nhớ vẫn hết hạn sau REFERENCE_CACHE_TTL
+        if self.items is not None and now - self.loaded_at < Config.REFERENCE_CACHE_TTL:
+            if now - self.checked_at < REFERENCE_CHECK_INTERVAL:
+                return self.items
+
+            version = await get_reference_version(self.name, request) if request is not None else None
+            if version is None or version == self.version:
+                self.checked_at = now
+                return self.items
+        else:
+            version = await get_reference_version(self.name, request) if request is not None else None
+
+        self.items = await self.loader(session)
+        self.version = version
+        self.loaded_at = self.checked_at = now
+        return self.items
+
+    async def get_map(self, session: AsyncSession, request: Request = None) -> dict[str, dict]:
+        return {item["id"]: item for item in await self.get(session, request)}
+
+    async def invalidate(self, request: Request = None) -> None:
+        self.items = None
+        if request is not None:
+            await bump_reference_version(self.name, request)
@@ -7,6 +7,18 @@ from src.crud.authentication.utils import decode_token
 from src.database.redis import token_in_blocklist
 
 
+# Giải mã token 1 lần cho mỗi request, các dependency dùng chung kết quả qua request.state
+def get_request_token_data(request: Request, token: str) -> dict | None:
+    cached = getattr(request.state, "token_data", None)
+    if cached is not None and cached[0] == token:
+        return cached[1]
+
+    token_data = decode_token(token)
+    request.state.token_data = (token, token_data)
+
+    return token_data
+
+
 class TokenBearer(HTTPBearer):
     def __init__(self, auto_error=True):
         super().__init__(auto_error=auto_error)
@@ -14,7 +26,7 @@ class TokenBearer(HTTPBearer):
     async def __call__(self, request: Request) -> HTTPAuthorizationCredentials | None:
         creds = await super().__call__(request)
         token = creds.credentials
-        token_data = decode_token(token)
+        token_data = get_request_token_data(request, token)
 
         if token_data is None:
             raise HTTPException(
@@ -68,7 +80,7 @@ def verify_token_and_get_role(request: Request):
         )
 
     token = auth_header.split(" ")[1]
-    payload = decode_token(token)
+    payload = get_request_token_data(request, token)
 
     if payload is None:
         raise HTTPException(
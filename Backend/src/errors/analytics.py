@@ -0,0 +1,12 @@
+from fastapi import HTTPException, status
+
+class AnalyticsException:
+    @staticmethod
+    def invalid_date_range():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": "Khoảng thời gian thống kê không hợp lệ",
+                "error_code": "analytics_001",
+            },
+        )
@@ -60,4 +60,14 @@ class EvaluateException:
                 "message": "Đơn hàng này đã được đánh giá bổ sung trước đó",
                 "error_code": "eval_006"
             }
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def invalid_rate():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": "Số sao đánh giá phải từ 1 đến 5",
+                "error_code": "eval_007"
+            }
+        )
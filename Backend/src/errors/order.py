@@ -39,4 +39,24 @@ class OrderException:
                 "message": "Không thể tính tổng doanh thu",
                 "error_code": "order_004",
             },
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def not_found_orders(missing_ids: set[str]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "message": f"Không tìm thấy các đơn hàng: {list(missing_ids)}",
+                "error_code": "order_005",
+            },
+        )
+
+    @staticmethod
+    def invalid_cursor():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": "Cursor phân trang không hợp lệ",
+                "error_code": "order_006",
+            },
+        )
@@ -140,4 +140,14 @@ class ProductException:
                 "message": f"SKU đã tồn tại: {list(existing_skus)}",
                 "error_code": "product_014",
             },
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def invalid_cursor():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": "Cursor phân trang không hợp lệ",
+                "error_code": "product_015",
+            },
+        )
@@ -90,3 +90,23 @@ class SpecialOfferException:
                 "error_code": "voucher_009"
             }
         )
+
+    @staticmethod
+    def out_of_quantity(code: str):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": f"Voucher {code} đã hết lượt sử dụng",
+                "error_code": "voucher_010"
+            }
+        )
+
+    @staticmethod
+    def offers_out_of_quantity(codes: list[str]):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": f"Các voucher đã hết lượt sử dụng: {codes}",
+                "error_code": "voucher_011"
+            }
+        )
@@ -0,0 +1,90 @@
+import hashlib
+from fastapi import Request
+
+HTTP_CACHE_STATE_KEY = "http_cache"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+
+    # If-None-Match dùng phép so sánh yếu: bỏ tiền tố W/ ở cả 2 phía
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+# Đánh dấu route có thể cache: dependencies=[Depends(http_cache(max_age=60))]
+# private=True cho route cần đăng nhập: chỉ trình duyệt được giữ, CDN không lưu
+def http_cache(max_age: int = 60, stale_while_revalidate: int = 0, private: bool = False):
+    directives = ["private" if private else "public", f"max-age={max_age}"]
+    if stale_while_revalidate:
+        directives.append(f"stale-while-revalidate={stale_while_revalidate}")
+    cache_control = ", ".join(directives)
+
+    async def set_http_cache(request: Request):
+        setattr(request.state, HTTP_CACHE_STATE_KEY, cache_control)
+
+    return set_http_cache
+
+
+class HttpCacheMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        body_parts = []
+
+        async def send_with_etag(message):
+            nonlocal start_message
+
+            if message["type"] == "http.response.start":
+                # request.state nằm trong scope["state"], dependency đã chạy xong trước khi response bắt đầu
+                cache_control = scope.get("state", {}).get(HTTP_CACHE_STATE_KEY)
+                if message["status"] != 200 or cache_control is None:
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if start_message is None:
+                await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            cache_control = scope["state"][HTTP_CACHE_STATE_KEY]
+
+            headers = [
+                (key, value) for key, value in start_message.get("headers", [])
+                if key.lower() not in (b"etag", b"cache-control")
+            ]
+            headers += [(b"etag", etag.encode()), (b"cache-control", cache_control.encode())]
+
+            if_none_match = None
+            for key, value in scope.get("headers", []):
+                if key == b"if-none-match":
+                    if_none_match = value.decode("latin-1")
+                    break
+
+            if if_none_match is not None and _etag_matches(if_none_match, etag):
+                headers = [
+                    (key, value) for key, value in headers
+                    if key.lower() not in (b"content-length", b"content-type")
+                ]
+                await send({**start_message, "status": 304, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_with_etag)
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI
 from sqlalchemy.orm import sessionmaker
 from src.database.main import engine
@@ -7,6 +8,9 @@ from src.api_router import admin_router, customer_router, public_router
 from src.config import Config
 from redis.asyncio import Redis
 from src.middleware import register_middleware
+from src.database.redis import sync_jti_blocklist_filter
+from src.crud.product.suggest import sync_suggest_index
+from src.crud.authentication.utils import password_hash_executor
 
 
 @asynccontextmanager
@@ -20,9 +24,15 @@ async def lifespan(app: FastAPI):
         db=0,
         decode_responses=True
     )
+    app.state.jti_blocklist_sync = asyncio.create_task(sync_jti_blocklist_filter(app.state.redis))
+    app.state.suggest_index_sync = asyncio.create_task(sync_suggest_index(app.state.session))
 
     yield
 
+    app.state.jti_blocklist_sync.cancel()
+    app.state.suggest_index_sync.cancel()
+    password_hash_executor.shutdown(wait=False)
+
     await app.state.engine.dispose()
     await app.state.redis.close()
     await app.state.redis.connection_pool.disconnect()
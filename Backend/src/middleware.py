@@ -1,6 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from src.config import Config
+from src.database.profiler import QueryProfilerMiddleware
+from src.database.query_budget import QueryBudgetMiddleware
+from src.http_cache import HttpCacheMiddleware
 
 def register_middleware(app: FastAPI):
     origins = [
@@ -9,6 +13,10 @@ def register_middleware(app: FastAPI):
         "http://127.0.0.1:8000",  # production
     ]
 
+    # Thêm đầu tiên để nằm trong cùng, response 304 vẫn đi qua CORS
+    if Config.HTTP_CACHE_ENABLED:
+        app.add_middleware(HttpCacheMiddleware)
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=origins,
@@ -20,4 +28,10 @@ def register_middleware(app: FastAPI):
     app.add_middleware(
         TrustedHostMiddleware,
         allowed_hosts=["localhost", "127.0.0.1"]
-    )
\ No newline at end of file
+    )
+
+    if Config.QUERY_PROFILER_ENABLED:
+        app.add_middleware(QueryProfilerMiddleware)
+
+    if Config.QUERY_BUDGET_ENABLED:
+        app.add_middleware(QueryBudgetMiddleware)
\ No newline at end of file
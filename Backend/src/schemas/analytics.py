@@ -0,0 +1,15 @@
+from typing import Optional, List
+from pydantic import BaseModel
+from datetime import date
+from enum import Enum
+
+
+class AnalyticsBucket(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+class AnalyticsFilterModel(BaseModel):
+    from_date: date
+    to_date: date
+    statuses: Optional[List[str]] = None
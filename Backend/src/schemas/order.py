@@ -29,6 +29,10 @@ class OrderCreateModel(BaseModel):
 class StatusUpdateModel(BaseModel):
     status: str
 
+class BulkStatusUpdateModel(BaseModel):
+    order_ids: List[uuid.UUID]
+    status: str
+
 class CheckOut(BaseModel):
     payment_method: str = Field(default="vnpay")
     transaction_no: Optional[str]
@@ -43,6 +43,7 @@ class SortBy(str, Enum):
     name_desc = "name_desc"
     best_seller = "best_seller"
     sale_desc = "sale_desc"
+    relevance = "relevance"
 
 class ProductFilterModel(BaseModel):
     search: Optional[str] = None
@@ -0,0 +1,254 @@
+-- Schema của DB Supabase tại revision 3e8dd8443b38: migration đó xoá toàn bộ bảng, sau đó DB được dựng lại bằng init_db()
+-- (SQLModel.metadata.create_all trên models.py ở commit baseline). Các migration sau đó chạy tiếp trên schema này.
+-- Sinh lại: create_all models.py baseline vào DB trống rồi pg_dump -s -O -x --no-comments
+
+
+CREATE TABLE address (
+    id uuid NOT NULL,
+    line character varying NOT NULL,
+    street character varying NOT NULL,
+    ward character varying NOT NULL,
+    city character varying NOT NULL,
+    district character varying NOT NULL,
+    country character varying DEFAULT 'Việt Nam'::character varying NOT NULL,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    user_id uuid NOT NULL
+);
+
+CREATE TABLE categories (
+    id uuid NOT NULL,
+    name character varying NOT NULL,
+    image character varying NOT NULL,
+    parent_id uuid,
+    type_size character varying NOT NULL,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone
+);
+
+CREATE TABLE categories_product (
+    id uuid NOT NULL,
+    categories_id uuid NOT NULL,
+    product_id uuid NOT NULL,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone
+);
+
+CREATE TABLE color (
+    id uuid NOT NULL,
+    name character varying NOT NULL,
+    code character varying NOT NULL,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone
+);
+
+CREATE TABLE evaluate (
+    id uuid NOT NULL,
+    comment text,
+    rate integer NOT NULL,
+    image character varying,
+    additional_comment character varying,
+    additional_image character varying,
+    additional_created_at timestamp without time zone,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    product_id uuid NOT NULL,
+    order_detail_id uuid NOT NULL,
+    product_variant_id uuid NOT NULL,
+    user_id uuid NOT NULL
+);
+
+CREATE TABLE "order" (
+    id uuid NOT NULL,
+    code character varying NOT NULL,
+    sub_total integer NOT NULL,
+    total_price integer NOT NULL,
+    discount integer DEFAULT 0,
+    note character varying,
+    status character varying NOT NULL,
+    payment_method character varying DEFAULT 'vnpay'::character varying NOT NULL,
+    transaction_no character varying NOT NULL,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    user_id uuid NOT NULL,
+    "Address" jsonb NOT NULL
+);
+
+CREATE TABLE order_detail (
+    id uuid NOT NULL,
+    quantity integer NOT NULL,
+    price integer NOT NULL,
+    product_id uuid NOT NULL,
+    product_variant_id uuid NOT NULL,
+    order_id uuid NOT NULL,
+    "Product" jsonb,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone
+);
+
+CREATE TABLE product (
+    id uuid NOT NULL,
+    name character varying NOT NULL,
+    images jsonb NOT NULL,
+    description text,
+    popularity_score integer DEFAULT 0 NOT NULL,
+    total_sold integer DEFAULT 0 NOT NULL,
+    avg_rating double precision DEFAULT '0'::double precision NOT NULL,
+    status character varying DEFAULT 'active'::character varying NOT NULL,
+    special_offer_id uuid,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone
+);
+
+CREATE TABLE product_variant (
+    id uuid NOT NULL,
+    size character varying,
+    price integer NOT NULL,
+    quantity integer NOT NULL,
+    sku character varying NOT NULL,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    product_id uuid NOT NULL,
+    color_id uuid,
+    color_name character varying,
+    color_code character varying
+);
+
+CREATE TABLE size (
+    id uuid NOT NULL,
+    name character varying NOT NULL,
+    type character varying NOT NULL
+);
+
+CREATE TABLE special_offer (
+    id uuid NOT NULL,
+    code character varying NOT NULL,
+    name character varying NOT NULL,
+    discount integer NOT NULL,
+    condition integer,
+    type character varying NOT NULL,
+    total_quantity integer NOT NULL,
+    scope character varying DEFAULT 'order'::character varying NOT NULL,
+    used_quantity integer DEFAULT 0,
+    start_time timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    end_time timestamp without time zone NOT NULL,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone
+);
+
+CREATE TABLE "user" (
+    id uuid NOT NULL,
+    first_name character varying NOT NULL,
+    last_name character varying NOT NULL,
+    email character varying NOT NULL,
+    password character varying NOT NULL,
+    phone character varying,
+    customer_status character varying DEFAULT 'active'::character varying NOT NULL,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    is_verified boolean DEFAULT false NOT NULL,
+    is_admin boolean DEFAULT false NOT NULL,
+    is_customer boolean DEFAULT false NOT NULL,
+    two_fa_secret character varying,
+    two_fa_enabled boolean DEFAULT false NOT NULL,
+    otp character varying,
+    expires_at timestamp without time zone
+);
+
+ALTER TABLE ONLY address
+    ADD CONSTRAINT address_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY categories
+    ADD CONSTRAINT categories_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY categories_product
+    ADD CONSTRAINT categories_product_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY color
+    ADD CONSTRAINT color_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY evaluate
+    ADD CONSTRAINT evaluate_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY order_detail
+    ADD CONSTRAINT order_detail_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY "order"
+    ADD CONSTRAINT order_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY product
+    ADD CONSTRAINT product_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY product_variant
+    ADD CONSTRAINT product_variant_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY size
+    ADD CONSTRAINT size_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY special_offer
+    ADD CONSTRAINT special_offer_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY evaluate
+    ADD CONSTRAINT uq_evaluate_order_detail_id UNIQUE (order_detail_id);
+
+ALTER TABLE ONLY "user"
+    ADD CONSTRAINT user_pkey PRIMARY KEY (id);
+
+CREATE INDEX ix_size_type ON size USING btree (type);
+
+ALTER TABLE ONLY address
+    ADD CONSTRAINT address_user_id_fkey FOREIGN KEY (user_id) REFERENCES "user"(id);
+
+ALTER TABLE ONLY categories
+    ADD CONSTRAINT categories_parent_id_fkey FOREIGN KEY (parent_id) REFERENCES categories(id);
+
+ALTER TABLE ONLY categories_product
+    ADD CONSTRAINT categories_product_categories_id_fkey FOREIGN KEY (categories_id) REFERENCES categories(id);
+
+ALTER TABLE ONLY categories_product
+    ADD CONSTRAINT categories_product_product_id_fkey FOREIGN KEY (product_id) REFERENCES product(id);
+
+ALTER TABLE ONLY evaluate
+    ADD CONSTRAINT evaluate_order_detail_id_fkey FOREIGN KEY (order_detail_id) REFERENCES order_detail(id);
+
+ALTER TABLE ONLY evaluate
+    ADD CONSTRAINT evaluate_product_id_fkey FOREIGN KEY (product_id) REFERENCES product(id);
+
+ALTER TABLE ONLY evaluate
+    ADD CONSTRAINT evaluate_product_variant_id_fkey FOREIGN KEY (product_variant_id) REFERENCES product_variant(id);
+
+ALTER TABLE ONLY evaluate
+    ADD CONSTRAINT evaluate_user_id_fkey FOREIGN KEY (user_id) REFERENCES "user"(id);
+
+ALTER TABLE ONLY order_detail
+    ADD CONSTRAINT order_detail_order_id_fkey FOREIGN KEY (order_id) REFERENCES "order"(id);
+
+ALTER TABLE ONLY order_detail
+    ADD CONSTRAINT order_detail_product_id_fkey FOREIGN KEY (product_id) REFERENCES product(id);
+
+ALTER TABLE ONLY order_detail
+    ADD CONSTRAINT order_detail_product_variant_id_fkey FOREIGN KEY (product_variant_id) REFERENCES product_variant(id);
+
+ALTER TABLE ONLY "order"
+    ADD CONSTRAINT order_user_id_fkey FOREIGN KEY (user_id) REFERENCES "user"(id);
+
+ALTER TABLE ONLY product
+    ADD CONSTRAINT product_special_offer_id_fkey FOREIGN KEY (special_offer_id) REFERENCES special_offer(id);
+
+ALTER TABLE ONLY product_variant
+    ADD CONSTRAINT product_variant_color_id_fkey FOREIGN KEY (color_id) REFERENCES color(id);
+
+ALTER TABLE ONLY product_variant
+    ADD CONSTRAINT product_variant_product_id_fkey FOREIGN KEY (product_id) REFERENCES product(id);
+
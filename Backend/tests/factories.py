@@ -0,0 +1,82 @@
+import uuid
+from datetime import datetime, timedelta
+from src.database.models import User, Address, Product, Product_Variant, Special_Offer
+from src.schemas.order import OrderCreateModel
+from src.schemas.order_detail import OrderDetailCreateModel
+
+
+async def create_customer(session) -> tuple[User, Address]:
+    customer = User(
+        first_name="Test",
+        last_name="Customer",
+        email=f"{uuid.uuid4().hex}@example.com",
+        password="not-a-real-hash",
+        is_verified=True,
+        is_customer=True,
+        created_at=datetime.now()
+    )
+    session.add(customer)
+    await session.flush()
+
+    address = Address(line="1", street="Le Loi", ward="Ben Nghe", city="Ho Chi Minh", district="1",
+                      user_id=customer.id, created_at=datetime.now())
+    session.add(address)
+    await session.commit()
+
+    return customer, address
+
+
+async def create_product_offer(session, discount: int = 10, total_quantity: int = 100, used_quantity: int = 0,
+                               offer_type: str = "percent") -> Special_Offer:
+    now = datetime.now()
+    offer = Special_Offer(
+        code=uuid.uuid4().hex[:12],
+        name="Test offer",
+        discount=discount,
+        type=offer_type,
+        scope="product",
+        total_quantity=total_quantity,
+        used_quantity=used_quantity,
+        start_time=now - timedelta(days=1),
+        end_time=now + timedelta(days=1),
+        created_at=now
+    )
+    session.add(offer)
+    await session.commit()
+
+    return offer
+
+
+async def create_product(session, price: int = 100000, quantity: int = 10,
+                         offer: Special_Offer = None) -> tuple[Product, Product_Variant]:
+    product = Product(
+        name=f"Test product {uuid.uuid4().hex[:8]}",
+        images=[],
+        special_offer_id=offer.id if offer else None,
+        created_at=datetime.now()
+    )
+    session.add(product)
+    await session.flush()
+
+    variant = await create_variant(session, product, price=price, quantity=quantity)
+
+    return product, variant
+
+
+async def create_variant(session, product: Product, price: int = 100000, quantity: int = 10,
+                         size: str = "M") -> Product_Variant:
+    variant = Product_Variant(price=price, quantity=quantity, sku=uuid.uuid4().hex[:12], size=size,
+                              product_id=product.id, created_at=datetime.now())
+    session.add(variant)
+    await session.commit()
+
+    return variant
+
+
+def checkout_data(address: Address, variant: Product_Variant, quantity: int = 1) -> OrderCreateModel:
+    return OrderCreateModel(
+        special_offer_id=None,
+        note=None,
+        address_id=str(address.id),
+        order_detail=[OrderDetailCreateModel(quantity=quantity, product_variant_id=str(variant.id))]
+    )
@@ -0,0 +1,38 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from redis.asyncio import Redis
+from redis.asyncio.retry import Retry
+from redis.backoff import NoBackoff
+from src.config import Config
+from src.crud.categories.tree import CategoryTreeCache
+from src.database.models import Categories
+
+pytestmark = pytest.mark.anyio
+
+
+def fake_request(redis):
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(redis=redis)))
+
+
+async def test_tree_expires_when_version_cannot_be_read(session_maker, redis_client):
+    cache = CategoryTreeCache()
+    async with session_maker() as session:
+        await cache.get(session, fake_request(redis_client))
+
+        # Thêm danh mục mà lần tăng version bị mất, sau đó Redis không đọc được nữa
+        category = Categories(name="Mới", image="", type_size="clothes", created_at=datetime.now())
+        session.add(category)
+        await session.commit()
+
+        unreachable = Redis(host="localhost", port=1, decode_responses=True, retry=Retry(NoBackoff(), 0))
+        try:
+            cache.checked_at = 0.0
+            tree = await cache.get(session, fake_request(unreachable))
+            assert tree.get(category.id) is None
+
+            cache.loaded_at -= Config.REFERENCE_CACHE_TTL
+            tree = await cache.get(session, fake_request(unreachable))
+            assert tree.get(category.id) is not None
+        finally:
+            await unreachable.aclose()
@@ -0,0 +1,36 @@
+import base64
+import json
+import jwt
+import pytest
+from src.crud.authentication.utils import create_access_token, decode_token
+
+
+def encode_segment(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+@pytest.mark.parametrize("kid", [["admin"], {"role": "admin"}, 1])
+def test_non_string_kid_is_invalid_token(kid):
+    token = ".".join([
+        encode_segment({"alg": "HS256", "typ": "JWT", "kid": kid}),
+        encode_segment({"role": "admin"}),
+        "signature"
+    ])
+
+    assert decode_token(token) is None
+
+
+def test_non_string_kid_is_invalid_when_header_is_not_validated(monkeypatch):
+    # Các bản PyJWT cũ không kiểm tra kiểu của kid khi đọc header
+    monkeypatch.setattr(jwt, "get_unverified_header", lambda token: {"alg": "HS256", "kid": ["admin"]})
+
+    assert decode_token(create_access_token({"id": "1"}, "admin")) is None
+
+
+def test_token_with_role_kid_is_decoded():
+    token = create_access_token({"id": "1"}, "customer")
+
+    token_data = decode_token(token)
+
+    assert token_data["role"] == "customer"
+    assert token_data["user"] == {"id": "1"}
@@ -0,0 +1,59 @@
+import asyncio
+import uuid
+import pytest
+from src.database import redis as redis_module
+from src.database.redis import rebuild_jti_blocklist_filter, jti_blocklist_filter, sync_jti_blocklist_filter, \
+    JTI_BLOCKLIST_SET, JTI_BLOCKLIST_BACKFILL_KEY, JTI_EXPIRY
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_rebuild_keeps_jtis_revoked_before_sorted_set(redis_client):
+    legacy_jti = str(uuid.uuid4())
+    await redis_client.set(name=legacy_jti, value="", ex=JTI_EXPIRY)
+
+    await rebuild_jti_blocklist_filter(redis_client)
+
+    assert await redis_client.zscore(JTI_BLOCKLIST_SET, legacy_jti) is not None
+    assert jti_blocklist_filter.might_contain(legacy_jti)
+    assert not jti_blocklist_filter.might_contain(str(uuid.uuid4()))
+
+
+async def test_backfill_stops_after_one_token_lifetime(redis_client):
+    await redis_client.set(JTI_BLOCKLIST_BACKFILL_KEY, 0)
+    legacy_jti = str(uuid.uuid4())
+    await redis_client.set(name=legacy_jti, value="", ex=JTI_EXPIRY)
+
+    await rebuild_jti_blocklist_filter(redis_client)
+
+    assert await redis_client.zscore(JTI_BLOCKLIST_SET, legacy_jti) is None
+
+
+async def test_sync_survives_unexpected_errors(redis_client, monkeypatch):
+    ready_before_rebuild = []
+
+    async def flaky_rebuild(redis):
+        ready_before_rebuild.append(jti_blocklist_filter.ready)
+        if len(ready_before_rebuild) == 1:
+            await rebuild_jti_blocklist_filter(redis)
+            raise ValueError("bad payload")
+        await rebuild_jti_blocklist_filter(redis)
+
+    monkeypatch.setattr(redis_module, "rebuild_jti_blocklist_filter", flaky_rebuild)
+    monkeypatch.setattr(redis_module, "JTI_BLOCKLIST_RETRY_DELAY", 0)
+
+    task = asyncio.create_task(sync_jti_blocklist_filter(redis_client))
+    try:
+        for _ in range(50):
+            if len(ready_before_rebuild) >= 2:
+                break
+            await asyncio.sleep(0.05)
+
+        # Lỗi không phải RedisError vẫn tắt bộ lọc và task tự đồng bộ lại
+        assert ready_before_rebuild[1] is False
+        assert not task.done()
+        assert jti_blocklist_filter.ready
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
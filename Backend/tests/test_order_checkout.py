@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from src.crud.special_offer.services import SpecialOfferService
+from src.database.models import Special_Offer, Product_Variant
+from tests.factories import create_product, create_product_offer
+
+pytestmark = pytest.mark.anyio
+
+special_offer_service = SpecialOfferService()
+
+
+async def test_checkout_applies_active_product_offer(session_maker, checkout):
+    async with session_maker() as session:
+        offer = await create_product_offer(session, discount=10, total_quantity=5)
+        product, variant = await create_product(session, price=200000, quantity=3, offer=offer)
+
+    order = await checkout(variant, 2)
+
+    assert order["product_discount"] == 40000
+    assert order["sub_total"] == 360000
+
+    async with session_maker() as session:
+        offer = await session.get(Special_Offer, offer.id)
+        assert offer.used_quantity == 2
+
+
+async def test_checkout_ignores_deleted_product_offer(session_maker, checkout):
+    async with session_maker() as session:
+        offer = await create_product_offer(session, discount=10, total_quantity=5)
+        product, variant = await create_product(session, price=200000, quantity=3, offer=offer)
+        await special_offer_service.delete_categories_service(str(offer.id), session)
+
+    # Sản phẩm vẫn giữ special_offer_id nhưng voucher đã xoá không còn được áp dụng
+    order = await checkout(variant, 2)
+
+    assert order["product_discount"] == 0
+    assert order["sub_total"] == 400000
+
+    async with session_maker() as session:
+        deleted_offer = await session.get(Special_Offer, offer.id)
+        assert deleted_offer.used_quantity == 0
+
+        stock = await session.get(Product_Variant, variant.id)
+        assert stock.quantity == 1
+
+
+async def test_parallel_checkouts_cannot_overuse_offer_quota(session_maker, checkout):
+    async with session_maker() as session:
+        offer = await create_product_offer(session, discount=10, total_quantity=1)
+        product, variant = await create_product(session, price=100000, quantity=50, offer=offer)
+
+    results = await asyncio.gather(*(checkout(variant) for _ in range(10)), return_exceptions=True)
+
+    succeeded = [result for result in results if isinstance(result, dict)]
+    rejected = [result for result in results if isinstance(result, HTTPException)]
+    assert len(succeeded) == 1
+    assert len(rejected) == 9
+    assert all(error.status_code == 400 for error in rejected)
+
+    async with session_maker() as session:
+        offer = await session.get(Special_Offer, offer.id)
+        assert offer.used_quantity == 1
+        assert offer.total_quantity == 1
+
+        stock = await session.get(Product_Variant, variant.id)
+        assert stock.quantity == 49
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import date, datetime, time
+import pytest
+from sqlmodel import select, func, update
+from src.crud.order_daily_stats.repositories import OrderDailyStatsRepository
+from src.database.models import Order, Order_Detail, Product_Daily_Sales, Product_Monthly_Sales
+from tests.factories import create_product, create_variant
+
+pytestmark = pytest.mark.anyio
+
+order_daily_stats_repository = OrderDailyStatsRepository()
+
+
+async def get_product_sales(product_id, day: date, session):
+    statement = select(
+        func.coalesce(func.sum(Product_Daily_Sales.quantity), 0),
+        func.coalesce(func.sum(Product_Daily_Sales.revenue), 0)
+    ).where(Product_Daily_Sales.product_id == product_id, Product_Daily_Sales.day == day)
+    result = await session.exec(statement)
+    return result.one()
+
+
+async def get_product_monthly_quantity(product_id, month: date, session):
+    statement = select(func.coalesce(func.sum(Product_Monthly_Sales.quantity), 0)).where(
+        Product_Monthly_Sales.product_id == product_id, Product_Monthly_Sales.month == month
+    )
+    result = await session.exec(statement)
+    return result.one()
+
+
+async def test_parallel_checkouts_are_summed_across_slots(session_maker, checkout):
+    today = date.today()
+    async with session_maker() as session:
+        product, variant_m = await create_product(session, price=100000, quantity=50)
+        variant_l = await create_variant(session, product, price=100000, quantity=50, size="L")
+        before = await order_daily_stats_repository.get_totals(today, today, session)
+
+    # 2 variant của cùng 1 sản phẩm: khoá kho khác dòng, chỉ còn dòng product_daily_sales là chung
+    variants = [variant_m, variant_l] * 4
+    await asyncio.gather(*(checkout(variant, 2) for variant in variants))
+
+    async with session_maker() as session:
+        after = await order_daily_stats_repository.get_totals(today, today, session)
+        quantity, revenue = await get_product_sales(product.id, today, session)
+        monthly_quantity = await get_product_monthly_quantity(product.id, today.replace(day=1), session)
+
+    assert after.orders - before.orders == 8
+    assert after._mapping["items"] - before._mapping["items"] == 16
+    assert after.sub_total - before.sub_total == 8 * 200000
+    assert quantity == 16
+    assert revenue == 8 * 200000
+    assert monthly_quantity == 16
+
+
+async def test_top_products_combine_monthly_and_daily_sales(session_maker, checkout):
+    async with session_maker() as session:
+        product, variant = await create_product(session, price=100000, quantity=50)
+
+    for _ in range(3):
+        await checkout(variant)
+
+    # Dời 3 đơn về 31/01, 15/02, 01/03/2025 rồi dựng lại rollup quý 1
+    days = [date(2025, 1, 31), date(2025, 2, 15), date(2025, 3, 1)]
+    async with session_maker() as session:
+        order_ids = (await session.exec(
+            select(Order_Detail.order_id).where(Order_Detail.product_id == product.id)
+        )).all()
+        for order_id, day in zip(order_ids, days):
+            await session.exec(update(Order).where(Order.id == order_id).values(created_at=datetime.combine(day, time(12))))
+        await order_daily_stats_repository.backfill(session, date(2025, 1, 1), date(2025, 3, 31))
+        await session.commit()
+
+    async def revenue_between(from_day: date, to_day: date):
+        async with session_maker() as session:
+            rows = await order_daily_stats_repository.get_top_products(from_day, to_day, session)
+        return next((row.revenue for row in rows if row.product_id == product.id), 0)
+
+    # Tháng trọn vẹn đọc từ product_monthly_sales, ngày lẻ 2 đầu đọc từ product_daily_sales
+    assert await revenue_between(date(2025, 1, 31), date(2025, 3, 1)) == 300000
+    assert await revenue_between(date(2025, 1, 1), date(2025, 3, 31)) == 300000
+    assert await revenue_between(date(2025, 2, 1), date(2025, 2, 28)) == 100000
+    assert await revenue_between(date(2025, 2, 1), date(2025, 3, 31)) == 200000
+    assert await revenue_between(date(2025, 2, 16), date(2025, 3, 1)) == 100000
+    assert await revenue_between(date(2025, 1, 1), date(2025, 1, 30)) == 0
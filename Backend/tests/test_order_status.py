@@ -0,0 +1,26 @@
+import asyncio
+import pytest
+from src.crud.order.services import OrderService
+from src.database.models import Product
+from src.schemas.order import StatusUpdateModel
+from tests.factories import create_product
+
+pytestmark = pytest.mark.anyio
+
+order_service = OrderService()
+
+
+async def test_concurrent_status_updates_count_sale_once(session_maker, checkout):
+    async with session_maker() as session:
+        product, variant = await create_product(session, price=100000, quantity=5)
+    order = await checkout(variant, 2)
+
+    async def deliver():
+        async with session_maker() as session:
+            await order_service.update_status(order["order_id"], StatusUpdateModel(status="Delivered"), session)
+
+    await asyncio.gather(deliver(), deliver())
+
+    async with session_maker() as session:
+        product = await session.get(Product, product.id)
+        assert product.total_sold == 2
@@ -0,0 +1,37 @@
+from datetime import datetime
+import pytest
+from src.crud.color.services import ColorService
+from src.crud.product_card.repositories import ProductCardRepository
+from src.database.models import Color, Product_Card, Product_Variant
+from src.schemas.color import ColorUpdateModel
+from tests.factories import create_product
+
+pytestmark = pytest.mark.anyio
+
+color_service = ColorService()
+product_card_repository = ProductCardRepository()
+
+
+async def test_card_colors_include_variants_with_color_id(session_maker):
+    async with session_maker() as session:
+        color = Color(name="Đỏ", code="#ff0000", created_at=datetime.now())
+        session.add(color)
+        product, variant = await create_product(session)
+        session.add(Product_Variant(price=100000, quantity=5, sku="custom-blue", size="L", product_id=product.id,
+                                    color_name="Xanh", color_code="#0000ff", created_at=datetime.now()))
+        variant.color_id = color.id
+        await session.commit()
+
+        await product_card_repository.refresh_product_cards([product.id], session)
+        await session.commit()
+
+        card = await session.get(Product_Card, product.id)
+        assert sorted(card.colors) == ["Xanh", "Đỏ"]
+
+    # Đổi tên màu thì thẻ sản phẩm dùng màu đó cũng được làm mới
+    async with session_maker() as session:
+        await color_service.update_color_service(str(color.id), ColorUpdateModel(name="Đỏ đô"), session)
+
+    async with session_maker() as session:
+        card = await session.get(Product_Card, product.id)
+        assert sorted(card.colors) == ["Xanh", "Đỏ đô"]